@@ -5,15 +5,28 @@ Reads rules from Logic sheets and applies them without onEdit() lag
 """
 
 import gspread
+from gspread.utils import fill_gaps
 from config import CRED_PATH, SPREADSHEET_URL
+from exercise_traits import classify_exercise, muscle_size, clear_traits_cache
+from sheets_client import batch_get_ranges, values_digest
 import json
 
+# Rule table -> sheet it is compiled from
+RULE_SHEETS = {
+    'base': 'Logic Engine',
+    'categories': 'CategoryLogic',
+    'exercises': 'ExerciseList',
+}
+
 class AdaptiveLogicEngine:
     def __init__(self):
         self.gc = gspread.service_account(filename=CRED_PATH)
         self.ss = self.gc.open_by_url(SPREADSHEET_URL)
         self.rules = {}
         self.exercise_categories = {}
+        self.catalog_revision = 0
+        self._rule_digests = {}
+        self._prescriptions = {}  # (week, muscle_group, exercise) -> (sets, reps, rest)
         
     def load_logic_rules(self):
         """Load adaptive logic rules from sheets (not hardcoded)"""
@@ -21,79 +34,135 @@ class AdaptiveLogicEngine:
         
         # Load from Logic Engine sheet
         try:
-            logic_sheet = self.ss.worksheet("Logic Engine")
-            logic_data = logic_sheet.get_all_values()
-            
-            # Parse logic rules (adjust based on actual structure)
-            self.rules['base'] = {}
-            for row in logic_data[1:]:  # Skip header
-                if len(row) >= 4:
-                    week_range = row[0]  # e.g., "1-2", "3-4", etc.
-                    sets = row[1]
-                    reps = row[2] 
-                    rest = row[3]
-                    self.rules['base'][week_range] = {
-                        'sets': sets,
-                        'reps': reps,
-                        'rest': rest
-                    }
+            logic_data = self.ss.worksheet("Logic Engine").get_all_values()
+            self._compile_base(logic_data)
             print(f"  ✅ Loaded {len(self.rules['base'])} base rules")
             
         except Exception as e:
             print(f"  ⚠️ Logic Engine sheet not found, using defaults: {e}")
-            # Fallback defaults
-            self.rules['base'] = {
-                "1-2": {"sets": "3", "reps": "10-12", "rest": "60-90"},
-                "3-4": {"sets": "4", "reps": "8-10", "rest": "90-120"},
-                "5-6": {"sets": "4-5", "reps": "6-8", "rest": "120-180"},
-                "7": {"sets": "3", "reps": "3-5", "rest": "180-240"},
-                "8": {"sets": "2-3", "reps": "12-15", "rest": "60"}
-            }
+            logic_data = None
+            self._compile_base(None)
         
         # Load CategoryLogic
         try:
-            category_sheet = self.ss.worksheet("CategoryLogic")
-            category_data = category_sheet.get_all_values()
-            
-            self.rules['categories'] = {}
-            for row in category_data[1:]:  # Skip header
-                if len(row) >= 5:
-                    category = row[0]  # e.g., "Compound", "Isolation"
-                    muscle_size = row[1]  # e.g., "Large", "Small"
-                    sets_modifier = row[2]
-                    reps_modifier = row[3]
-                    rest_modifier = row[4]
-                    
-                    key = f"{category}_{muscle_size}"
-                    self.rules['categories'][key] = {
-                        'sets_mod': sets_modifier,
-                        'reps_mod': reps_modifier,
-                        'rest_mod': rest_modifier
-                    }
+            category_data = self.ss.worksheet("CategoryLogic").get_all_values()
+            self._compile_categories(category_data)
             print(f"  ✅ Loaded {len(self.rules['categories'])} category rules")
             
         except Exception as e:
             print(f"  ⚠️ CategoryLogic sheet not found: {e}")
+            category_data = None
+            self._compile_categories(None)
         
         # Load exercise categories from ExerciseList
         try:
-            exercise_sheet = self.ss.worksheet("ExerciseList")
-            exercise_data = exercise_sheet.get_all_values()
-            
-            for row in exercise_data[1:]:  # Skip header
-                if len(row) >= 3:
-                    muscle_group = row[0]
-                    exercise = row[1]
-                    category = row[2] if len(row) > 2 else "Isolation"  # Default to isolation
-                    
-                    self.exercise_categories[exercise] = {
-                        'muscle_group': muscle_group,
-                        'category': category
-                    }
+            exercise_data = self.ss.worksheet("ExerciseList").get_all_values()
+            self._compile_exercise_list(exercise_data)
             print(f"  ✅ Loaded {len(self.exercise_categories)} exercise definitions")
             
         except Exception as e:
             print(f"  ⚠️ ExerciseList sheet not found: {e}")
+            exercise_data = None
+        
+        self._rule_digests = {
+            'base': values_digest(logic_data),
+            'categories': values_digest(category_data),
+            'exercises': values_digest(exercise_data),
+        }
+        self._new_catalog_revision()
+    
+    def _compile_base(self, logic_data):
+        """Build rules['base'] from Logic Engine values (None = sheet missing)"""
+        if logic_data is None:
+            # Fallback defaults
+            self.rules['base'] = {
+                "1-2": {"sets": "3", "reps": "10-12", "rest": "60-90"},
+                "3-4": {"sets": "4", "reps": "8-10", "rest": "90-120"},
+                "5-6": {"sets": "4-5", "reps": "6-8", "rest": "120-180"},
+                "7": {"sets": "3", "reps": "3-5", "rest": "180-240"},
+                "8": {"sets": "2-3", "reps": "12-15", "rest": "60"}
+            }
+            return
+        
+        # Parse logic rules (adjust based on actual structure)
+        base = {}
+        for row in logic_data[1:]:  # Skip header
+            if len(row) >= 4:
+                week_range = row[0]  # e.g., "1-2", "3-4", etc.
+                base[week_range] = {
+                    'sets': row[1],
+                    'reps': row[2],
+                    'rest': row[3]
+                }
+        self.rules['base'] = base
+    
+    def _compile_categories(self, category_data):
+        """Build rules['categories'] from CategoryLogic values (None = sheet missing)"""
+        categories = {}
+        for row in (category_data or [])[1:]:  # Skip header
+            if len(row) >= 5:
+                category = row[0]  # e.g., "Compound", "Isolation"
+                muscle_size = row[1]  # e.g., "Large", "Small"
+                
+                key = f"{category}_{muscle_size}"
+                categories[key] = {
+                    'sets_mod': row[2],
+                    'reps_mod': row[3],
+                    'rest_mod': row[4]
+                }
+        self.rules['categories'] = categories
+    
+    def _compile_exercise_list(self, exercise_data):
+        """Build exercise_categories from ExerciseList values (None = sheet missing)"""
+        exercise_categories = {}
+        for row in (exercise_data or [])[1:]:  # Skip header
+            if len(row) >= 3:
+                muscle_group = row[0]
+                exercise = row[1]
+                category = row[2] if len(row) > 2 else "Isolation"  # Default to isolation
+                
+                exercise_categories[exercise] = {
+                    'muscle_group': muscle_group,
+                    'category': category
+                }
+        self.exercise_categories = exercise_categories
+    
+    def refresh_rules(self):
+        """
+        Hot-reload check for long-running callers (monitor mode)
+        One batched read of the rule sheets, fingerprinted per table;
+        only the tables whose fingerprint changed are recompiled in place.
+        Returns the names of the recompiled tables.
+        """
+        titles = {w.title for w in self.ss.worksheets()}
+        present = [t for t, name in RULE_SHEETS.items() if name in titles]
+        batch = batch_get_ranges(self.ss, [f"'{RULE_SHEETS[t]}'" for t in present])
+        # Pad ragged rows the same way get_all_values() does
+        values = {t: fill_gaps(rows) for t, rows in zip(present, batch)}
+        
+        compilers = {
+            'base': self._compile_base,
+            'categories': self._compile_categories,
+            'exercises': self._compile_exercise_list,
+        }
+        changed = []
+        for table, compile_table in compilers.items():
+            data = values.get(table)
+            digest = values_digest(data)
+            if self._rule_digests.get(table) != digest:
+                compile_table(data)
+                self._rule_digests[table] = digest
+                changed.append(table)
+        
+        if changed:
+            self._new_catalog_revision()
+        return changed
+    
+    def _new_catalog_revision(self):
+        """Rules or catalog changed - drop memoized traits and prescriptions"""
+        self.catalog_revision += 1
+        self._prescriptions.clear()
+        clear_traits_cache()
     
     def get_week_range(self, week_num):
         """Determine which rule range a week falls into"""
@@ -111,9 +180,16 @@ class AdaptiveLogicEngine:
     def calculate_sets_reps_rest(self, week_num, muscle_group, exercise):
         """
         Deterministic calculation based on loaded rules
-        No randomness, same inputs = same outputs
+        No randomness, same inputs = same outputs, so results are memoized
+        until the rules/catalog are reloaded
         """
-        
+        key = (week_num, muscle_group, exercise)
+        cached = self._prescriptions.get(key)
+        if cached is None:
+            cached = self._prescriptions[key] = self._compute_sets_reps_rest(week_num, muscle_group, exercise)
+        return cached
+    
+    def _compute_sets_reps_rest(self, week_num, muscle_group, exercise):
         # Get base rules for the week
         week_range = self.get_week_range(week_num)
         base_rule = self.rules['base'].get(week_range, {})
@@ -126,12 +202,9 @@ class AdaptiveLogicEngine:
         exercise_info = self.exercise_categories.get(exercise, {})
         category = exercise_info.get('category', 'Isolation')
         
-        # Determine muscle size
-        muscle_size = 'Large' if muscle_group in ['Back', 'Legs', 'Chest', 'Glutes_Hamstrings'] else 'Small'
-        
         # Apply category modifiers if they exist
-        category_key = f"{category}_{muscle_size}"
-        if category_key in self.rules['categories']:
+        category_key = f"{category}_{muscle_size(muscle_group)}"
+        if category_key in self.rules.get('categories', {}):
             mods = self.rules['categories'][category_key]
             
             # Apply modifiers (these would be parsed from the sheet)
@@ -144,11 +217,12 @@ class AdaptiveLogicEngine:
                 rest = "120-180" if week_num >= 3 else "90-120"
         
         # Special rules for specific exercises (deterministic)
-        if 'Deadlift' in exercise or 'Squat' in exercise:
+        traits = classify_exercise(exercise)
+        if traits.heavy_compound:
             rest = "180-240"  # Heavy compounds always need more rest
             if week_num >= 5:
                 sets = "5"  # More sets for strength phase
-        elif 'Curl' in exercise or 'Raise' in exercise:
+        elif traits.isolation:
             sets = "3"  # Isolation exercises
             reps = "12-15"
             rest = "60"
@@ -1,22 +1,29 @@
 from families import EXERCISE_FAMILIES, MUSCLE_TO_FAMILIES
-from config import OVERUSED, BALANCED_MIN
+from config import OVERUSED, STALENESS_DECAY
+from usage_matrix import UsageMatrix
+from family_matrix import FamilyMatrix
+from substitution import plan_swaps
+from similarity import CooccurrenceModel
+from staleness import (staleness_score, classify_score, OVERUSED_SCORE, BALANCED_SCORE,
+                       HIGH_URGENCY_SCORE, EPS)
 
 def parse_rows(week_name, rows):
-    """Parse rows from Week sheets - columns B (muscle) and C (exercise)"""
+    """Parse rows from Week sheets - columns A (day), B (muscle) and C (exercise)"""
     wk = int(week_name.split()[-1])
     out = []
     for r in rows:
-        # We're getting B2:E, so:
-        # Index 0 = Column B (Muscle Group)
-        # Index 1 = Column C (Exercise)
-        # Index 2 = Column D (weird dates, ignore)
-        # Index 3 = Column E (weird dates, ignore)
+        # We're getting A2:E, so:
+        # Index 0 = Column A (Day)
+        # Index 1 = Column B (Muscle Group)
+        # Index 2 = Column C (Exercise)
+        # Index 3-4 = Columns D-E (ignore)
         
-        if len(r) < 2:
+        if len(r) < 3:
             continue
             
-        mg = r[0] if len(r) > 0 else ""
-        ex = r[1] if len(r) > 1 else ""
+        day = r[0]
+        mg = r[1]
+        ex = r[2]
         
         # Clean exercise name
         ex = str(ex).strip() if ex else ""
@@ -32,6 +39,7 @@ def parse_rows(week_name, rows):
         
         out.append({
             'week': wk,
+            'day': str(day).strip() if day else '',
             'muscleGroup': str(mg).strip() if mg else 'Unknown',
             'exercise': ex,
             'volume': 1  # Just count presence for rotation analysis
@@ -39,53 +47,143 @@ def parse_rows(week_name, rows):
     return out
 
 def build_db(rows):
-    db={}
-    for r in rows:
-        ex=r['exercise']; e=db.get(ex)
-        if not e: e=db.setdefault(ex, {'muscleGroup':r['muscleGroup'],'weeks':set(),'totalVolume':0.0})
-        e['weeks'].add(r['week']); e['totalVolume']+=r['volume']
-    for ex,e in db.items(): e['frequency']=len(e['weeks'])
-    return db
+    """
+    Per-exercise usage dict for analyze(), built through the columnar UsageMatrix
+    (muscleGroup, weeks, totalVolume, frequency, lastUsed, score)
+    """
+    return UsageMatrix.from_rows(rows, athlete_key=None).to_db()
+
+def usage_index(db):
+    """Normalized exercise -> (last used week, weeks used), so ranking never rescans rows"""
+    return {ex.lower(): (info.get('lastUsed') or max(info['weeks'], default=0), info['frequency'])
+            for ex, info in db.items()}
+
+def build_usage(rows, n_weeks=None):
+    """Columnar usage for many athletes/long histories (rows may carry 'athlete')"""
+    return UsageMatrix.from_rows(rows, n_weeks=n_weeks)
+
+def _build_alt_index(families=EXERCISE_FAMILIES, muscle_to_families=MUSCLE_TO_FAMILIES):
+    """
+    Precompute ranked alternatives once per families revision:
+    normalized exercise -> families, exercise -> ranked alternatives,
+    muscle group -> fallback alternatives
+    """
+    fams_by_ex = {}
+    for fam, exs in families.items():
+        for x in exs:
+            fams = fams_by_ex.setdefault(x.lower(), [])
+            if fam not in fams: fams.append(fam)
+    by_ex = {}
+    for tgt, fams in fams_by_ex.items():
+        out = []
+        for fam in fams:
+            out += [(alt,0.9,f'Same pattern ({fam})') for alt in families[fam] if alt.lower()!=tgt]
+        by_ex[tgt] = sorted(out, key=lambda t: t[1], reverse=True)
+    by_mg = {}
+    for mg, fams in muscle_to_families.items():
+        out = []
+        for fam in fams:
+            out += [(alt,0.6,f'Same muscle group ({mg})') for alt in families.get(fam,[])]
+        by_mg[mg] = sorted(out, key=lambda t: t[1], reverse=True)
+    return fams_by_ex, by_ex, by_mg
+
+FAMILIES_BY_EXERCISE, _ALTS_BY_EXERCISE, _ALTS_BY_MUSCLE = _build_alt_index()
+FAMILY_MATRIX = FamilyMatrix(EXERCISE_FAMILIES)
+# Data-driven neighbours for exercises the curated families miss; callers refresh it
+# with the same rows they analyze (SIMILARITY.refresh(rows))
+SIMILARITY = CooccurrenceModel()
+
+def rebuild_alt_index():
+    """Refresh the alternative index and family matrix after EXERCISE_FAMILIES/MUSCLE_TO_FAMILIES change"""
+    global FAMILIES_BY_EXERCISE, _ALTS_BY_EXERCISE, _ALTS_BY_MUSCLE, FAMILY_MATRIX
+    FAMILIES_BY_EXERCISE, _ALTS_BY_EXERCISE, _ALTS_BY_MUSCLE = _build_alt_index()
+    FAMILY_MATRIX = FamilyMatrix(EXERCISE_FAMILIES)
 
-def _alts(exercise, mg):
-    tgt=exercise.lower(); out=[]
-    for fam, exs in EXERCISE_FAMILIES.items():
-        exs_l=[x.lower() for x in exs]
-        if tgt in exs_l:
-            out += [(alt,0.9,f'Same pattern ({fam})') for alt in exs if alt.lower()!=tgt]
+def _alts(exercise, mg, index=None, current_week=0):
+    """
+    Top alternatives; with a usage_index() they are ranked by similarity x freshness
+    (an alternative used this week keeps 1-DECAY of its similarity, an unused one all of it)
+    """
+    out = _ALTS_BY_EXERCISE.get(exercise.lower()) or _learned_alts(exercise)
     if not out and mg:
-        for fam in MUSCLE_TO_FAMILIES.get(mg, []):
-            out += [(alt,0.6,f'Same muscle group ({mg})') for alt in EXERCISE_FAMILIES.get(fam,[])]
-    return sorted(out, key=lambda t: t[1], reverse=True)[:5]
+        out = _ALTS_BY_MUSCLE.get(mg)
+    if not out or index is None:
+        return (out or [])[:5]
+    ranked = []
+    for alt, sim, reason in out:
+        last, f = index.get(alt.lower(), (0, 0))
+        fresh = 1 - STALENESS_DECAY ** (current_week - last + 1) if last else 1.0
+        ranked.append((f, (alt, sim*fresh, reason)))
+    ranked.sort(key=lambda t: (-t[1][1], t[0]))
+    return [a for f, a in ranked[:5]]
 
-def analyze(db):
+def _learned_alts(exercise):
+    return [(alt,sim,f'Logged in the same slot (similarity {sim:.2f})') for alt,sim in SIMILARITY.neighbours(exercise)]
+
+def _alt_pool(exercise, mg):
+    """Every candidate for the swap planner: family members or learned neighbours, then muscle-group fallbacks"""
+    return (_ALTS_BY_EXERCISE.get(exercise.lower()) or _learned_alts(exercise)) + _ALTS_BY_MUSCLE.get(mg, [])
+
+def analyze(db, current_week=None):
+    """
+    Classify exercises by decay-weighted staleness score (recent weeks count
+    most), falling back to computing it from 'weeks' for dbs without 'score'.
+    `under` holds low recent use: new, rare or rested exercises
+    """
     over, bal, under, ideas = [], [], [], []
+    if current_week is None:
+        current_week=max((max(i['weeks']) for i in db.values() if i['weeks']), default=0)
+    if any(info.get('score') is None for info in db.values()):
+        # Scored copy for the swap planner; the caller's db is left as it was
+        db={ex:dict(info, score=staleness_score(info['weeks'], current_week)) if info.get('score') is None else info
+            for ex,info in db.items()}
     for ex, info in db.items():
         f=info['frequency']; mg=info['muscleGroup'] or 'Unknown'
-        if f>=OVERUSED:
-            al=_alts(ex, mg); over.append((ex,f,al,'high' if f>=6 else 'medium'))
-            if al: ideas.append(f'Replace "{ex}" (used {f} weeks) → "{al[0][0]}" ({al[0][2]})')
-        elif f>=BALANCED_MIN:
+        score=info['score']
+        status=classify_score(score)
+        if status=='overused':
+            over.append((ex,f,mg,'high' if score>=HIGH_URGENCY_SCORE-EPS else 'medium'))
+        elif status=='balanced':
             bal.append((ex,f))
         else:
             under.append((ex,f))
-    over.sort(key=lambda t:(-t[1], t[0].lower()))
-    bal.sort(key=lambda t:(-t[1], t[0].lower()))
-    under.sort(key=lambda t:(t[1], t[0].lower()))
+    over.sort(key=lambda t:(-round(db[t[0]]['score'],9), t[0].lower()))
+    # One consistent swap plan for all overused exercises; al[0] is the planned swap
+    plan=plan_swaps([(ex,mg) for ex,f,mg,urg in over], _alt_pool, db)
+    index=usage_index(db) if over else None
+    for i,(ex,f,mg,urg) in enumerate(over):
+        pick=plan.get(ex)
+        al=[pick]+[a for a in _alts(ex, mg, index, current_week) if a[0]!=pick[0]][:4] if pick else []
+        over[i]=(ex,f,al,urg)
+        if pick: ideas.append(f'Replace "{ex}" (used {f} weeks, score {db[ex]["score"]:.1f}) → "{pick[0]}" ({pick[2]})')
+    bal.sort(key=lambda t:(-db[t[0]]['score'], t[0].lower()))
+    under.sort(key=lambda t:(db[t[0]]['score'], t[0].lower()))
     return over, bal, under, ideas
 
-def report_lines(db, over, bal, under, ideas, timestamp):
+def analyze_families(db, current_week=None):
+    """
+    Overused movement patterns: [(family, weeks used, score, member exercises used)].
+    Rotating exercises inside one family still wears out the pattern
+    """
+    return [(fam,f,score,members) for fam,f,score,status,members in FAMILY_MATRIX.analyze(db, current_week)
+            if status=='overused']
+
+def report_lines(db, over, bal, under, ideas, timestamp, window=None, families=None):
+    """
+    window: optional (first_week, last_week, window_db, over, bal, under) for the trailing-window section
+    families: optional analyze_families() output
+    """
     lines=['📊 SUMMARY','',
            f'• Total exercises: {len(db)}',
-           f'• Overused (>= {OVERUSED} wks): {len(over)}',
-           f'• Balanced ({BALANCED_MIN}–{OVERUSED-1} wks): {len(bal)}',
-           f'• Underused / New: {len(under)}','']
+           f'• Overused (score >= {OVERUSED_SCORE:.1f} ≈ {OVERUSED} recent wks): {len(over)}',
+           f'• Balanced (score {BALANCED_SCORE:.1f}–{OVERUSED_SCORE:.1f}): {len(bal)}',
+           f'• Low recent use (score < {BALANCED_SCORE:.1f}: new, rare or rested): {len(under)}','']
     if over:
         lines.append('🚨 ROTATION PRIORITY:')
         for ex,f,al,urg in over[:10]:
             emoji='🔥' if urg=='high' else '⚠️'
             swap=f' → {al[0][0]}' if al else ''
-            lines.append(f'{emoji} {ex} ({f} wks){swap}')
+            lines.append(f'{emoji} {ex} ({f} wks, score {db[ex]["score"]:.1f}){swap}')
         lines.append('')
     if ideas:
         lines.append('💡 SMART IDEAS:')
@@ -93,7 +191,23 @@ def report_lines(db, over, bal, under, ideas, timestamp):
         lines.append('')
     if bal:
         lines.append('✅ WELL-BALANCED:')
-        for ex,f in bal[:10]: lines.append(f'• {ex} ({f} wks)')
+        for ex,f in bal[:10]: lines.append(f'• {ex} ({f} wks, score {db[ex]["score"]:.1f})')
         lines.append('')
+    if families:
+        lines.append('🧬 MOVEMENT PATTERN OVERUSE:')
+        for fam,f,score,members in families[:10]:
+            lines.append(f'• {fam} ({f} wks, score {score:.1f}): {", ".join(members)}')
+        lines.append('')
+    if window:
+        lines += window_lines(*window)
     lines.append(f'Last updated: {timestamp}')
-    return lines
\ No newline at end of file
+    return lines
+
+def window_lines(first_week, last_week, wdb, over, bal, under):
+    lines=[f'🪟 LAST {last_week-first_week+1} WEEKS (Week {first_week}–{last_week}):',
+           f'• Exercises: {len(wdb)} | Overused: {len(over)} | Balanced: {len(bal)} | Low recent use: {len(under)}']
+    for ex,f,al,urg in over[:10]:
+        swap=f' → {al[0][0]}' if al else ''
+        lines.append(f'{"🔥" if urg=="high" else "⚠️"} {ex} ({f} of last {last_week-first_week+1} wks){swap}')
+    lines.append('')
+    return lines
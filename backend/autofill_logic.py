@@ -6,13 +6,24 @@ WITHOUT the lag of onEdit()
 """
 
 import gspread
-from config import CRED_PATH, SPREADSHEET_URL
+from config import (CRED_PATH, SPREADSHEET_URL, RULES_CHECK_SECONDS,
+                    MONITOR_MIN_SECONDS, MONITOR_MAX_SECONDS)
+from sheets_client import batch_get_ranges, values_digest
+from change_feed import WeekChangeFeed
+from exercise_traits import classify_exercise, AUTOFILL_SMALL_GROUPS, AUTOFILL_LONG_REST_GROUPS
+from adaptive_logic_engine import AdaptiveLogicEngine
+from functools import lru_cache
 import time
 
+MONITOR_RANGE = "B2:F20"  # Just check first 20 rows for efficiency
+IDLE_BACKOFF = 1.5        # Poll interval growth per idle tick
+
+@lru_cache(maxsize=8192)
 def get_sets_reps_rest(week_num, muscle_group, exercise):
     """
     Calculate sets, reps, rest based on the original Apps Script logic
     This replaces the onEdit() auto-fill functionality
+    Pure function of its arguments, so the result tuple is memoized
     """
     
     # Base logic from original Apps Script
@@ -43,21 +54,22 @@ def get_sets_reps_rest(week_num, muscle_group, exercise):
         rest = "60"
     
     # Adjust based on muscle group (from original logic)
-    if muscle_group in ['Arms', 'Calves', 'Abs', 'Core']:
+    if muscle_group in AUTOFILL_SMALL_GROUPS:
         # Smaller muscle groups - more reps, less rest
         if week_num <= 6:
             reps = "12-15"
             rest = "60"
-    elif muscle_group in ['Back', 'Legs', 'Glutes_Hamstrings']:
+    elif muscle_group in AUTOFILL_LONG_REST_GROUPS:
         # Large muscle groups - may need more rest
         if week_num >= 5:
             rest = "180-240"
     
     # Exercise-specific adjustments (from original)
-    if 'Deadlift' in exercise or 'Squat' in exercise:
+    traits = classify_exercise(exercise)
+    if traits.heavy_compound:
         # Heavy compounds need more rest
         rest = "180-240" if week_num <= 6 else "120"
-    elif 'Curl' in exercise or 'Raise' in exercise or 'Fly' in exercise:
+    elif traits.isolation or traits.fly:
         # Isolation exercises
         if week_num <= 6:
             sets = "3"
@@ -155,65 +167,106 @@ def auto_fill_training_data():
     print("WITHOUT the Apps Script lag!")
     print("\nNext: Run backend_rotation.py for rotation analysis")
 
-def monitor_and_autofill():
+def _monitor_updates(engine, week_num, sheet_name, rows):
+    """Cell updates (absolute A1 ranges) for (row number, MONITOR_RANGE cells) pairs"""
+    updates = []
+    for row_idx, row in rows:
+        if len(row) >= 2:
+            muscle_group = row[0] if len(row) > 0 else ""
+            exercise = row[1] if len(row) > 1 else ""
+            current_sets = row[2] if len(row) > 2 else ""
+            current_reps = row[3] if len(row) > 3 else ""
+            current_rest = row[4] if len(row) > 4 else ""
+            
+            if exercise and not current_sets:
+                sets, reps, rest = engine.calculate_sets_reps_rest(week_num, muscle_group, exercise)
+                
+                if not current_sets:
+                    updates.append({'range': f"'{sheet_name}'!D{row_idx}", 'values': [[sets]]})
+                if not current_reps:
+                    updates.append({'range': f"'{sheet_name}'!E{row_idx}", 'values': [[reps]]})
+                if not current_rest:
+                    updates.append({'range': f"'{sheet_name}'!F{row_idx}", 'values': [[rest]]})
+    return updates
+
+def monitor_and_autofill(rules_interval=RULES_CHECK_SECONDS,
+                         min_interval=MONITOR_MIN_SECONDS,
+                         max_interval=MONITOR_MAX_SECONDS):
     """
     Monitor mode - watches for changes and auto-fills
     Like onEdit() but runs externally
+    Uses the sheet-driven AdaptiveLogicEngine; edits to the rule sheets are
+    picked up every `rules_interval` seconds without restarting
+    
+    Each poll is one batched read of all week sheets compared by per-sheet
+    digest, and at most one batched write. The poll interval backs off
+    towards `max_interval` while the workbook is idle and snaps back to
+    `min_interval` after an edit.
     """
     
-    gc = gspread.service_account(filename=CRED_PATH)
-    ss = gc.open_by_url(SPREADSHEET_URL)
+    engine = AdaptiveLogicEngine()
+    engine.load_logic_rules()
+    ss = engine.ss
+    
+    available = {w.title for w in ss.worksheets()}
+    weeks = [(n, f"Week {n}") for n in range(1, 9) if f"Week {n}" in available]
+    ranges = [f"'{name}'!{MONITOR_RANGE}" for _, name in weeks]
     
     print("👁️ MONITORING MODE")
     print("="*60)
     print("Watching for new exercises to auto-fill sets/reps/rest")
+    print(f"Polling {len(weeks)} week sheets every {min_interval}-{max_interval}s (adaptive)")
+    print(f"Rule sheets re-checked every {rules_interval}s")
     print("Press Ctrl+C to stop")
     print()
     
-    last_state = {}
+    digests = {}
+    feed = WeekChangeFeed(first_row=2)
+    interval = min_interval
+    next_rules_check = time.monotonic() + rules_interval
     
     while True:
         try:
-            for week_num in range(1, 9):
-                sheet = ss.worksheet(f"Week {week_num}")
-                
-                # Get current data
-                data = sheet.get("B2:F20")  # Just check first 20 rows for efficiency
-                
-                # Create a simple hash of the data
-                data_str = str(data)
+            # Cheap fingerprint check of the rule sheets on a slower cadence
+            if time.monotonic() >= next_rules_check:
+                next_rules_check = time.monotonic() + rules_interval
+                reloaded = engine.refresh_rules()
+                if reloaded:
+                    print(f"📚 Rules reloaded: {', '.join(reloaded)}")
+            
+            # One read for every week sheet
+            batch = batch_get_ranges(ss, ranges)
+            
+            updates = []
+            seen = {}
+            for (week_num, sheet_name), data in zip(weeks, batch):
+                digest = values_digest(data)
+                if digests.get(sheet_name) == digest:
+                    continue
                 
-                # Check if changed
-                if last_state.get(f"Week{week_num}") != data_str:
-                    print(f"🔄 Change detected in Week {week_num}")
-                    
-                    # Process the changes
-                    updates = []
-                    for row_idx, row in enumerate(data, start=2):
-                        if len(row) >= 2:
-                            muscle_group = row[0] if len(row) > 0 else ""
-                            exercise = row[1] if len(row) > 1 else ""
-                            current_sets = row[2] if len(row) > 2 else ""
-                            current_reps = row[3] if len(row) > 3 else ""
-                            current_rest = row[4] if len(row) > 4 else ""
-                            
-                            if exercise and not current_sets:
-                                sets, reps, rest = get_sets_reps_rest(week_num, muscle_group, exercise)
-                                
-                                if not current_sets:
-                                    updates.append({'range': f'D{row_idx}', 'values': [[sets]]})
-                                if not current_reps:
-                                    updates.append({'range': f'E{row_idx}', 'values': [[reps]]})
-                                if not current_rest:
-                                    updates.append({'range': f'F{row_idx}', 'values': [[rest]]})
-                    
-                    if updates:
-                        sheet.batch_update(updates)
-                        print(f"  ✅ Auto-filled {len(updates)} cells")
-                    
-                    last_state[f"Week{week_num}"] = data_str
+                seen[sheet_name] = digest
+                # Only rows that were added or edited need a fill
+                touched = [(c.row, c.new) for c in feed.pending(sheet_name, data) if c.new]
+                if not touched:
+                    continue
+                print(f"🔄 Change detected in {sheet_name} ({len(touched)} rows)")
+                week_updates = _monitor_updates(engine, week_num, sheet_name, touched)
+                if week_updates:
+                    print(f"  ✅ Auto-filling {len(week_updates)} cells")
+                    updates.extend(week_updates)
+            
+            # One write for every week sheet
+            if updates:
+                ss.values_batch_update({'valueInputOption': 'RAW', 'data': updates})
+            # Only remember digests and row baselines once the fill is written,
+            # so rows from a poll that failed anywhere are re-reported next time
+            for sheet_name in seen:
+                feed.commit(sheet_name)
+            digests.update(seen)
             
-            time.sleep(5)  # Check every 5 seconds
+            # Tighten after edits, back off while idle
+            interval = min_interval if seen else min(max_interval, interval * IDLE_BACKOFF)
+            time.sleep(interval)
             
         except KeyboardInterrupt:
             print("\n👋 Monitoring stopped")
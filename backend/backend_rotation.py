@@ -3,7 +3,9 @@ import os
 from datetime import datetime
 from config import WEEK_SHEETS, LOG_PATH
 from sheets_client import open_spreadsheet, batch_get_ranges
-from analyze import parse_rows, build_db, analyze, report_lines
+from analyze import analyze, analyze_families, report_lines, SIMILARITY
+from rotation_state import RotationState
+from rotation_window import RotationWindow
 from report_writer import ensure_report_sheet, write_if_changed
 
 # Create log directory if it doesn't exist
@@ -26,7 +28,7 @@ def main():
         available_sheets = {w.title for w in ss.worksheets()}
         print(f"📊 Available sheets: {available_sheets}")
         
-        ranges = [f"{name}!B2:E" for name in WEEK_SHEETS if name in available_sheets]
+        ranges = [f"{name}!A2:E" for name in WEEK_SHEETS if name in available_sheets]
         print(f"📋 Will check: {ranges}")
         
         if not ranges:
@@ -38,22 +40,36 @@ def main():
         batch = batch_get_ranges(ss, ranges)
         print(f"📦 Got {len(batch)} ranges")
         
-        all_rows = []
-        for rng, rows in zip(ranges, batch):
-            sheet_name = rng.split("!")[0]
-            parsed = parse_rows(sheet_name, rows)
-            all_rows.extend(parsed)
-            print(f"  {sheet_name}: {len(parsed)} exercises")
+        # Only weeks whose content changed since the last run are re-parsed
+        state = RotationState.load()
+        sheet_names = [rng.split("!")[0] for rng in ranges]
+        changed = state.update(dict(zip(sheet_names, batch)))
+        state.save()
+        print(f"♻️ Re-parsed {len(changed)} of {len(sheet_names)} weeks: {changed or 'none'}")
+        for week in sorted(state.week_rows):
+            print(f"  Week {week}: {len(state.week_rows[week])} exercises")
         
-        if not all_rows:
+        if not state.exercises:
             print("⚠️ No training rows present.")
             logging.info("No training rows present.")
             return
         
-        print(f"🧠 Analyzing {len(all_rows)} total exercises...")
-        db = build_db(all_rows)
+        print(f"🧠 Analyzing {state.row_count()} total exercises...")
+        db = state.to_db()
+        SIMILARITY.refresh(state.rows())
         over, bal, under, ideas = analyze(db)
-        lines = report_lines(db, over, bal, under, ideas, datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+        families = analyze_families(db)
+        print(f"🧬 {len(families)} movement patterns overused")
+        
+        # Trailing window (ROTATION_WINDOW weeks) alongside the whole program
+        window = RotationWindow.from_weeks(state.week_rows)
+        wdb = window.to_db()
+        w_over, w_bal, w_under, _ = analyze(wdb)
+        print(f"🪟 Last {window.size} weeks (Week {window.first_week}-{window.last_week}): {len(w_over)} overused")
+        
+        lines = report_lines(db, over, bal, under, ideas, datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                             window=(window.first_week, window.last_week, wdb, w_over, w_bal, w_under),
+                             families=families)
         ws = ensure_report_sheet(ss)
         updated = write_if_changed(ss, ws, "🧠 Automated Rotation Analysis", lines)
         logging.info("Report %s", "updated" if updated else "unchanged")
@@ -61,7 +77,7 @@ def main():
         print(f"✅ Analysis complete: {len(db)} exercises analyzed")
         print(f"   Overused: {len(over)}")
         print(f"   Balanced: {len(bal)}")
-        print(f"   Underused: {len(under)}")
+        print(f"   Low recent use: {len(under)}")
         print(f"Check the 'Rotation Report' sheet in your Google Sheets!")
     
     except Exception as e:
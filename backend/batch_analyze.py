@@ -0,0 +1,135 @@
+"""
+Vectorized rotation analysis for many athletes
+Takes an athlete x exercise x week usage tensor and classifies every
+(athlete, exercise) pair and picks the top-k overused exercises per athlete in
+a handful of NumPy calls; each athlete's replacements are then one small
+assignment, as in analyze(). Results stay as compact arrays; the text report
+for one athlete is rendered on demand
+"""
+import numpy as np
+from analyze import _alt_pool, report_lines
+from substitution import swap_cost, assign, FORBIDDEN
+from staleness import decay_weights, OVERUSED_SCORE, BALANCED_SCORE, HIGH_URGENCY_SCORE, EPS, STALENESS_DECAY
+
+UNUSED, UNDER, BALANCED, OVERUSED = -1, 0, 1, 2
+
+class BatchResult:
+    def __init__(self, athletes, exercises, muscle_groups, candidates, frequency, scores,
+                 status, top_overused, suggestions, reasons):
+        self.athletes = athletes            # list[str]
+        self.exercises = exercises          # list[str]
+        self.muscle_groups = muscle_groups  # list[str], per exercise
+        self.candidates = candidates        # list[str], alternative id -> name
+        self.frequency = frequency          # int16[A, E] weeks used
+        self.scores = scores                # float32[A, E] staleness score
+        self.status = status                # int8[A, E] UNUSED/UNDER/BALANCED/OVERUSED
+        self.top_overused = top_overused    # int32[A, k] exercise ids by score, -1 padded
+        self.suggestions = suggestions      # int32[A, k] candidate id per top_overused, -1 if none
+        self._reasons = reasons             # (exercise id, candidate id) -> reason
+
+    def counts(self):
+        """int[A, 3] number of under / balanced / overused exercises per athlete"""
+        return np.stack([(self.status == s).sum(axis=1) for s in (UNDER, BALANCED, OVERUSED)], axis=1)
+
+    def report_lines(self, athlete, timestamp):
+        """analyze.report_lines() output for one athlete (index or name)"""
+        a = self.athletes.index(athlete) if isinstance(athlete, str) else athlete
+        used = np.flatnonzero(self.status[a] != UNUSED)
+        db = {self.exercises[e]: {'muscleGroup': self.muscle_groups[e], 'frequency': int(self.frequency[a, e]),
+                                  'score': float(self.scores[a, e])} for e in used}
+        swaps = {e: c for e, c in zip(self.top_overused[a], self.suggestions[a]) if e >= 0 and c >= 0}
+
+        by_score = used[np.lexsort((np.array([self.exercises[e].lower() for e in used]), -self.scores[a, used]))]
+        over, bal, under, ideas = [], [], [], []
+        for e in by_score:
+            ex, f, score = self.exercises[e], int(self.frequency[a, e]), float(self.scores[a, e])
+            if self.status[a, e] == OVERUSED:
+                c = swaps.get(e)
+                al = [(self.candidates[c], None, self._reasons[e, c])] if c is not None else []
+                over.append((ex, f, al, 'high' if score >= HIGH_URGENCY_SCORE - EPS else 'medium'))
+                if al: ideas.append(f'Replace "{ex}" (used {f} weeks, score {score:.1f}) → "{al[0][0]}" ({al[0][2]})')
+            elif self.status[a, e] == BALANCED:
+                bal.append((ex, f))
+            else:
+                under.append((ex, f))
+        under.sort(key=lambda t: (db[t[0]]['score'], t[0].lower()))   # same order as analyze()
+        return report_lines(db, over, bal, under, ideas, timestamp)
+
+def analyze_batch(tensor, exercises, muscle_groups, athletes=None, top_k=10, current_week=None,
+                  decay=STALENESS_DECAY):
+    """
+    tensor: bool[athletes, exercises, weeks] (UsageMatrix.tensor()).
+    Alternatives come from the same pool as analyze() and are assigned per
+    athlete with the same one-to-one plan (plan_swaps' cost and assignment),
+    so no candidate is suggested twice and overused ones never are
+    """
+    n_a, n_e, n_w = tensor.shape
+    athletes = list(athletes) if athletes is not None else [str(i) for i in range(n_a)]
+    current_week = n_w if current_week is None else current_week
+
+    frequency = tensor.sum(axis=2, dtype=np.int16)
+    exact_scores = tensor @ decay_weights(current_week, n_w, decay)
+    scores = exact_scores.astype(np.float32)
+    status = np.select([scores >= OVERUSED_SCORE - EPS, scores >= BALANCED_SCORE - EPS], [OVERUSED, BALANCED],
+                       UNDER).astype(np.int8)
+    status[frequency == 0] = UNUSED
+    any_use = frequency > 0
+    last_used = np.where(any_use, n_w - np.argmax(tensor[:, :, ::-1], axis=2), 0)
+
+    # Top-k overused per athlete by score
+    k = min(top_k, n_e)
+    masked = np.where(status == OVERUSED, np.round(exact_scores, 9), -np.inf)
+    name_rank = np.argsort(np.argsort([ex.lower() for ex in exercises], kind='stable'), kind='stable')
+    top = np.lexsort((np.broadcast_to(name_rank, masked.shape), -masked), axis=1)[:, :k].astype(np.int32)
+    top[np.take_along_axis(masked, top, axis=1) == -np.inf] = -1
+
+    # Exercise x candidate similarity over the union of every exercise's alternatives
+    candidates, cand_ids, best_pair = [], {}, {}
+    for e, (ex, mg) in enumerate(zip(exercises, muscle_groups)):
+        for alt, sim, reason in _alt_pool(ex, mg or 'Unknown'):
+            if alt.lower() == ex.lower():
+                continue
+            c = cand_ids.get(alt.lower())
+            if c is None:
+                c = cand_ids[alt.lower()] = len(candidates); candidates.append(alt)
+            if (e, c) not in best_pair or sim > best_pair[e, c][0]:
+                best_pair[e, c] = (sim, reason)
+    similarity = np.zeros((n_e, len(candidates)))
+    for (e, c), (sim, reason) in best_pair.items():
+        similarity[e, c] = sim
+    reasons = {pair: reason for pair, (sim, reason) in best_pair.items()}
+
+    # Candidate usage per athlete (candidates never logged are unused)
+    ex_ids = {ex.lower(): e for e, ex in enumerate(exercises)}
+    cand_ex = np.array([ex_ids.get(c.lower(), -1) for c in candidates], dtype=np.int64)
+    logged = cand_ex >= 0
+    cand_score = np.zeros((n_a, len(candidates)))
+    cand_freq = np.zeros((n_a, len(candidates)))
+    cand_score[:, logged] = exact_scores[:, cand_ex[logged]]
+    cand_freq[:, logged] = frequency[:, cand_ex[logged]]
+
+    # One assignment per athlete over its top-k overused x their candidates,
+    # rows and columns ordered like plan_swaps() so ties resolve identically
+    cand_rank = np.argsort(np.argsort([c.lower() for c in candidates], kind='stable'), kind='stable')
+    suggestions = np.full(top.shape, -1, dtype=np.int32)
+    for a in range(n_a):
+        rows = np.flatnonzero(top[a] >= 0)
+        if not len(rows) or not len(candidates):
+            continue
+        targets = top[a, rows]
+        usable = (similarity[targets] > 0).any(axis=0) & ~np.isin(cand_ex, targets)
+        cols = np.flatnonzero(usable)
+        cols = cols[np.argsort(cand_rank[cols])]
+        sim = similarity[np.ix_(targets, cols)]
+        cost = swap_cost(sim, cand_score[a, cols], cand_freq[a, cols], max(int(last_used[a].max()), 1))
+        cost[sim <= 0] = FORBIDDEN
+        picked, chosen = assign(cost)
+        suggestions[a, rows[picked]] = cols[chosen]
+
+    return BatchResult(athletes, list(exercises), list(muscle_groups), candidates, frequency, scores,
+                       status, top, suggestions, reasons)
+
+def analyze_usage(usage, top_k=10, current_week=None):
+    """analyze_batch() over a UsageMatrix"""
+    return analyze_batch(usage.tensor(), usage.exercises, usage.muscle_groups, usage.athletes,
+                         top_k=top_k, current_week=current_week)
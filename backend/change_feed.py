@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Row-level change feed for the week sheets
+Keeps a hash per row for each sheet and yields only the rows that were
+inserted, modified or deleted since the previous read, so consumers
+(auto-fill monitor, rotation analyzer, dashboard caches) do work
+proportional to the edit instead of the whole program
+"""
+
+from collections import namedtuple
+
+INSERTED = 'inserted'
+MODIFIED = 'modified'
+DELETED = 'deleted'
+
+# row is the 1-based sheet row number; old/new are the cell lists (None when absent)
+RowChange = namedtuple('RowChange', ['kind', 'sheet', 'row', 'old', 'new'])
+
+def _normalize(row):
+    """Cell tuple without trailing blanks (the API trims them inconsistently)"""
+    cells = [str(c).strip() if c is not None else '' for c in row]
+    while cells and not cells[-1]:
+        cells.pop()
+    return tuple(cells)
+
+class WeekChangeFeed:
+    def __init__(self, first_row=2):
+        """first_row: sheet row number of the first row of every block (2 for 'A2:F')"""
+        self.first_row = first_row
+        self._hashes = {}  # sheet -> [row hash]
+        self._rows = {}    # sheet -> [normalized cells]
+        self._pending = {} # sheet -> (hashes, rows) diffed but not yet committed
+
+    def pending(self, sheet, values):
+        """
+        Diff a freshly read block of `sheet` against the committed baseline and
+        return the list of RowChange. The block only becomes the baseline on
+        commit(sheet), so if processing the changes fails they are reported
+        again by the next read.
+        """
+        new_rows = [_normalize(r) for r in values]
+        new_hashes = [hash(r) for r in new_rows]
+        self._pending[sheet] = (new_hashes, new_rows)
+        return list(self._diff(sheet, self._hashes.get(sheet, []), self._rows.get(sheet, []),
+                               new_hashes, new_rows))
+
+    def commit(self, sheet=None):
+        """Make the last pending block of one sheet (or of every sheet) the baseline"""
+        sheets = list(self._pending) if sheet is None else [sheet]
+        for name in sheets:
+            staged = self._pending.pop(name, None)
+            if staged is not None:
+                self._hashes[name], self._rows[name] = staged
+
+    def changes(self, sheet, values):
+        """pending() and commit() in one step: the new block becomes the baseline immediately"""
+        out = self.pending(sheet, values)
+        self.commit(sheet)
+        return iter(out)
+
+    def changes_many(self, blocks):
+        """Chain changes() over a {sheet: values} mapping"""
+        for sheet, values in blocks.items():
+            yield from self.changes(sheet, values)
+
+    def _diff(self, sheet, old_hashes, old_rows, new_hashes, new_rows):
+        n_old, n_new = len(old_rows), len(new_rows)
+        for i in range(max(n_old, n_new)):
+            if i < n_old and i < n_new and old_hashes[i] == new_hashes[i] and old_rows[i] == new_rows[i]:
+                continue
+            old = old_rows[i] if i < n_old and old_rows[i] else None
+            new = new_rows[i] if i < n_new and new_rows[i] else None
+            if old is None and new is None:
+                continue
+            if old is None:
+                kind = INSERTED
+            elif new is None:
+                kind = DELETED
+            else:
+                kind = MODIFIED
+            yield RowChange(kind, sheet, self.first_row + i,
+                            list(old) if old else None,
+                            list(new) if new else None)
+
+    def snapshot(self, sheet):
+        """Last block seen for a sheet (normalized rows)"""
+        return [list(r) for r in self._rows.get(sheet, [])]
+
+    def reset(self, sheet=None):
+        """Forget one sheet (or everything) so the next read reports all rows as inserted"""
+        if sheet is None:
+            self._hashes.clear()
+            self._rows.clear()
+            self._pending.clear()
+        else:
+            self._hashes.pop(sheet, None)
+            self._rows.pop(sheet, None)
+            self._pending.pop(sheet, None)
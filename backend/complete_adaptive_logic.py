@@ -6,6 +6,7 @@ Reads ranges from Logic sheets, resolves to specific values, writes to training
 
 import gspread
 from config import CRED_PATH, SPREADSHEET_URL
+from decision_trace import DecisionTrace
 import math
 
 # ============= RANGE PARSING UTILITIES =============
@@ -83,6 +84,27 @@ def resolve_final_number(value_str: str, week: int, total_weeks: int, bias: str
 
 # ============= MAIN LOGIC ENGINE =============
 
+# Priority 3 fallback: phase -> (sets, reps, rest)
+DEFAULT_PERIODIZATION = {
+    "1-2": ("3", "10-12", "60-90"),
+    "3-4": ("4", "8-10", "90-120"),
+    "5-6": ("4-5", "6-8", "120-180"),
+    "7": ("3", "3-5", "180-240"),
+    "8": ("2-3", "12-15", "60"),
+}
+
+def default_phase(week_num):
+    """Map a week number onto its default periodization phase"""
+    if week_num <= 2:
+        return "1-2"
+    elif week_num <= 4:
+        return "3-4"
+    elif week_num <= 6:
+        return "5-6"
+    elif week_num == 7:
+        return "7"
+    return "8"
+
 class CompleteAdaptiveLogic:
     def __init__(self):
         self.gc = gspread.service_account(filename=CRED_PATH)
@@ -93,6 +115,7 @@ class CompleteAdaptiveLogic:
         self.exercise_list = {}
         self.goal_type = "Max Strength"
         self.total_weeks = 8
+        self.trace = DecisionTrace()
         
     def load_all_logic(self):
         """Load all logic rules from sheets"""
@@ -183,30 +206,43 @@ class CompleteAdaptiveLogic:
     
     def get_logic_for_exercise(self, week_num, muscle_group, exercise):
         """Get sets/reps/rest for an exercise (as ranges)"""
+        sets, reps, rest, source, _, _ = self.resolve_rule(week_num, muscle_group, exercise)
+        return sets, reps, rest, source
+    
+    def resolve_rule(self, week_num, muscle_group, exercise):
+        """
+        Like get_logic_for_exercise, plus the ID of the rule that fired and
+        the ID of a lower-priority rule it shadowed (or None)
+        """
+        specific_key = f"{exercise}_{week_num}"
+        category_key = f"{week_num}_{self.goal_type}_{muscle_group}"
         
         # Priority 1: Specific exercise rule
-        specific_key = f"{exercise}_{week_num}"
         if specific_key in self.logic_engine:
             rule = self.logic_engine[specific_key]
-            return rule['sets'], rule['reps'], rule['rest'], "exercise-specific"
+            shadowed = category_key if category_key in self.category_logic else None
+            return rule['sets'], rule['reps'], rule['rest'], "exercise-specific", specific_key, shadowed
         
         # Priority 2: Category rule
-        category_key = f"{week_num}_{self.goal_type}_{muscle_group}"
         if category_key in self.category_logic:
             rule = self.category_logic[category_key]
-            return rule['sets'], rule['reps'], rule['rest'], "category"
+            return rule['sets'], rule['reps'], rule['rest'], "category", category_key, None
         
         # Priority 3: Default periodization
-        if week_num <= 2:
-            return "3", "10-12", "60-90", "default"
-        elif week_num <= 4:
-            return "4", "8-10", "90-120", "default"
-        elif week_num <= 6:
-            return "4-5", "6-8", "120-180", "default"
-        elif week_num == 7:
-            return "3", "3-5", "180-240", "default"
-        else:
-            return "2-3", "12-15", "60", "default"
+        phase = default_phase(week_num)
+        sets, reps, rest = DEFAULT_PERIODIZATION[phase]
+        return sets, reps, rest, "default", f"default_{phase}", None
+    
+    def _register_rules(self):
+        """Seed the trace with every loaded rule so unused ones show up as dead"""
+        self.trace = DecisionTrace()
+        for key in self.logic_engine:
+            self.trace.register_rule("exercise-specific", key)
+        for key in self.category_logic:
+            if key.split("_", 1)[-1].startswith(f"{self.goal_type}_"):
+                self.trace.register_rule("category", key)
+        for phase in DEFAULT_PERIODIZATION:
+            self.trace.register_rule("default", f"default_{phase}")
     
     def process_all_weeks(self, force=False):
         """Process all weeks and apply adaptive logic"""
@@ -215,6 +251,8 @@ class CompleteAdaptiveLogic:
         print("="*60)
         
         self.load_all_logic()
+        self._register_rules()
+        trace = self.trace
         
         print("\n📊 Processing each week...")
         
@@ -259,9 +297,12 @@ class CompleteAdaptiveLogic:
                     
                     if needs_update:
                         # Get logic rules (as ranges)
-                        sets_range, reps_range, rest_range, source = self.get_logic_for_exercise(
+                        sets_range, reps_range, rest_range, source, rule_key, shadowed_key = self.resolve_rule(
                             week_num, muscle_group, exercise
                         )
+                        rule_id = trace.register_rule(source, rule_key)
+                        if shadowed_key:
+                            trace.record_shadowed(trace.register_rule("category", shadowed_key))
                         
                         # Resolve ranges to specific values
                         # Sets: progressive (increase over weeks)
@@ -279,12 +320,15 @@ class CompleteAdaptiveLogic:
                         # Only update if we have valid values
                         if sets_final and (force or not existing_sets or existing_sets in ["3-5", "Sets"]):
                             updates.append({'range': f'D{row_idx}', 'values': [[str(sets_final)]]})
+                            trace.record(week_num, row_idx, 0, rule_id)
                         
                         if reps_final and (force or not existing_reps or existing_reps in ["3-6", "Reps"]):
                             updates.append({'range': f'E{row_idx}', 'values': [[str(reps_final)]]})
+                            trace.record(week_num, row_idx, 1, rule_id)
                         
                         if rest_final and (force or not existing_rest):
                             updates.append({'range': f'F{row_idx}', 'values': [[str(rest_final)]]})
+                            trace.record(week_num, row_idx, 2, rule_id)
                         
                         if updates:
                             exercises_processed += 1
@@ -300,14 +344,35 @@ class CompleteAdaptiveLogic:
             except Exception as e:
                 print(f"  Week {week_num}: Error - {e}")
         
+        trace.save()
+        tiers = trace.tier_hits()
+        
         print("\n" + "="*60)
         print(f"✅ COMPLETE! Updated {total_updated} exercises")
+        print(f"   Rule tiers: {tiers['exercise-specific']} exercise-specific, "
+              f"{tiers['category']} category, {tiers['default']} default cells")
+        print(f"   Unused rules: {len(trace.dead_rules())} (see 'python complete_adaptive_logic.py rules')")
         print("\nYour training program now has:")
         print("  • Specific values (not ranges) for execution")
         print("  • Progressive overload built in")
         print("  • Based on YOUR Logic Engine rules")
         print("  • No Apps Script lag!")
 
+def show_rule_stats():
+    """Print hit statistics from the last saved decision trace"""
+    trace = DecisionTrace.load()
+    if trace is None:
+        print("No decision trace yet - run process_all_weeks first")
+        return
+    
+    print(f"📋 RULE HITS ({len(trace)} cells traced)")
+    print("="*60)
+    for s in trace.rule_stats():
+        flag = ""
+        if s['hits'] == 0:
+            flag = "  ⚠️ shadowed" if s['shadowed'] else "  💤 unused"
+        print(f"  [{s['tier']}] {s['rule']}: {s['hits']} hits{flag}")
+
 def main():
     import sys
     
@@ -317,6 +382,8 @@ def main():
         if sys.argv[1] == "force":
             print("Force mode: Will overwrite existing values")
             logic.process_all_weeks(force=True)
+        elif sys.argv[1] == "rules":
+            show_rule_stats()
         elif sys.argv[1] == "test":
             # Test the range parsing
             test_values = ["3-5", "6-8", "10-12", "3", "180-240", "3/5", "3–6"]
@@ -14,4 +14,15 @@ REPORT_SHEET = os.getenv("REPORT_SHEET_NAME", "Rotation Report")
 WEEK_SHEETS = [s.strip() for s in os.getenv("WEEK_SHEETS", "Week 1,Week 2,Week 3,Week 4,Week 5,Week 6,Week 7,Week 8").split(",")]
 OVERUSED = int(os.getenv("OVERUSED", "4"))
 BALANCED_MIN = int(os.getenv("BALANCED_MIN", "2"))
-LOG_PATH = str(BASE_DIR / "logs" / "rotation.log")
\ No newline at end of file
+STALENESS_DECAY = float(os.getenv("STALENESS_DECAY", "0.8"))
+ROTATION_WINDOW = int(os.getenv("ROTATION_WINDOW", "4"))
+SIMILAR_TOP_K = int(os.getenv("SIMILAR_TOP_K", "10"))
+MONITOR_MIN_SECONDS = float(os.getenv("MONITOR_MIN_SECONDS", "5"))
+MONITOR_MAX_SECONDS = float(os.getenv("MONITOR_MAX_SECONDS", "60"))
+RULES_CHECK_SECONDS = int(os.getenv("RULES_CHECK_SECONDS", "60"))
+DASHBOARD_REFRESH_SECONDS = float(os.getenv("DASHBOARD_REFRESH_SECONDS", "60"))
+DASHBOARD_STORE_PATH = os.getenv("DASHBOARD_STORE_PATH", str(BASE_DIR / "logs" / "dashboard_cache.sqlite"))
+DASHBOARD_SNAPSHOT_DIR = os.getenv("DASHBOARD_SNAPSHOT_DIR", str(BASE_DIR / "logs" / "dashboard_snapshots"))
+LOG_PATH = str(BASE_DIR / "logs" / "rotation.log")
+STATE_PATH = str(BASE_DIR / "logs" / "rotation_state.json")
+TRACE_PATH = str(BASE_DIR / "logs" / "decision_trace.npz")
\ No newline at end of file
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Decision trace for the adaptive logic engine
+Records which rule produced every written cell (array-backed, a few bytes
+per cell) and aggregates hit counts per rule, so dead or shadowed rules can
+be inspected later without re-running the engine
+"""
+
+from array import array
+import os
+import numpy as np
+from config import TRACE_PATH
+
+TIERS = ('exercise-specific', 'category', 'default')
+TIER_CODES = {name: code for code, name in enumerate(TIERS)}
+COLUMNS = ('Sets', 'Reps', 'Rest')  # sheet columns D, E, F
+
+class DecisionTrace:
+    def __init__(self):
+        # Rule table (one entry per known rule)
+        self.rule_ids = {}
+        self.rule_keys = []
+        self.rule_tiers = array('B')
+        self.hits = array('I')
+        self.shadowed = array('I')
+
+        # Cell table (one entry per written cell)
+        self.cell_weeks = array('H')
+        self.cell_rows = array('I')
+        self.cell_cols = array('B')
+        self.cell_rules = array('I')
+
+    def register_rule(self, tier, rule_key):
+        """Return the id of a rule, adding it (with zero hits) if unknown"""
+        rule_id = self.rule_ids.get(rule_key)
+        if rule_id is None:
+            rule_id = self.rule_ids[rule_key] = len(self.rule_keys)
+            self.rule_keys.append(rule_key)
+            self.rule_tiers.append(TIER_CODES[tier])
+            self.hits.append(0)
+            self.shadowed.append(0)
+        return rule_id
+
+    def record(self, week, row, column, rule_id):
+        """One written cell; column is an index into COLUMNS"""
+        self.cell_weeks.append(week)
+        self.cell_rows.append(row)
+        self.cell_cols.append(column)
+        self.cell_rules.append(rule_id)
+        self.hits[rule_id] += 1
+
+    def record_shadowed(self, rule_id):
+        """A matching rule lost to a higher-priority tier"""
+        self.shadowed[rule_id] += 1
+
+    def __len__(self):
+        return len(self.cell_rules)
+
+    # ============= QUERIES =============
+
+    def rule_stats(self):
+        """Per-rule rows sorted by hits (descending)"""
+        stats = [
+            {
+                'rule': key,
+                'tier': TIERS[self.rule_tiers[i]],
+                'hits': self.hits[i],
+                'shadowed': self.shadowed[i],
+            }
+            for i, key in enumerate(self.rule_keys)
+        ]
+        return sorted(stats, key=lambda r: (-r['hits'], r['tier'], r['rule']))
+
+    def dead_rules(self):
+        """Rules that never produced a cell"""
+        return [s for s in self.rule_stats() if s['hits'] == 0]
+
+    def shadowed_rules(self):
+        """Rules that matched but were always overridden by a higher tier"""
+        return [s for s in self.rule_stats() if s['hits'] == 0 and s['shadowed'] > 0]
+
+    def tier_hits(self):
+        """Written cells per tier"""
+        counts = np.bincount(np.frombuffer(self.rule_tiers, dtype=np.uint8),
+                             weights=np.frombuffer(self.hits, dtype=self.hits.typecode),
+                             minlength=len(TIERS))
+        return {tier: int(n) for tier, n in zip(TIERS, counts)}
+
+    def cells(self, rule_key=None):
+        """(week, row, column name, rule) for every written cell, optionally for one rule"""
+        wanted = self.rule_ids.get(rule_key) if rule_key is not None else None
+        if rule_key is not None and wanted is None:
+            return []
+        return [
+            (w, r, COLUMNS[c], self.rule_keys[rid])
+            for w, r, c, rid in zip(self.cell_weeks, self.cell_rows, self.cell_cols, self.cell_rules)
+            if wanted is None or rid == wanted
+        ]
+
+    # ============= PERSISTENCE =============
+
+    def save(self, path=TRACE_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        np.savez_compressed(
+            path,
+            rule_keys=np.array(self.rule_keys, dtype=str),
+            rule_tiers=np.frombuffer(self.rule_tiers, dtype=np.uint8),
+            hits=np.frombuffer(self.hits, dtype=self.hits.typecode),
+            shadowed=np.frombuffer(self.shadowed, dtype=self.shadowed.typecode),
+            cell_weeks=np.frombuffer(self.cell_weeks, dtype=np.uint16),
+            cell_rows=np.frombuffer(self.cell_rows, dtype=self.cell_rows.typecode),
+            cell_cols=np.frombuffer(self.cell_cols, dtype=np.uint8),
+            cell_rules=np.frombuffer(self.cell_rules, dtype=self.cell_rules.typecode),
+        )
+
+    @classmethod
+    def load(cls, path=TRACE_PATH):
+        """Load the last saved trace, or None if the engine has not written one"""
+        if not os.path.exists(path):
+            return None
+        trace = cls()
+        with np.load(path, allow_pickle=False) as data:
+            trace.rule_keys = [str(k) for k in data['rule_keys']]
+            trace.rule_ids = {k: i for i, k in enumerate(trace.rule_keys)}
+            trace.rule_tiers.frombytes(data['rule_tiers'].astype(np.uint8).tobytes())
+            trace.hits.frombytes(data['hits'].astype(trace.hits.typecode).tobytes())
+            trace.shadowed.frombytes(data['shadowed'].astype(trace.shadowed.typecode).tobytes())
+            trace.cell_weeks.frombytes(data['cell_weeks'].astype(np.uint16).tobytes())
+            trace.cell_rows.frombytes(data['cell_rows'].astype(trace.cell_rows.typecode).tobytes())
+            trace.cell_cols.frombytes(data['cell_cols'].astype(np.uint8).tobytes())
+            trace.cell_rules.frombytes(data['cell_rules'].astype(trace.cell_rules.typecode).tobytes())
+        return trace
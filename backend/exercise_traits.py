@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Exercise classification shared by the auto-fill and adaptive logic engines
+Traits are derived once per exercise name and memoized
+"""
+
+from collections import namedtuple
+from functools import lru_cache
+
+# Name keywords (substring match, same as the original Apps Script)
+HEAVY_COMPOUND_KEYWORDS = ('Deadlift', 'Squat')
+ISOLATION_KEYWORDS = ('Curl', 'Raise')
+FLY_KEYWORD = 'Fly'
+
+# Muscle-size bucket behind the CategoryLogic keys (muscle_size)
+LARGE_MUSCLE_GROUPS = frozenset(['Back', 'Legs', 'Chest', 'Glutes_Hamstrings'])
+
+# Auto-fill prescription groups from the original Apps Script rules. These are
+# not the muscle_size buckets: Chest keeps the phase's standard rest
+AUTOFILL_SMALL_GROUPS = frozenset(['Arms', 'Calves', 'Abs', 'Core'])
+AUTOFILL_LONG_REST_GROUPS = frozenset(['Back', 'Legs', 'Glutes_Hamstrings'])
+
+ExerciseTraits = namedtuple('ExerciseTraits', ['heavy_compound', 'isolation', 'fly'])
+
+@lru_cache(maxsize=4096)
+def classify_exercise(exercise):
+    """
+    Derive the name-based traits of an exercise
+    heavy_compound: Deadlift/Squat variations
+    isolation:      Curl/Raise variations
+    fly:            Fly variations (treated as isolation by the auto-fill rules)
+    """
+    name = exercise or ""
+    return ExerciseTraits(
+        heavy_compound=any(k in name for k in HEAVY_COMPOUND_KEYWORDS),
+        isolation=any(k in name for k in ISOLATION_KEYWORDS),
+        fly=FLY_KEYWORD in name
+    )
+
+def muscle_size(muscle_group):
+    """'Large' or 'Small' bucket used by the CategoryLogic keys"""
+    return 'Large' if muscle_group in LARGE_MUSCLE_GROUPS else 'Small'
+
+def clear_traits_cache():
+    """Forget memoized traits (call when the exercise catalog changes)"""
+    classify_exercise.cache_clear()
@@ -0,0 +1,62 @@
+"""
+Exercise x family incidence matrix
+Exercises sit in several families (Romanian Deadlifts: Deadlift Family, Hip
+Hinge, Hamstring Focus). The sparse incidence matrix is built once per
+families revision; per-week usage of every movement pattern is then one
+sparse matmul against the exercise x week usage matrix
+"""
+import numpy as np
+from scipy import sparse
+from families import EXERCISE_FAMILIES
+from staleness import decay_weights, classify_score, STALENESS_DECAY
+
+class FamilyMatrix:
+    def __init__(self, families=EXERCISE_FAMILIES):
+        self.families = list(families)      # family id -> name
+        self.exercise_ids = {}              # normalized exercise name -> row
+        rows, cols = [], []
+        for fid, fam in enumerate(self.families):
+            for ex in families[fam]:
+                eid = self.exercise_ids.setdefault(ex.lower(), len(self.exercise_ids))
+                rows.append(eid); cols.append(fid)
+        self.incidence = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.int32), (rows, cols)),
+            shape=(len(self.exercise_ids), len(self.families)))
+
+    def family_weeks(self, exercises, weeks):
+        """
+        exercises: names aligned with the rows of `weeks` (bool[n, n_weeks]).
+        Returns (int32[n_families, n_weeks] member exercises used per week,
+        sparse selected incidence rows; exercises outside every family are ignored)
+        """
+        ids = [self.exercise_ids.get(ex.lower(), -1) for ex in exercises]
+        known = np.flatnonzero(np.asarray(ids) >= 0)
+        selected = self.incidence[np.asarray(ids, dtype=np.int64)[known]]
+        usage = np.asarray(selected.T @ np.asarray(weeks, dtype=np.int32)[known])
+        return usage, selected, known
+
+    def analyze(self, db, current_week=None, decay=STALENESS_DECAY):
+        """
+        Movement patterns by decay-weighted score of the weeks any member was
+        used. Returns [(family, weeks used, score, status, [member exercises used])]
+        sorted by score, for families with any use
+        """
+        exercises = [ex for ex, info in db.items() if info['weeks']]
+        if not exercises:
+            return []
+        n_weeks = max(max(db[ex]['weeks']) for ex in exercises)
+        current_week = n_weeks if current_week is None else current_week
+        weeks = np.zeros((len(exercises), n_weeks), dtype=bool)
+        for i, ex in enumerate(exercises):
+            weeks[i, np.fromiter(db[ex]['weeks'], dtype=np.int64) - 1] = True
+
+        usage, selected, known = self.family_weeks(exercises, weeks)
+        used = usage > 0
+        scores = used @ decay_weights(current_week, n_weeks, decay)
+        members = selected.tocsc()
+        out = []
+        for fid in np.flatnonzero(used.any(axis=1)):
+            rows = known[members.indices[members.indptr[fid]:members.indptr[fid + 1]]]
+            out.append((self.families[fid], int(used[fid].sum()), float(scores[fid]),
+                        classify_score(scores[fid]), [exercises[i] for i in rows]))
+        return sorted(out, key=lambda t: (-t[2], t[0]))
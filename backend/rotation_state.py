@@ -0,0 +1,149 @@
+"""
+Persistent, incremental rotation analyzer state
+Keeps per-exercise week masks, volumes and muscle group between
+backend_rotation runs; only week sheets whose content digest changed are
+re-parsed and folded in, so a run costs the same however long the
+history grows
+"""
+import json, os
+from analyze import parse_rows
+from sheets_client import values_digest
+from staleness import advance_score
+from config import STATE_PATH, STALENESS_DECAY
+
+STATE_VERSION = 3
+
+class RotationState:
+    def __init__(self):
+        self.week_digests = {}  # sheet name -> hex digest of its raw values
+        self.week_rows = {}     # week -> {exercise: [muscleGroup, volume, [days]]}
+        self.exercises = {}     # exercise -> {'muscleGroup', 'mask', 'totalVolume', 'score'}
+        self.current_week = 0   # latest week with rows; scores are relative to it
+
+    # ============= UPDATES =============
+
+    def update(self, blocks):
+        """
+        Fold in freshly read week sheets ({sheet name: raw values}).
+        Sheets that disappeared are dropped. Returns the re-parsed sheet names.
+        """
+        changed = []
+        for name, values in blocks.items():
+            digest = values_digest(values).hex()
+            if self.week_digests.get(name) == digest:
+                continue
+            self.apply_week(_week_number(name), parse_rows(name, values))
+            self.week_digests[name] = digest
+            changed.append(name)
+        for name in [n for n in self.week_digests if n not in blocks]:
+            self.apply_week(_week_number(name), [])
+            del self.week_digests[name]
+            changed.append(name)
+        return changed
+
+    def apply_week(self, week, rows):
+        """Replace everything known about one week with its parsed rows"""
+        new = {}
+        for r in rows:
+            e = new.get(r['exercise'])
+            if e is None:
+                new[r['exercise']] = [r['muscleGroup'], r['volume'], [r['day']]]
+            else:
+                e[1] += r['volume']
+                if r['day'] not in e[2]:
+                    e[2].append(r['day'])
+        old = self.week_rows.pop(week, {})
+        if new:
+            self.week_rows[week] = new
+        
+        # Staleness scores: one multiply per exercise when the current week
+        # moves, then +/- one weight per exercise whose use of `week` changed.
+        # Masks, volumes and muscle groups change only for the week's exercises
+        current = max(self.week_rows, default=0)
+        if current != self.current_week:
+            for e in self.exercises.values():
+                e['score'] = advance_score(e['score'], False, current - self.current_week)
+            self.current_week = current
+        # (a removed week later than the new current one weighs > 1 after rescaling)
+        weight = STALENESS_DECAY ** (current - week)
+        for ex in set(old) | set(new):
+            self._update_exercise(ex, week, old.get(ex), new.get(ex), weight)
+    
+    def _update_exercise(self, ex, week, old, new, weight):
+        """
+        Fold one week's change of one exercise into its mask/volume/muscle group
+        and score; old/new are its [muscleGroup, volume, days] entries (None if unused)
+        """
+        e = self.exercises.get(ex)
+        bit = 1 << (week - 1)
+        mask = e['mask'] if e else 0
+        mask = mask | bit if new else mask & ~bit
+        if not mask:
+            self.exercises.pop(ex, None)
+            return
+        total = (e['totalVolume'] if e else 0.0) - (old[1] if old else 0) + (new[1] if new else 0)
+        score = (e['score'] if e else 0.0) + (weight if new and not old else -weight if old and not new else 0.0)
+        first = (mask & -mask).bit_length()   # earliest week using it: its muscle group wins
+        self.exercises[ex] = {'muscleGroup': self.week_rows[first][ex][0], 'mask': mask,
+                              'totalVolume': total, 'score': max(score, 0.0)}
+
+    # ============= VIEWS =============
+
+    def to_db(self):
+        """The build_db() dict consumed by analyze()"""
+        db = {}
+        for ex, e in self.exercises.items():
+            mask = e['mask']
+            db[ex] = {
+                'muscleGroup': e['muscleGroup'],
+                'weeks': {i + 1 for i in range(mask.bit_length()) if mask >> i & 1},
+                'totalVolume': e['totalVolume'],
+                'frequency': mask.bit_count(),
+                'lastUsed': mask.bit_length(),
+                'score': e['score'],
+            }
+        return db
+
+    def rows(self):
+        """parse_rows()-style rows, one per (week, day, exercise), for SIMILARITY.refresh()"""
+        return [{'week': w, 'day': day, 'exercise': ex, 'muscleGroup': mg}
+                for w, exs in self.week_rows.items() for ex, (mg, vol, days) in exs.items() for day in days]
+
+    def row_count(self):
+        return sum(len(v) for v in self.week_rows.values())
+
+    # ============= PERSISTENCE =============
+
+    def save(self, path=STATE_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        payload = {
+            'version': STATE_VERSION,
+            'week_digests': self.week_digests,
+            'week_rows': {str(w): rows for w, rows in self.week_rows.items()},
+            'exercises': self.exercises,
+            'current_week': self.current_week,
+        }
+        tmp = path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(payload, f)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path=STATE_PATH):
+        """Saved state, or an empty one if missing/unreadable/from another version"""
+        state = cls()
+        try:
+            with open(path) as f:
+                payload = json.load(f)
+        except (OSError, ValueError):
+            return state
+        if payload.get('version') != STATE_VERSION:
+            return state
+        state.week_digests = payload['week_digests']
+        state.week_rows = {int(w): rows for w, rows in payload['week_rows'].items()}
+        state.exercises = payload['exercises']
+        state.current_week = payload['current_week']
+        return state
+
+def _week_number(sheet_name):
+    return int(sheet_name.split()[-1])
@@ -0,0 +1,104 @@
+"""
+Sliding-window rotation analysis
+Rotation status over the trailing K weeks only. The window keeps per-exercise
+counts and is moved by adding the newest week and evicting the oldest, so
+sliding across a multi-year history costs one week of work per step instead
+of re-counting K weeks at every position
+"""
+from collections import deque
+from config import ROTATION_WINDOW
+from staleness import staleness_score
+
+def week_rows(rows):
+    """parse_rows() output -> {week: {exercise: [muscleGroup, volume]}}"""
+    out = {}
+    for r in rows:
+        week = out.setdefault(r['week'], {})
+        e = week.get(r['exercise'])
+        if e is None:
+            week[r['exercise']] = [r['muscleGroup'], r.get('volume', 1)]
+        else:
+            e[1] += r.get('volume', 1)
+    return out
+
+class RotationWindow:
+    def __init__(self, size=ROTATION_WINDOW):
+        self.size = size
+        self.weeks = deque()  # (week, {exercise: [muscleGroup, volume, ...]}), oldest first
+        self.counts = {}      # exercise -> weeks used inside the window
+        self.volume = {}      # exercise -> volume inside the window
+        self.muscle = {}      # exercise -> muscle group (first seen while in the window)
+
+    @classmethod
+    def from_weeks(cls, weeks, size=ROTATION_WINDOW):
+        """Window ending at the latest week of a {week: {exercise: [mg, volume]}} map"""
+        window = cls(size)
+        latest = max(weeks, default=0)
+        for week in sorted(w for w in weeks if w > latest - size):
+            window.add(week, weeks[week])
+        return window
+
+    # ============= ADD / EVICT =============
+
+    def add(self, week, exercises):
+        """Push the next week and evict the weeks that fall out of the window"""
+        if self.weeks and week <= self.weeks[-1][0]:
+            raise ValueError(f"Week {week} is not after week {self.weeks[-1][0]}")
+        self.weeks.append((week, exercises))
+        for ex, (mg, vol, *_) in exercises.items():
+            self.counts[ex] = self.counts.get(ex, 0) + 1
+            self.volume[ex] = self.volume.get(ex, 0) + vol
+            self.muscle.setdefault(ex, mg)
+        while self.weeks[0][0] <= week - self.size:
+            self.evict()
+
+    def evict(self):
+        """Drop the oldest week; returns its number"""
+        week, exercises = self.weeks.popleft()
+        for ex, (mg, vol, *_) in exercises.items():
+            n = self.counts[ex] - 1
+            if n:
+                self.counts[ex] = n
+                self.volume[ex] -= vol
+            else:
+                del self.counts[ex], self.volume[ex], self.muscle[ex]
+        return week
+
+    # ============= VIEWS =============
+
+    @property
+    def first_week(self):
+        """First week the window covers (whether or not it has rows)"""
+        return max(self.last_week - self.size + 1, 1) if self.weeks else 0
+
+    @property
+    def last_week(self):
+        return self.weeks[-1][0] if self.weeks else 0
+
+    def to_db(self):
+        """The window's usage in the build_db() dict format consumed by analyze()"""
+        used = {ex: set() for ex in self.counts}
+        for week, exercises in self.weeks:
+            for ex in exercises:
+                used[ex].add(week)
+        return {
+            ex: {
+                'muscleGroup': self.muscle[ex],
+                'weeks': used[ex],
+                'totalVolume': self.volume[ex],
+                'frequency': self.counts[ex],
+                'lastUsed': max(used[ex]),
+                'score': staleness_score(used[ex], self.last_week),
+            }
+            for ex in self.counts
+        }
+
+def slide(weeks, size=ROTATION_WINDOW):
+    """
+    Yield the window at every position across a {week: {exercise: [mg, volume]}}
+    history (the same RotationWindow object, moved one week per step)
+    """
+    window = RotationWindow(size)
+    for week in sorted(weeks):
+        window.add(week, weeks[week])
+        yield window
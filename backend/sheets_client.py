@@ -1,4 +1,4 @@
-import time, gspread
+import hashlib, time, gspread
 from gspread.exceptions import APIError
 from config import CRED_PATH, SPREADSHEET_URL
 
@@ -27,6 +27,11 @@ def batch_get_ranges(ss, ranges):
     resp = _backoff(ss.values_batch_get, ranges=ranges)
     value_ranges = resp.get("valueRanges", [])
     
+    # The API answers in request order; only fall back to matching by name
+    # when the response is incomplete
+    if len(value_ranges) == len(ranges):
+        return [vr.get("values", []) for vr in value_ranges]
+    
     # Map by range to preserve order
     by_range = {vr.get("range"): vr.get("values", []) for vr in value_ranges}
     
@@ -42,4 +47,17 @@ def batch_get_ranges(ss, ranges):
                     break
         out.append(vals or [])
     
-    return out
\ No newline at end of file
+    return out
+
+def values_digest(values):
+    """
+    Compact fingerprint of a block of cell values (as returned by get/batch_get)
+    None (missing sheet) and [] (empty sheet) fingerprint differently.
+    """
+    if values is None:
+        return None
+    h = hashlib.blake2b(digest_size=16)
+    for row in values:
+        h.update("\x1f".join(str(c) for c in row).encode("utf-8"))
+        h.update(b"\x1e")
+    return h.digest()
@@ -0,0 +1,148 @@
+"""
+Learned exercise similarity
+Exercises that fill the same (day, muscle group) slot across weeks are
+substitutes for each other. Slot counts form a sparse exercise x slot
+matrix; rows are L2-normalized so similarity is cosine, and the top-k
+neighbours of every exercise are precomputed. Replacing a week only
+recomputes the rows of exercises it touched (plus lists that may have lost
+one of them), so queries are dict lookups and refreshes scale with the edit
+"""
+import hashlib
+import numpy as np
+from scipy import sparse
+from config import SIMILAR_TOP_K
+
+def _context(row):
+    """Slot an exercise was logged in; rows without a day share one slot per muscle group"""
+    return (str(row.get('day', '')).strip(), row.get('muscleGroup') or 'Unknown')
+
+class CooccurrenceModel:
+    def __init__(self, k=SIMILAR_TOP_K):
+        self.k = k
+        self.names = []        # exercise id -> display name (first seen)
+        self.ex_ids = {}       # normalized name -> exercise id
+        self.ctx_ids = {}      # (day, muscle group) -> context id
+        self.counts = []       # exercise id -> {context id: count}
+        self.week_pairs = {}   # week -> [(exercise id, context id)]
+        self.week_digests = {} # week -> digest of its (exercise, context) pairs
+        self.top = {}          # exercise id -> [(similarity, other id)], best first
+        self._listed_by = {}   # exercise id -> ids whose top list contains it
+
+    # ============= UPDATES =============
+
+    def refresh(self, rows):
+        """
+        Fold in parse_rows()-style rows (optionally carrying 'day'). Weeks whose
+        rows are unchanged since the last refresh are skipped; weeks no longer
+        present are removed. Returns the exercise ids whose counts changed.
+        """
+        by_week = {}
+        for r in rows:
+            by_week.setdefault(r['week'], []).append(r)
+        touched = set()
+        for week, week_rows in by_week.items():
+            touched |= self._set_week(week, week_rows)
+        for week in [w for w in self.week_pairs if w not in by_week]:
+            touched |= self._set_week(week, [])
+        if touched:
+            self._recompute(touched)
+        return touched
+
+    def _set_week(self, week, rows):
+        pairs = []
+        for r in rows:
+            key = r['exercise'].lower()
+            eid = self.ex_ids.get(key)
+            if eid is None:
+                eid = self.ex_ids[key] = len(self.names)
+                self.names.append(r['exercise']); self.counts.append({})
+            ctx = _context(r)
+            cid = self.ctx_ids.setdefault(ctx, len(self.ctx_ids))
+            pairs.append((eid, cid))
+        digest = hashlib.blake2b(repr(sorted(pairs)).encode(), digest_size=16).hexdigest()
+        if self.week_digests.get(week) == digest:
+            return set()
+
+        touched = set()
+        for eid, cid in self.week_pairs.pop(week, []):
+            c = self.counts[eid]
+            c[cid] -= 1
+            if not c[cid]:
+                del c[cid]
+            touched.add(eid)
+        for eid, cid in pairs:
+            c = self.counts[eid]
+            c[cid] = c.get(cid, 0) + 1
+            touched.add(eid)
+        if pairs:
+            self.week_pairs[week] = pairs
+            self.week_digests[week] = digest
+        else:
+            self.week_digests.pop(week, None)
+        return touched
+
+    def _normalized(self):
+        """Row-normalized CSR exercise x context counts"""
+        indptr, indices, data = [0], [], []
+        for c in self.counts:
+            indices += c.keys(); data += c.values(); indptr.append(len(indices))
+        m = sparse.csr_matrix((np.asarray(data, dtype=np.float64), indices, indptr),
+                              shape=(len(self.counts), max(len(self.ctx_ids), 1)))
+        norms = np.sqrt(np.asarray(m.multiply(m).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        return sparse.diags(1.0 / norms) @ m
+
+    def _top_k(self, eid, sims):
+        sims[eid] = 0.0
+        nz = np.flatnonzero(sims > 0)
+        if len(nz) > self.k:
+            nz = nz[np.argpartition(-sims[nz], self.k - 1)[:self.k]]
+        return sorted(((float(sims[j]), int(j)) for j in nz), key=lambda t: (-t[0], t[1]))
+
+    def _set_top(self, eid, pairs):
+        for _, j in self.top.get(eid, []):
+            self._listed_by[j].discard(eid)
+        self.top[eid] = pairs
+        for _, j in pairs:
+            self._listed_by.setdefault(j, set()).add(eid)
+
+    def _recompute(self, touched):
+        norm = self._normalized()
+        touched = np.fromiter(sorted(touched), dtype=np.int64)
+        sims = (norm[touched] @ norm.T).toarray()
+        for i, eid in enumerate(touched):
+            self._set_top(int(eid), self._top_k(int(eid), sims[i].copy()))
+
+        # Other exercises: merge new similarities to the touched ones into their
+        # lists; a listed neighbour whose similarity dropped may uncover an unseen
+        # one, so those rows are recomputed in full
+        is_touched = set(touched.tolist())
+        others = set(np.flatnonzero(sims.any(axis=0)).tolist())
+        for eid in touched.tolist():
+            others |= self._listed_by.get(eid, set())
+        others -= is_touched
+        full = []
+        for j in others:
+            current = self.top.get(j, [])
+            new = {int(t): sims[i, j] for i, t in enumerate(touched)}
+            if any(t in new and new[t] < s for s, t in current):
+                full.append(j)
+                continue
+            merged = [(s, t) for s, t in current if t not in new]
+            merged += [(float(s), t) for t, s in new.items() if s > 0]
+            merged.sort(key=lambda p: (-p[0], p[1]))
+            self._set_top(j, merged[:self.k])
+        if full:
+            full = np.asarray(sorted(full), dtype=np.int64)
+            rows = (norm[full] @ norm.T).toarray()
+            for i, j in enumerate(full.tolist()):
+                self._set_top(j, self._top_k(j, rows[i]))
+
+    # ============= QUERIES =============
+
+    def neighbours(self, exercise, k=None):
+        """[(exercise, cosine similarity)] from the precomputed top-k list"""
+        eid = self.ex_ids.get(exercise.lower())
+        if eid is None:
+            return []
+        return [(self.names[j], s) for s, j in self.top.get(eid, [])[:k or self.k]]
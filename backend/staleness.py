@@ -0,0 +1,48 @@
+"""
+Decay-weighted exercise staleness
+score = sum over used weeks w of DECAY ** (current_week - w)
+A week of use counts 1.0 now and fades geometrically, so weeks 5-8 weigh
+far more than weeks 1-4. When a new week arrives every score updates in
+O(1): score * DECAY ** elapsed + used.
+"""
+import numpy as np
+from config import STALENESS_DECAY, OVERUSED, BALANCED_MIN
+
+HIGH_URGENCY_WEEKS = 6
+
+def score_threshold(n_weeks, decay=STALENESS_DECAY):
+    """Score of n consecutive weeks of use ending at the current week"""
+    return sum(decay ** i for i in range(n_weeks))
+
+OVERUSED_SCORE = score_threshold(OVERUSED)
+BALANCED_SCORE = score_threshold(BALANCED_MIN)
+HIGH_URGENCY_SCORE = score_threshold(HIGH_URGENCY_WEEKS)
+
+# Tolerance so "exactly n recent weeks" lands on the threshold despite float rounding
+EPS = 1e-9
+
+def staleness_score(weeks, current_week, decay=STALENESS_DECAY):
+    """Score from a collection of used week numbers"""
+    return sum(decay ** (current_week - w) for w in weeks if w <= current_week)
+
+def advance_score(score, used, weeks_elapsed=1, decay=STALENESS_DECAY):
+    """O(1) update when the program moves forward by weeks_elapsed weeks (negative: back)"""
+    return score * decay ** weeks_elapsed + (1.0 if used else 0.0)
+
+def decay_weights(current_week, n_weeks=None, decay=STALENESS_DECAY):
+    """Weight per week column (column 0 = week 1); weeks after current_week weigh 0"""
+    n_weeks = current_week if n_weeks is None else n_weeks
+    age = current_week - np.arange(1, n_weeks + 1)
+    return np.where(age >= 0, decay ** np.maximum(age, 0), 0.0)
+
+def classify_score(score):
+    """
+    'overused' / 'balanced' / 'under'. The score only sees recent use, so
+    'under' means low recent use: new or rarely used exercises, but also ones
+    used heavily earlier and rested since (weeks 1-5 at week 8 score ~1.7)
+    """
+    if score >= OVERUSED_SCORE - EPS:
+        return 'overused'
+    if score >= BALANCED_SCORE - EPS:
+        return 'balanced'
+    return 'under'
@@ -0,0 +1,72 @@
+"""
+Global substitution planner
+Assigns replacements for all overused exercises at once with
+scipy.optimize.linear_sum_assignment, so no replacement is suggested
+twice and no overused (or to-be-replaced) exercise is suggested as a
+replacement. Cost mixes family similarity, recency-weighted usage and
+overall frequency
+"""
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+from staleness import OVERUSED_SCORE, EPS
+
+SIMILARITY_WEIGHT = 1.0   # cost of (1 - similarity)
+RECENCY_WEIGHT = 0.5      # cost of staleness score relative to the overused threshold
+FREQUENCY_WEIGHT = 0.25   # cost of weeks used relative to the program length
+FORBIDDEN = 1e6
+
+def swap_cost(similarity, score, frequency, n_weeks):
+    """
+    Cost of suggesting a candidate (scalars or broadcasting arrays); overused
+    candidates cost FORBIDDEN
+    """
+    cost = (SIMILARITY_WEIGHT * (1 - similarity)
+            + RECENCY_WEIGHT * score / OVERUSED_SCORE
+            + FREQUENCY_WEIGHT * frequency / n_weeks)
+    # Rounded so float noise between score paths can't break ties differently
+    return np.where(score >= OVERUSED_SCORE - EPS, FORBIDDEN, np.round(cost, 9))
+
+def assign(cost):
+    """(rows, cols) of the cheapest one-to-one assignment, without FORBIDDEN pairs"""
+    rows, cols = linear_sum_assignment(cost)
+    keep = cost[rows, cols] < FORBIDDEN
+    return rows[keep], cols[keep]
+
+def plan_swaps(targets, candidates, db):
+    """
+    targets: [(exercise, muscleGroup)] to replace
+    candidates: callable (exercise, muscleGroup) -> [(alt, similarity, reason)]
+    db: build_db()-style usage (with 'score' and 'frequency')
+    Returns {exercise: (alt, similarity, reason)}; exercises whose every
+    candidate is overused or taken get no entry
+    """
+    if not targets:
+        return {}
+    usage = {ex.lower(): info for ex, info in db.items()}
+    n_weeks = max((max(i['weeks']) for i in db.values() if i['weeks']), default=1)
+    blocked = {ex.lower() for ex, _ in targets}
+
+    options = []
+    for ex, mg in targets:
+        best = {}
+        for alt, sim, reason in candidates(ex, mg):
+            key = alt.lower()
+            if key in blocked or key in best and best[key][1] >= sim:
+                continue
+            best[key] = (alt, sim, reason)
+        options.append(best)
+    # Columns in name order so ties break the same way for any caller
+    columns = sorted({key for best in options for key in best})
+    if not columns:
+        return {}
+    col_ids = {key: j for j, key in enumerate(columns)}
+
+    cost = np.full((len(targets), len(columns)), FORBIDDEN)
+    for i, best in enumerate(options):
+        for key, (alt, sim, reason) in best.items():
+            info = usage.get(key)
+            score = info.get('score', 0.0) if info else 0.0
+            freq = info['frequency'] if info else 0
+            cost[i, col_ids[key]] = swap_cost(sim, score, freq, n_weeks)
+
+    return {targets[i][0]: options[i][columns[j]] for i, j in zip(*assign(cost))}
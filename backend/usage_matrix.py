@@ -0,0 +1,142 @@
+"""
+Columnar exercise usage store for rotation analysis
+(athlete, exercise) pairs are integer IDs; week usage is a boolean
+pair x week matrix, so frequency is a row sum and many athletes with long
+histories fit in one call without per-exercise dicts of sets
+"""
+import numpy as np
+from staleness import decay_weights, STALENESS_DECAY
+
+class UsageMatrix:
+    def __init__(self, athletes, exercises, muscle_groups, athlete_ids, exercise_ids, weeks, volume):
+        self.athletes = athletes            # list[str], athlete id -> name
+        self.exercises = exercises          # list[str], exercise id -> name
+        self.muscle_groups = muscle_groups  # list[str], per exercise id (first seen)
+        self.athlete_ids = athlete_ids      # int32[n_pairs]
+        self.exercise_ids = exercise_ids    # int32[n_pairs]
+        self.weeks = weeks                  # bool[n_pairs, n_weeks], column 0 = week 1
+        self.volume = volume                # float64[n_pairs]
+
+    @classmethod
+    def from_rows(cls, rows, n_weeks=None, athlete_key='athlete'):
+        """
+        rows: parse_rows() output, optionally with an 'athlete' key per row
+        (rows without one belong to athlete ''; athlete_key=None merges all).
+        Weeks are 1-based; a week below 1 raises ValueError.
+        """
+        athletes, athlete_idx = [], {}
+        exercises, exercise_idx, muscle_groups = [], {}, []
+        pairs, pair_a, pair_e = {}, [], []
+        row_pair, row_week, row_vol = [], [], []
+
+        for r in rows:
+            a = r.get(athlete_key, '') if athlete_key else ''
+            aid = athlete_idx.get(a)
+            if aid is None:
+                aid = athlete_idx[a] = len(athletes); athletes.append(a)
+            ex = r['exercise']
+            eid = exercise_idx.get(ex)
+            if eid is None:
+                eid = exercise_idx[ex] = len(exercises); exercises.append(ex)
+                muscle_groups.append(r['muscleGroup'])
+            key = (aid, eid)
+            pid = pairs.get(key)
+            if pid is None:
+                pid = pairs[key] = len(pair_a); pair_a.append(aid); pair_e.append(eid)
+            row_pair.append(pid); row_week.append(r['week']); row_vol.append(r.get('volume', 1))
+
+        row_pair = np.asarray(row_pair, dtype=np.int32)
+        row_week = np.asarray(row_week, dtype=np.int32)
+        if len(row_week) and row_week.min() < 1:
+            raise ValueError(f"week numbers start at 1, got {int(row_week.min())}")
+        n_pairs = len(pair_a)
+        if n_weeks is None:
+            n_weeks = int(row_week.max()) if len(row_week) else 0
+
+        weeks = np.zeros((n_pairs, n_weeks), dtype=bool)
+        weeks[row_pair, row_week - 1] = True
+        volume = np.bincount(row_pair, weights=np.asarray(row_vol, dtype=np.float64), minlength=n_pairs)
+
+        return cls(athletes, exercises, muscle_groups,
+                   np.asarray(pair_a, dtype=np.int32), np.asarray(pair_e, dtype=np.int32),
+                   weeks, volume)
+
+    @property
+    def n_weeks(self):
+        return self.weeks.shape[1]
+
+    @property
+    def frequency(self):
+        """Weeks used per (athlete, exercise) pair"""
+        return self.weeks.sum(axis=1, dtype=np.int32)
+
+    @property
+    def last_used(self):
+        """Latest week used per pair (0 if never)"""
+        used = self.weeks.any(axis=1)
+        return np.where(used, self.n_weeks - np.argmax(self.weeks[:, ::-1], axis=1), 0).astype(np.int32)
+
+    def scores(self, current_week=None, decay=STALENESS_DECAY):
+        """Decay-weighted staleness per pair (one mat-vec for every athlete)"""
+        current_week = self.n_weeks if current_week is None else current_week
+        return self.weeks @ decay_weights(current_week, self.n_weeks, decay)
+
+    def window_scores(self, size, decay=STALENESS_DECAY):
+        """
+        Staleness score inside the trailing `size`-week window ending at every
+        week (float64[n_pairs, n_weeks]), i.e. RotationWindow scores at each
+        position: decay the running score, add the new week, drop the evicted one
+        """
+        out = np.empty(self.weeks.shape, dtype=np.float64)
+        running = np.zeros(len(self.weeks), dtype=np.float64)
+        for t in range(self.n_weeks):
+            running = running * decay + self.weeks[:, t]
+            if t >= size:
+                running -= decay ** size * self.weeks[:, t - size]
+            out[:, t] = running
+        return out
+
+    def window_frequency(self, size):
+        """
+        Weeks used inside the trailing `size`-week window ending at every week
+        (int32[n_pairs, n_weeks]); one add and one evict column per step
+        """
+        out = np.empty(self.weeks.shape, dtype=np.int32)
+        running = np.zeros(len(self.weeks), dtype=np.int32)
+        for t in range(self.n_weeks):
+            running += self.weeks[:, t]
+            if t >= size:
+                running -= self.weeks[:, t - size]
+            out[:, t] = running
+        return out
+
+    def athlete_pairs(self, athlete=''):
+        """Pair indices belonging to one athlete"""
+        if athlete not in self.athletes:
+            return np.empty(0, dtype=np.int64)
+        return np.flatnonzero(self.athlete_ids == self.athletes.index(athlete))
+
+    def to_db(self, athlete=''):
+        """One athlete's usage in the build_db() dict format consumed by analyze()"""
+        freq = self.frequency
+        last = self.last_used
+        scores = self.scores()
+        week_numbers = np.arange(1, self.n_weeks + 1)
+        db = {}
+        for pid in self.athlete_pairs(athlete):
+            eid = self.exercise_ids[pid]
+            db[self.exercises[eid]] = {
+                'muscleGroup': self.muscle_groups[eid],
+                'weeks': set(week_numbers[self.weeks[pid]].tolist()),
+                'totalVolume': float(self.volume[pid]),
+                'frequency': int(freq[pid]),
+                'lastUsed': int(last[pid]),
+                'score': float(scores[pid]),
+            }
+        return db
+
+    def tensor(self):
+        """Dense athlete x exercise x week usage (bool)"""
+        out = np.zeros((len(self.athletes), len(self.exercises), self.n_weeks), dtype=bool)
+        out[self.athlete_ids, self.exercise_ids] = self.weeks
+        return out
@@ -4,19 +4,17 @@ Training Dashboard - Similar to Grist version
 Real-time connection to Google Sheets with all analytics
 """
 
+import logging
 import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
-import gspread
-from google.oauth2.service_account import Credentials
 import numpy as np
 from pathlib import Path
 import sys
 
 # Fix imports for Streamlit
-import os
 from pathlib import Path
 
 # Set up paths
@@ -27,13 +25,26 @@ BACKEND_DIR = BASE_DIR / 'backend'
 import sys
 sys.path.insert(0, str(BACKEND_DIR))
 
+# Shared, cached workbook (one fetch serves every dashboard)
+from streamlit_app.data_loader import load_dataset, parse_number, refresh_dataset
+from streamlit_app.training_log import PAGE_SIZE
+
 # Now import from backend
-try:
-    from config import CRED_PATH, SPREADSHEET_URL
-except ImportError:
-    # Fallback to direct values
-    CRED_PATH = str(BASE_DIR / 'credentials.json')
-    SPREADSHEET_URL = 'https://docs.google.com/spreadsheets/d/1Js2s7s95miuUzdn44guWnGuML2kxYzN3kG_jsEdWu68/edit'
+from rotation_window import RotationWindow, week_rows, ROTATION_WINDOW
+from usage_matrix import UsageMatrix
+from staleness import classify_score, OVERUSED_SCORE, BALANCED_SCORE
+
+VIEWS = [
+    "📈 Progress Overview",
+    "💪 Volume Analysis",
+    "🔄 Exercise Rotation",
+    "📊 Performance Metrics",
+    "🎯 Weekly Details",
+    "📋 Raw Data",
+]
+
+# classify_score() status -> Exercise Rotation label
+STATUS_LABELS = {'overused': '🔴 Overused', 'balanced': '🟡 Moderate', 'under': '🟢 Fresh'}
 
 # Page config
 st.set_page_config(
@@ -126,6 +137,29 @@ st.markdown("""
         color: white;
     }
     
+    /* View selector (radio styled as tabs) */
+    .stRadio [role="radiogroup"] {
+        background: white;
+        border-radius: 8px;
+        padding: 0.25rem;
+        gap: 0;
+        border: 1px solid #e0e0e0;
+    }
+    
+    .stRadio [role="radiogroup"] label {
+        font-family: 'Inter', sans-serif;
+        font-weight: 500;
+        font-size: 0.875rem;
+        border-radius: 6px;
+        color: #666;
+        padding: 0.5rem 1rem;
+    }
+    
+    .stRadio [role="radiogroup"] label:has(input:checked) {
+        background: #440052;
+        color: white;
+    }
+    
     /* Week boxes - Grist style */
     .week-progress {
         display: flex;
@@ -218,164 +252,17 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
-# Handle credentials for both local and Streamlit Cloud
-def get_credentials():
-    """Get credentials from either local file or Streamlit secrets"""
-    # Try Streamlit Cloud secrets first
-    try:
-        if 'gcp_service_account' in st.secrets:
-            # Convert Streamlit secrets to proper dict format
-            creds = dict(st.secrets['gcp_service_account'])
-            
-            # Fix the private key newlines (common issue with TOML secrets)
-            if 'private_key' in creds:
-                creds['private_key'] = creds['private_key'].replace('\\n', '\n')
-                
-            return creds
-    except Exception as e:
-        st.error(f"Error loading Streamlit secrets: {str(e)}")
-        pass
-    
-    # Fall back to local credentials.json
-    if os.path.exists(CRED_PATH):
-        import json
-        with open(CRED_PATH, 'r') as f:
-            return json.load(f)
-    
-    st.error("No credentials found! Please add credentials.json locally or configure Streamlit Cloud secrets.")
-    st.stop()
-
-# Cache the connection
-@st.cache_resource
-def init_connection():
-    """Initialize Google Sheets connection"""
-    creds = get_credentials()
-    gc = gspread.service_account_from_dict(creds)
-    return gc.open_by_url(SPREADSHEET_URL)
-
-# Cache data with TTL
 @st.cache_data(ttl=60)
-def load_all_data():
-    """Load all training data from Google Sheets"""
-    ss = init_connection()
-    
-    all_data = []
-    weeks_data = {}
-    
-    # Load each week
-    for week_num in range(1, 9):
-        try:
-            sheet = ss.worksheet(f"Week {week_num}")
-            data = sheet.get_all_values()
-            
-            if len(data) > 1:  # Has data beyond header
-                df = pd.DataFrame(data[1:], columns=data[0])
-                df['Week'] = week_num
-                
-                # Clean column names
-                df.columns = df.columns.str.strip()
-                
-                # Store both raw and processed
-                weeks_data[f"Week {week_num}"] = df
-                
-                # Process for analysis
-                for _, row in df.iterrows():
-                    if row.get('Exercise') and str(row['Exercise']).strip():
-                        all_data.append({
-                            'Week': week_num,
-                            'Day': row.get('Day', ''),
-                            'Muscle Group': row.get('Muscle Group', ''),
-                            'Exercise': row['Exercise'],
-                            'Sets': parse_number(row.get('Sets', 0)),
-                            'Reps': parse_number(row.get('Reps', 0)),
-                            'Rest': row.get('Rest (Seconds)', ''),
-                            'RPE': parse_number(row.get('RPE', 0)),
-                            'Volume': calculate_volume(row),
-                            'Set 1': row.get('Set 1 (Weight - Reps)', ''),
-                            'Set 2': row.get('Set 2 (Weight - Reps)', ''),
-                            'Set 3': row.get('Set 3 (Weight - Reps)', ''),
-                            'Set 4': row.get('Set 4 (Weight - Reps)', ''),
-                        })
-        except:
-            pass
-    
-    # Load Performance Tracker if exists
-    performance_data = None
-    try:
-        perf_sheet = ss.worksheet("Performance Tracker")
-        perf_data = perf_sheet.get_all_values()
-        if perf_data and len(perf_data) > 1:
-            # Clean up column names - handle duplicates and empty columns
-            headers = perf_data[0]
-            cleaned_headers = []
-            seen = {}
-            
-            for i, header in enumerate(headers):
-                header = str(header).strip() if header else f"Column_{i+1}"
-                
-                # Handle duplicates
-                if header in seen:
-                    seen[header] += 1
-                    header = f"{header}_{seen[header]}"
-                else:
-                    seen[header] = 0
-                
-                cleaned_headers.append(header)
-            
-            performance_data = pd.DataFrame(perf_data[1:], columns=cleaned_headers)
-            
-            # Remove columns that are all empty
-            performance_data = performance_data.loc[:, (performance_data != '').any(axis=0)]
-            
-            # If DataFrame is empty after cleaning, set to None
-            if performance_data.empty or len(performance_data.columns) == 0:
-                performance_data = None
-    except Exception as e:
-        # Silent fail - performance data is optional
-        performance_data = None
-    
-    # Load Exercise List
-    exercise_list = {}
-    try:
-        ex_sheet = ss.worksheet("ExerciseList")
-        ex_data = ex_sheet.get_all_values()
-        for row in ex_data[1:]:
-            if len(row) >= 2:
-                muscle = row[0]
-                exercise = row[1]
-                if muscle not in exercise_list:
-                    exercise_list[muscle] = []
-                exercise_list[muscle].append(exercise)
-    except:
-        pass
-    
-    return pd.DataFrame(all_data), weeks_data, performance_data, exercise_list
-
-def parse_number(value):
-    """Parse numbers from various formats"""
-    if not value:
-        return 0
-    
-    value = str(value).strip()
-    
-    # Handle ranges
-    if '-' in value:
-        parts = value.split('-')
-        try:
-            return (float(parts[0]) + float(parts[1])) / 2
-        except:
-            return 0
-    
+def load_rule_trace():
+    """Decision trace written by complete_adaptive_logic.py (None if it has not run or is unreadable)"""
+    from decision_trace import DecisionTrace
     try:
-        return float(value)
-    except:
-        return 0
-
-def calculate_volume(row):
-    """Calculate volume from sets and reps"""
-    sets = parse_number(row.get('Sets', 0))
-    reps = parse_number(row.get('Reps', 0))
-    return sets * reps
+        return DecisionTrace.load()
+    except (OSError, ValueError):
+        return None
+    except Exception:
+        logging.exception("Could not load the decision trace")
+        return None
 
 def main():
     # Clean Grist-style header
@@ -389,7 +276,8 @@ def main():
     # Load data
     try:
         with st.spinner('Loading training data...'):
-            df, weeks_data, performance_data, exercise_list = load_all_data()
+            data = load_dataset()
+            df, weeks_data, performance_data = data.training, data.weeks, data.performance
         
         if df.empty:
             st.warning("No training data found. Please add exercises to your Google Sheet.")
@@ -479,6 +367,7 @@ def main():
         st.markdown("<hr style='border: none; border-top: 1px solid #e0e0e0; margin: 1.5rem 0;'>", unsafe_allow_html=True)
         if st.button("🔄 Refresh Data", use_container_width=True):
             st.cache_data.clear()
+            refresh_dataset()
             st.rerun()
     
     # Filter data
@@ -487,17 +376,10 @@ def main():
         (df['Muscle Group'].isin(selected_muscles))
     ]
     
-    # Main content tabs
-    tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
-        "📈 Progress Overview",
-        "💪 Volume Analysis", 
-        "🔄 Exercise Rotation",
-        "📊 Performance Metrics",
-        "🎯 Weekly Details",
-        "📋 Raw Data"
-    ])
-    
-    with tab1:
+    # View selector - unlike st.tabs, only the active view's analytics run on a rerun
+    view = st.radio("View", VIEWS, horizontal=True, label_visibility="collapsed", key="main_view")
+    
+    if view == "📈 Progress Overview":
         st.markdown("### Training Progress Overview")
         
         col1, col2, col3, col4 = st.columns(4)
@@ -614,7 +496,7 @@ def main():
             fig_reps.update_yaxes(showgrid=True, gridcolor='#f0f0f0', showline=True, linecolor='#e0e0e0')
             st.plotly_chart(fig_reps, use_container_width=True)
     
-    with tab2:
+    elif view == "💪 Volume Analysis":
         st.markdown("### Volume Analysis by Muscle Group")
         
         # Volume by muscle group
@@ -665,23 +547,32 @@ def main():
         )
         st.plotly_chart(fig, use_container_width=True)
     
-    with tab3:
+    elif view == "🔄 Exercise Rotation":
         st.markdown("### Exercise Rotation Analysis")
         
-        # Exercise frequency
-        exercise_freq = filtered_df.groupby('Exercise').agg({
-            'Week': lambda x: len(x.unique()),
-            'Volume': 'sum',
-            'Muscle Group': 'first'
-        }).reset_index()
-        
-        exercise_freq.columns = ['Exercise', 'Weeks Used', 'Total Volume', 'Muscle Group']
-        
-        # Categorize by usage
-        exercise_freq['Status'] = exercise_freq['Weeks Used'].apply(
-            lambda x: '🔴 Overused' if x >= 4 else '🟡 Moderate' if x >= 2 else '🟢 Fresh'
+        # Trailing window, moved by add/evict of one week at a time
+        last_week = int(filtered_df['Week'].max()) if not filtered_df.empty else 1
+        window_size = st.slider(
+            "Rotation window (last N weeks)", 1, max(last_week, 2), min(ROTATION_WINDOW, max(last_week, 2)),
+            help="Rotation status is computed over the most recent weeks only"
+        )
+        records = [
+            {'week': w, 'muscleGroup': mg, 'exercise': ex, 'volume': v}
+            for w, mg, ex, v in filtered_df[['Week', 'Muscle Group', 'Exercise', 'Volume']].itertuples(index=False)
+        ]
+        window = RotationWindow.from_weeks(week_rows(records), window_size)
+        st.caption(f"Window: Week {window.first_week}–{window.last_week}")
+        
+        # Exercise frequency and staleness score inside the window
+        wdb = window.to_db()
+        exercise_freq = pd.DataFrame(
+            [(ex, e['frequency'], e['totalVolume'], e['muscleGroup'], e['score']) for ex, e in wdb.items()],
+            columns=['Exercise', 'Weeks Used', 'Total Volume', 'Muscle Group', 'Score']
         )
         
+        # Categorize by score, as the backend window report does
+        exercise_freq['Status'] = exercise_freq['Score'].map(lambda s: STATUS_LABELS[classify_score(s)])
+        
         # Rotation recommendations
         st.markdown("#### Rotation Status")
         
@@ -692,7 +583,7 @@ def main():
         fresh = exercise_freq[exercise_freq['Status'] == '🟢 Fresh']
         
         with col1:
-            st.metric("Overused (4+ weeks)", len(overused))
+            st.metric(f"Overused (score ≥ {OVERUSED_SCORE:.1f})", len(overused))
             if not overused.empty:
                 st.dataframe(
                     overused[['Exercise', 'Weeks Used']].head(5),
@@ -700,7 +591,7 @@ def main():
                 )
         
         with col2:
-            st.metric("Moderate (2-3 weeks)", len(moderate))
+            st.metric(f"Moderate (score {BALANCED_SCORE:.1f}–{OVERUSED_SCORE:.1f})", len(moderate))
             if not moderate.empty:
                 st.dataframe(
                     moderate[['Exercise', 'Weeks Used']].head(5),
@@ -708,7 +599,7 @@ def main():
                 )
         
         with col3:
-            st.metric("Fresh (<2 weeks)", len(fresh))
+            st.metric(f"Fresh (score < {BALANCED_SCORE:.1f})", len(fresh))
             if not fresh.empty:
                 st.dataframe(
                     fresh[['Exercise', 'Weeks Used']].head(5),
@@ -734,8 +625,21 @@ def main():
             title="Exercise Usage Across Weeks"
         )
         st.plotly_chart(fig, use_container_width=True)
+        
+        # How the overused count moved as the window slid across the program
+        if records:
+            usage = UsageMatrix.from_rows(records, athlete_key=None)
+            in_window = usage.window_scores(window_size)
+            history = pd.DataFrame({
+                'Week': np.arange(1, usage.n_weeks + 1),
+                'Overused': (np.vectorize(classify_score, otypes=[object])(in_window) == 'overused').sum(axis=0),
+            })
+            fig = px.line(history, x='Week', y='Overused', markers=True,
+                          title=f"Overused Exercises per {window_size}-Week Window")
+            fig.update_traces(line_color='#c40000')
+            st.plotly_chart(fig, use_container_width=True)
     
-    with tab4:
+    elif view == "📊 Performance Metrics":
         st.markdown("### Performance Metrics")
         
         if performance_data is not None and not performance_data.empty:
@@ -785,8 +689,34 @@ def main():
                         prog_df.tail(5).style.format({'Progress %': '{:.1f}%'}),
                         hide_index=True
                     )
+        
+        # Rule provenance from the last adaptive logic run (no engine re-run)
+        trace = load_rule_trace()
+        if trace is not None:
+            st.markdown("#### 🧠 Rule Hit Statistics")
+            tiers = trace.tier_hits()
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                st.metric("Exercise-Specific Cells", tiers['exercise-specific'])
+            with col2:
+                st.metric("Category Cells", tiers['category'])
+            with col3:
+                st.metric("Default Cells", tiers['default'])
+            with col4:
+                st.metric("Unused Rules", len(trace.dead_rules()))
+            
+            rule_stats = pd.DataFrame(trace.rule_stats())
+            rule_stats['Status'] = np.where(
+                rule_stats['hits'] > 0, '✅ Active',
+                np.where(rule_stats['shadowed'] > 0, '⚠️ Shadowed', '💤 Unused')
+            )
+            st.dataframe(
+                rule_stats.rename(columns={'rule': 'Rule', 'tier': 'Tier', 'hits': 'Hits', 'shadowed': 'Shadowed'}),
+                use_container_width=True,
+                hide_index=True
+            )
     
-    with tab5:
+    elif view == "🎯 Weekly Details":
         st.markdown("### Weekly Training Details")
         
         selected_week = st.selectbox(
@@ -827,24 +757,40 @@ def main():
                 hide_index=True
             )
     
-    with tab6:
+    elif view == "📋 Raw Data":
         st.markdown("### Raw Training Data")
         
-        # Download button
-        csv = filtered_df.to_csv(index=False)
-        st.download_button(
-            label="📥 Download CSV",
-            data=csv,
-            file_name=f"training_data_{datetime.now().strftime('%Y%m%d')}.csv",
-            mime="text/csv"
-        )
+        # Filtered rows in display order; only the visible page is sent
+        raw_rows = data.log.rows(week=tuple(selected_weeks), muscle=tuple(selected_muscles))
+        page_count = data.log.page_count(raw_rows)
+        
+        col1, col2 = st.columns([1, 3])
+        with col1:
+            # Keyed by the filters so a filter change starts again at page 1
+            raw_page = st.number_input(
+                f"Page (of {page_count})",
+                min_value=1,
+                max_value=page_count,
+                value=1,
+                key=f"raw_page_{tuple(selected_weeks)}_{tuple(selected_muscles)}"
+            )
+        
+        with col2:
+            # Download button (CSV built once per filter)
+            st.download_button(
+                label="📥 Download CSV",
+                data=data.log.csv(raw_rows),
+                file_name=f"training_data_{datetime.now().strftime('%Y%m%d')}.csv",
+                mime="text/csv"
+            )
         
         # Display raw data
         st.dataframe(
-            filtered_df,
+            data.log.page(raw_rows, raw_page, formatted=False),
             use_container_width=True,
             hide_index=True
         )
+        st.caption(f"{len(raw_rows):,} rows, {PAGE_SIZE} per page")
         
         # Summary statistics
         st.markdown("### Summary Statistics")
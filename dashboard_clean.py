@@ -5,12 +5,9 @@ Real-time connection to Google Sheets
 """
 
 import streamlit as st
-import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
-import gspread
-from google.oauth2.service_account import Credentials
 import numpy as np
 from pathlib import Path
 import sys
@@ -27,13 +24,15 @@ BACKEND_DIR = BASE_DIR / 'backend'
 import sys
 sys.path.insert(0, str(BACKEND_DIR))
 
-# Now import from backend
-try:
-    from config import CRED_PATH, SPREADSHEET_URL
-except ImportError:
-    # Fallback to direct values
-    CRED_PATH = str(BASE_DIR / 'credentials.json')
-    SPREADSHEET_URL = 'https://docs.google.com/spreadsheets/d/1Js2s7s95miuUzdn44guWnGuML2kxYzN3kG_jsEdWu68/edit'
+# Shared, cached workbook (one fetch serves every dashboard)
+from streamlit_app.data_loader import load_dataset, refresh_dataset
+
+VIEWS = [
+    "Overview",
+    "Volume Analysis",
+    "Exercise Rotation",
+    "Raw Data",
+]
 
 # Page config
 st.set_page_config(
@@ -92,24 +91,22 @@ st.markdown("""
         color: #000000;
     }
     
-    /* Tabs */
-    .stTabs [data-baseweb="tab-list"] {
+    /* View selector (radio styled as tabs) */
+    .stRadio [role="radiogroup"] {
         background: transparent;
         gap: 2rem;
         border-bottom: 2px solid #e0e0e0;
     }
     
-    .stTabs [data-baseweb="tab"] {
+    .stRadio [role="radiogroup"] label {
         font-family: 'Inter', sans-serif;
         font-weight: 600;
         font-size: 0.9rem;
         color: #666666;
-        background: transparent;
-        border: none;
         padding-bottom: 1rem;
     }
     
-    .stTabs [aria-selected="true"] {
+    .stRadio [role="radiogroup"] label:has(input:checked) {
         color: #000000;
         border-bottom: 3px solid #000000;
     }
@@ -182,80 +179,6 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
-# Cache functions
-@st.cache_resource
-def init_connection():
-    """Initialize Google Sheets connection"""
-    gc = gspread.service_account(filename=CRED_PATH)
-    return gc.open_by_url(SPREADSHEET_URL)
-
-@st.cache_data(ttl=60)
-def load_all_data():
-    """Load all training data from Google Sheets"""
-    ss = init_connection()
-    
-    all_data = []
-    weeks_data = {}
-    
-    # Load each week
-    for week_num in range(1, 9):
-        try:
-            sheet = ss.worksheet(f"Week {week_num}")
-            data = sheet.get_all_values()
-            
-            if len(data) > 1:
-                df = pd.DataFrame(data[1:], columns=data[0])
-                df['Week'] = week_num
-                
-                # Clean column names
-                df.columns = df.columns.str.strip()
-                
-                weeks_data[f"Week {week_num}"] = df
-                
-                # Process for analysis
-                for _, row in df.iterrows():
-                    if row.get('Exercise') and str(row['Exercise']).strip() and row['Exercise'] != 'Exercise':
-                        all_data.append({
-                            'Week': week_num,
-                            'Day': row.get('Day', ''),
-                            'Muscle Group': row.get('Muscle Group', ''),
-                            'Exercise': row['Exercise'],
-                            'Sets': parse_number(row.get('Sets', 0)),
-                            'Reps': parse_number(row.get('Reps', 0)),
-                            'Rest': row.get('Rest (Seconds)', ''),
-                            'Volume': calculate_volume(row)
-                        })
-        except:
-            pass
-    
-    return pd.DataFrame(all_data), weeks_data
-
-def parse_number(value):
-    """Parse numbers from various formats"""
-    if not value:
-        return 0
-    
-    value = str(value).strip()
-    
-    # Handle ranges
-    if '-' in value and not value.startswith('-'):
-        parts = value.split('-')
-        try:
-            return (float(parts[0]) + float(parts[1])) / 2
-        except:
-            return 0
-    
-    try:
-        return float(value)
-    except:
-        return 0
-
-def calculate_volume(row):
-    """Calculate volume from sets and reps"""
-    sets = parse_number(row.get('Sets', 0))
-    reps = parse_number(row.get('Reps', 0))
-    return sets * reps
-
 def main():
     # Clean header
     st.markdown("""
@@ -268,7 +191,8 @@ def main():
     # Load data
     try:
         with st.spinner('Loading...'):
-            df, weeks_data = load_all_data()
+            data = load_dataset()
+            df = data.training
         
         if df.empty:
             st.warning("No training data found in Google Sheets")
@@ -334,7 +258,7 @@ def main():
             st.metric("Total Exercises", len(df))
         
         if st.button("Refresh Data", use_container_width=True):
-            st.cache_data.clear()
+            refresh_dataset()
             st.rerun()
     
     # Filter data
@@ -343,15 +267,10 @@ def main():
         (df['Muscle Group'].isin(selected_muscles))
     ]
     
-    # Main tabs
-    tab1, tab2, tab3, tab4 = st.tabs([
-        "Overview",
-        "Volume Analysis",
-        "Exercise Rotation",
-        "Raw Data"
-    ])
+    # View selector - unlike st.tabs, only the active view's analytics run on a rerun
+    view = st.radio("View", VIEWS, horizontal=True, label_visibility="collapsed", key="main_view")
     
-    with tab1:
+    if view == "Overview":
         # Key metrics
         col1, col2, col3, col4 = st.columns(4)
         
@@ -399,7 +318,7 @@ def main():
         
         st.plotly_chart(fig, use_container_width=True)
     
-    with tab2:
+    elif view == "Volume Analysis":
         st.markdown("### Volume by Muscle Group")
         
         muscle_volume = filtered_df.groupby('Muscle Group')['Volume'].sum().reset_index()
@@ -449,7 +368,7 @@ def main():
         
         st.plotly_chart(fig, use_container_width=True)
     
-    with tab3:
+    elif view == "Exercise Rotation":
         st.markdown("### Exercise Frequency")
         
         exercise_freq = filtered_df.groupby('Exercise')['Week'].nunique().reset_index()
@@ -487,7 +406,7 @@ def main():
             else:
                 st.write("None")
     
-    with tab4:
+    elif view == "Raw Data":
         st.markdown("### Training Data")
         
         # Download
@@ -5,10 +5,8 @@ Like the screenshot you showed
 """
 
 import streamlit as st
-import pandas as pd
 import plotly.graph_objects as go
 from datetime import datetime
-import gspread
 from pathlib import Path
 import sys
 
@@ -17,11 +15,7 @@ BASE_DIR = Path(__file__).parent
 BACKEND_DIR = BASE_DIR / 'backend'
 sys.path.insert(0, str(BACKEND_DIR))
 
-try:
-    from config import CRED_PATH, SPREADSHEET_URL
-except ImportError:
-    CRED_PATH = str(BASE_DIR / 'credentials.json')
-    SPREADSHEET_URL = 'https://docs.google.com/spreadsheets/d/1Js2s7s95miuUzdn44guWnGuML2kxYzN3kG_jsEdWu68/edit'
+from streamlit_app.data_loader import load_dataset
 
 # Page config
 st.set_page_config(
@@ -226,68 +220,10 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
-# Load data
-@st.cache_resource
-def init_connection():
-    gc = gspread.service_account(filename=CRED_PATH)
-    return gc.open_by_url(SPREADSHEET_URL)
-
-@st.cache_data(ttl=60)
-def load_data():
-    ss = init_connection()
-    all_data = []
-    
-    for week_num in range(1, 9):
-        try:
-            sheet = ss.worksheet(f"Week {week_num}")
-            data = sheet.get_all_values()
-            
-            if len(data) > 1:
-                df = pd.DataFrame(data[1:], columns=data[0])
-                df['Week'] = week_num
-                
-                for _, row in df.iterrows():
-                    if row.get('Exercise') and str(row['Exercise']).strip() and row['Exercise'] != 'Exercise':
-                        sets_str = str(row.get('Sets', '0'))
-                        reps_str = str(row.get('Reps', '0'))
-                        
-                        # Parse sets
-                        if '-' in sets_str:
-                            parts = sets_str.split('-')
-                            sets = (float(parts[0]) + float(parts[1])) / 2 if len(parts) == 2 else 0
-                        else:
-                            try:
-                                sets = float(sets_str)
-                            except:
-                                sets = 0
-                        
-                        # Parse reps
-                        if '-' in reps_str:
-                            parts = reps_str.split('-')
-                            reps = (float(parts[0]) + float(parts[1])) / 2 if len(parts) == 2 else 0
-                        else:
-                            try:
-                                reps = float(reps_str)
-                            except:
-                                reps = 0
-                        
-                        all_data.append({
-                            'Week': week_num,
-                            'Muscle Group': row.get('Muscle Group', ''),
-                            'Exercise': row['Exercise'],
-                            'Sets': sets,
-                            'Reps': reps,
-                            'Volume': sets * reps
-                        })
-        except:
-            pass
-    
-    return pd.DataFrame(all_data)
-
 def main():
     # Load data
     try:
-        df = load_data()
+        df = load_dataset().training
         if df.empty:
             st.error("No training data found")
             st.stop()
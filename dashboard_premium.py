@@ -5,11 +5,9 @@ Modern, dark theme with gradient accents - Looks like Strong/Hevy
 """
 
 import streamlit as st
-import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
 from datetime import datetime, timedelta
-import gspread
 from pathlib import Path
 import sys
 import numpy as np
@@ -19,11 +17,13 @@ BASE_DIR = Path(__file__).parent
 BACKEND_DIR = BASE_DIR / 'backend'
 sys.path.insert(0, str(BACKEND_DIR))
 
-try:
-    from config import CRED_PATH, SPREADSHEET_URL
-except ImportError:
-    CRED_PATH = str(BASE_DIR / 'credentials.json')
-    SPREADSHEET_URL = 'https://docs.google.com/spreadsheets/d/1Js2s7s95miuUzdn44guWnGuML2kxYzN3kG_jsEdWu68/edit'
+from streamlit_app.data_loader import load_dataset
+
+VIEWS = [
+    "📊 Overview",
+    "📈 Analytics",
+    "📋 Training Log",
+]
 
 # Page config - MUST BE FIRST
 st.set_page_config(
@@ -395,15 +395,15 @@ st.markdown("""
         font-size: 0.875rem !important;
     }
     
-    /* Tab styling */
-    .stTabs [data-baseweb="tab-list"] {
+    /* View selector (radio styled as tabs) */
+    .stRadio [role="radiogroup"] {
         background: var(--bg-card);
         padding: 0.5rem;
         border-radius: 12px;
         gap: 0.5rem;
     }
     
-    .stTabs [data-baseweb="tab"] {
+    .stRadio [role="radiogroup"] label {
         background: transparent;
         color: var(--text-muted);
         border-radius: 8px;
@@ -413,18 +413,14 @@ st.markdown("""
         font-size: 0.95rem;
     }
     
-    .stTabs [aria-selected="true"] {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-    }
-    
-    .stTabs [data-baseweb="tab"]:hover {
+    .stRadio [role="radiogroup"] label:hover {
         background: var(--bg-secondary);
         color: var(--text-primary);
     }
     
-    .stTabs [aria-selected="true"]:hover {
+    .stRadio [role="radiogroup"] label:has(input:checked) {
         background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        color: white;
     }
     
     /* Data tables */
@@ -518,75 +514,6 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
-# Cache functions
-@st.cache_resource
-def init_connection():
-    """Initialize Google Sheets connection"""
-    gc = gspread.service_account(filename=CRED_PATH)
-    return gc.open_by_url(SPREADSHEET_URL)
-
-@st.cache_data(ttl=60)
-def load_training_data():
-    """Load all training data from Google Sheets"""
-    ss = init_connection()
-    all_data = []
-    
-    for week_num in range(1, 9):
-        try:
-            sheet = ss.worksheet(f"Week {week_num}")
-            data = sheet.get_all_values()
-            
-            if len(data) > 1:
-                df = pd.DataFrame(data[1:], columns=data[0])
-                df['Week'] = week_num
-                
-                for _, row in df.iterrows():
-                    if row.get('Exercise') and str(row['Exercise']).strip() not in ['', 'Exercise']:
-                        # Parse sets
-                        sets_str = str(row.get('Sets', '0'))
-                        if '-' in sets_str:
-                            parts = sets_str.split('-')
-                            sets = (float(parts[0]) + float(parts[1])) / 2 if len(parts) == 2 else 0
-                        else:
-                            try:
-                                sets = float(sets_str) if sets_str else 0
-                            except:
-                                sets = 0
-                        
-                        # Parse reps
-                        reps_str = str(row.get('Reps', '0'))
-                        if '-' in reps_str:
-                            parts = reps_str.split('-')
-                            reps = (float(parts[0]) + float(parts[1])) / 2 if len(parts) == 2 else 0
-                        else:
-                            try:
-                                reps = float(reps_str) if reps_str else 0
-                            except:
-                                reps = 0
-                        
-                        # Parse rest
-                        rest_str = str(row.get('Rest (Seconds)', '0'))
-                        try:
-                            rest = float(rest_str) if rest_str else 0
-                        except:
-                            rest = 0
-                        
-                        all_data.append({
-                            'Week': week_num,
-                            'Day': row.get('Day', ''),
-                            'Muscle Group': row.get('Muscle Group', ''),
-                            'Exercise': row['Exercise'],
-                            'Sets': sets,
-                            'Reps': reps,
-                            'Rest': rest,
-                            'Volume': sets * reps
-                        })
-        except Exception as e:
-            st.warning(f"Could not load Week {week_num}: {str(e)}")
-            continue
-    
-    return pd.DataFrame(all_data)
-
 def create_metric_card(icon, label, value, change=None, color="purple"):
     """Create a metric card with icon and optional change indicator"""
     change_html = ""
@@ -652,7 +579,8 @@ def main():
         
         # Load data
         try:
-            df = load_training_data()
+            data = load_dataset()
+            df, cube = data.training, data.cube
             if df.empty:
                 st.error("❌ No training data found")
                 st.info("Please ensure your Google Sheets has data in Week 1-8 sheets")
@@ -663,9 +591,9 @@ def main():
         
         # Calculate current state
         current_week = df['Week'].max()
-        available_weeks = sorted(df['Week'].unique())
-        available_muscle_groups = sorted(df['Muscle Group'].unique())
-        available_exercises = sorted(df['Exercise'].unique())
+        available_weeks = cube.options['Week']
+        available_muscle_groups = cube.options['Muscle Group']
+        available_exercises = cube.options['Exercise']
         
         st.markdown('<div class="sidebar-title">🎯 DATA FILTERS</div>', unsafe_allow_html=True)
         
@@ -689,12 +617,13 @@ def main():
         st.markdown('<div class="sidebar-title">📊 PERFORMANCE METRICS</div>', unsafe_allow_html=True)
         
         # Calculate detailed metrics
-        total_workouts = len(df[df['Week'] <= current_week]['Day'].unique())
-        total_exercises_done = len(df)
-        avg_volume = df['Volume'].mean()
-        total_volume = df['Volume'].sum()
-        avg_sets_per_exercise = df['Sets'].mean()
-        avg_reps_per_set = df['Reps'].mean()
+        totals = cube.totals()
+        total_workouts = cube.distinct('Day')
+        total_exercises_done = totals['Count']
+        avg_volume = totals['Avg Volume']
+        total_volume = totals['Volume']
+        avg_sets_per_exercise = totals['Avg Sets']
+        avg_reps_per_set = totals['Avg Reps']
         
         col1, col2 = st.columns(2)
         with col1:
@@ -712,11 +641,7 @@ def main():
         # WEEKLY BREAKDOWN
         st.markdown('<div class="sidebar-title">📈 WEEKLY BREAKDOWN</div>', unsafe_allow_html=True)
         
-        weekly_stats = df.groupby('Week').agg({
-            'Volume': 'sum',
-            'Exercise': 'count',
-            'Sets': 'sum'
-        }).round(0)
+        weekly_stats = cube.rollup(('Week',)).set_index('Week').rename(columns={'Count': 'Exercise'})
         
         for week in weekly_stats.index:
             with st.expander(f"Week {week} Stats", expanded=bool(week == current_week)):
@@ -742,7 +667,7 @@ def main():
         # TOP EXERCISES
         st.markdown('<div class="sidebar-title">🏆 TOP EXERCISES</div>', unsafe_allow_html=True)
         
-        top_5_exercises = df.groupby('Exercise')['Volume'].sum().nlargest(5)
+        top_5_exercises = cube.rollup(('Exercise',)).set_index('Exercise')['Volume'].nlargest(5)
         for exercise, volume in top_5_exercises.items():
             progress_pct = (volume / top_5_exercises.iloc[0]) * 100
             st.markdown(f"""
@@ -760,14 +685,18 @@ def main():
             """, unsafe_allow_html=True)
     
     # MAIN CONTENT AREA
-    # Apply filters
-    filtered_df = df.copy()
+    # Apply filters (cube slices use the same filter; None = all)
+    filtered_df = df
+    filter_week = filter_muscle = None
     if selected_week != "All Weeks":
         week_num = int(selected_week.split()[1])
         filtered_df = filtered_df[filtered_df['Week'] == week_num]
+        filter_week = week_num
     
     if selected_muscle != "All Groups":
         filtered_df = filtered_df[filtered_df['Muscle Group'] == selected_muscle]
+        filter_muscle = selected_muscle
+    filtered_totals = cube.totals(week=filter_week, muscle=filter_muscle)
     
     # Header with gradient
     st.markdown(f"""
@@ -783,11 +712,11 @@ def main():
                         <div class="header-stat-label">Current Week</div>
                     </div>
                     <div class="header-stat">
-                        <div class="header-stat-value">{len(filtered_df)}</div>
+                        <div class="header-stat-value">{filtered_totals['Count']}</div>
                         <div class="header-stat-label">Exercises</div>
                     </div>
                     <div class="header-stat">
-                        <div class="header-stat-value">{filtered_df['Volume'].sum():.0f}</div>
+                        <div class="header-stat-value">{filtered_totals['Volume']:.0f}</div>
                         <div class="header-stat-label">Total Volume</div>
                     </div>
                 </div>
@@ -820,23 +749,23 @@ def main():
     
     st.markdown('</div></div>', unsafe_allow_html=True)
     
-    # Create tabs for different views
-    tab1, tab2, tab3 = st.tabs(["📊 Overview", "📈 Analytics", "📋 Training Log"])
+    # View selector - unlike st.tabs, only the active view's analytics run on a rerun
+    view = st.radio("View", VIEWS, horizontal=True, label_visibility="collapsed", key="main_view")
     
-    with tab1:
+    if view == "📊 Overview":
         # Key Metrics Row
         col1, col2, col3, col4 = st.columns(4)
         
         # Calculate metrics
-        total_volume = filtered_df['Volume'].sum()
-        total_sets = filtered_df['Sets'].sum()
-        avg_rest = filtered_df['Rest'].mean()
-        unique_exercises = filtered_df['Exercise'].nunique()
+        total_volume = filtered_totals['Volume']
+        total_sets = filtered_totals['Sets']
+        avg_rest = filtered_totals['Avg Rest']
+        unique_exercises = cube.distinct('Exercise', week=filter_week, muscle=filter_muscle)
         
         # Calculate week-over-week changes if possible
         if current_week > 1 and selected_week == "All Weeks":
-            current_week_volume = df[df['Week'] == current_week]['Volume'].sum()
-            prev_week_volume = df[df['Week'] == current_week - 1]['Volume'].sum()
+            current_week_volume = cube.totals(week=current_week)['Volume']
+            prev_week_volume = cube.totals(week=current_week - 1)['Volume']
             volume_change = ((current_week_volume - prev_week_volume) / prev_week_volume * 100) if prev_week_volume > 0 else 0
         else:
             volume_change = None
@@ -861,7 +790,7 @@ def main():
             st.markdown('<div class="chart-header"><div><div class="chart-title">WEEKLY VOLUME PROGRESSION</div><div class="chart-subtitle">Total training volume per week</div></div></div>', unsafe_allow_html=True)
             
             # Weekly volume chart
-            weekly_volume = df.groupby('Week')['Volume'].sum().reset_index()
+            weekly_volume = cube.rollup(('Week',))[['Week', 'Volume']]
             
             fig = go.Figure()
             
@@ -917,7 +846,7 @@ def main():
             st.markdown('<div class="chart-header"><div><div class="chart-title">MUSCLE GROUP DISTRIBUTION</div><div class="chart-subtitle">Volume by muscle group</div></div></div>', unsafe_allow_html=True)
             
             # Muscle group distribution
-            muscle_dist = filtered_df.groupby('Muscle Group')['Volume'].sum().reset_index()
+            muscle_dist = cube.rollup(('Muscle Group',), week=filter_week, muscle=filter_muscle)[['Muscle Group', 'Volume']]
             muscle_dist = muscle_dist.sort_values('Volume', ascending=True)
             
             # Create gradient colors for each bar
@@ -969,16 +898,16 @@ def main():
         
         with col2:
             # Calculate intensity (based on rest times - lower rest = higher intensity)
-            avg_rest = filtered_df['Rest'].mean()
+            avg_rest = filtered_totals['Avg Rest']
             intensity_pct = max(0, min(100, 100 - (avg_rest / 120 * 100)))  # Assuming 120s is low intensity
             st.markdown(create_progress_ring(int(intensity_pct), "TRAINING INTENSITY"), unsafe_allow_html=True)
         
         with col3:
             # Calculate consistency (how many planned exercises have data)
-            consistency_pct = min(100, (len(filtered_df) / (unique_exercises * current_week)) * 100) if unique_exercises > 0 else 0
+            consistency_pct = min(100, (filtered_totals['Count'] / (unique_exercises * current_week)) * 100) if unique_exercises > 0 else 0
             st.markdown(create_progress_ring(int(consistency_pct), "CONSISTENCY SCORE"), unsafe_allow_html=True)
     
-    with tab2:
+    elif view == "📈 Analytics":
         # Analytics view with more detailed charts
         st.markdown('<div class="chart-card">', unsafe_allow_html=True)
         st.markdown('<div class="chart-header"><div><div class="chart-title">EXERCISE VOLUME HEATMAP</div><div class="chart-subtitle">Volume distribution across weeks and muscle groups</div></div></div>', unsafe_allow_html=True)
@@ -1024,7 +953,7 @@ def main():
             st.markdown('<div class="chart-card">', unsafe_allow_html=True)
             st.markdown('<div class="chart-header"><div><div class="chart-title">TOP EXERCISES BY VOLUME</div><div class="chart-subtitle">Most demanding exercises</div></div></div>', unsafe_allow_html=True)
             
-            top_exercises = filtered_df.groupby('Exercise')['Volume'].sum().nlargest(10).reset_index()
+            top_exercises = cube.rollup(('Exercise',), week=filter_week, muscle=filter_muscle)[['Exercise', 'Volume']].nlargest(10, 'Volume')
             
             fig = go.Figure()
             
@@ -1084,7 +1013,7 @@ def main():
             st.plotly_chart(fig, use_container_width=True)
             st.markdown('</div>', unsafe_allow_html=True)
     
-    with tab3:  # Training Log view
+    elif view == "📋 Training Log":
         st.markdown('<div class="chart-card">', unsafe_allow_html=True)
         st.markdown('<div class="chart-header"><div><div class="chart-title">TRAINING LOG</div><div class="chart-subtitle">Detailed exercise data</div></div></div>', unsafe_allow_html=True)
         
@@ -1113,7 +1042,7 @@ def main():
             st.markdown(f"""
                 <div style="text-align: center;">
                     <div class="metric-label">TOTAL EXERCISES</div>
-                    <div class="metric-value">{len(filtered_df)}</div>
+                    <div class="metric-value">{filtered_totals['Count']}</div>
                 </div>
             """, unsafe_allow_html=True)
             st.markdown('</div>', unsafe_allow_html=True)
@@ -1123,7 +1052,7 @@ def main():
             st.markdown(f"""
                 <div style="text-align: center;">
                     <div class="metric-label">AVG SETS PER EXERCISE</div>
-                    <div class="metric-value">{filtered_df['Sets'].mean():.1f}</div>
+                    <div class="metric-value">{filtered_totals['Avg Sets']:.1f}</div>
                 </div>
             """, unsafe_allow_html=True)
             st.markdown('</div>', unsafe_allow_html=True)
@@ -1133,7 +1062,7 @@ def main():
             st.markdown(f"""
                 <div style="text-align: center;">
                     <div class="metric-label">AVG REPS PER SET</div>
-                    <div class="metric-value">{filtered_df['Reps'].mean():.1f}</div>
+                    <div class="metric-value">{filtered_totals['Avg Reps']:.1f}</div>
                 </div>
             """, unsafe_allow_html=True)
             st.markdown('</div>', unsafe_allow_html=True)
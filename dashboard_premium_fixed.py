@@ -9,7 +9,6 @@ import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
 from datetime import datetime, timedelta
-import gspread
 from pathlib import Path
 import sys
 import numpy as np
@@ -19,36 +18,12 @@ BASE_DIR = Path(__file__).parent
 BACKEND_DIR = BASE_DIR / 'backend'
 sys.path.insert(0, str(BACKEND_DIR))
 
-# Configuration
-SPREADSHEET_URL = 'https://docs.google.com/spreadsheets/d/1Js2s7s95miuUzdn44guWnGuML2kxYzN3kG_jsEdWu68/edit'
+# Shared, cached workbook (credentials from Streamlit secrets or credentials.json)
+from streamlit_app.data_loader import load_dataset
+from streamlit_app.ui_components import cached_figure
+from streamlit_app.training_log import PAGE_SIZE
 
-# Handle credentials for both local and Streamlit Cloud
-def get_credentials():
-    """Get credentials from either local file or Streamlit secrets"""
-    # Try Streamlit Cloud secrets first
-    try:
-        if 'gcp_service_account' in st.secrets:
-            # Convert Streamlit secrets to proper dict format
-            creds = dict(st.secrets['gcp_service_account'])
-            
-            # Fix the private key newlines (common issue with TOML secrets)
-            if 'private_key' in creds:
-                creds['private_key'] = creds['private_key'].replace('\\n', '\n')
-                
-            return creds
-    except Exception as e:
-        st.error(f"Error loading Streamlit secrets: {str(e)}")
-        pass
-    
-    # Fall back to local credentials.json
-    cred_path = BASE_DIR / 'credentials.json'
-    if cred_path.exists():
-        import json
-        with open(cred_path, 'r') as f:
-            return json.load(f)
-    
-    st.error("No credentials found! Please add credentials.json locally or configure Streamlit Cloud secrets.")
-    st.stop()
+VIEWS = ["📊 Overview", "📈 Analytics", "📋 Training Log"]
 
 # Page config - MUST BE FIRST
 st.set_page_config(
@@ -656,6 +631,27 @@ st.markdown("""
         background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
     }
     
+    /* View selector (radio styled as tabs) */
+    .stRadio [role="radiogroup"] {
+        background: var(--bg-card);
+        padding: 0.5rem;
+        border-radius: 12px;
+        gap: 0.5rem;
+    }
+    
+    .stRadio [role="radiogroup"] label {
+        padding: 0.5rem 1.25rem;
+        border-radius: 8px;
+        font-family: 'Inter', sans-serif;
+        font-weight: 600;
+        color: var(--text-muted);
+    }
+    
+    .stRadio [role="radiogroup"] label:has(input:checked) {
+        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        color: white;
+    }
+    
     /* Data tables */
     .dataframe {
         background: var(--bg-card) !important;
@@ -747,76 +743,6 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
-# Cache functions
-@st.cache_resource
-def init_connection():
-    """Initialize Google Sheets connection"""
-    creds = get_credentials()
-    gc = gspread.service_account_from_dict(creds)
-    return gc.open_by_url(SPREADSHEET_URL)
-
-@st.cache_data(ttl=60)
-def load_training_data():
-    """Load all training data from Google Sheets"""
-    ss = init_connection()
-    all_data = []
-    
-    for week_num in range(1, 9):
-        try:
-            sheet = ss.worksheet(f"Week {week_num}")
-            data = sheet.get_all_values()
-            
-            if len(data) > 1:
-                df = pd.DataFrame(data[1:], columns=data[0])
-                df['Week'] = week_num
-                
-                for _, row in df.iterrows():
-                    if row.get('Exercise') and str(row['Exercise']).strip() not in ['', 'Exercise']:
-                        # Parse sets
-                        sets_str = str(row.get('Sets', '0'))
-                        if '-' in sets_str:
-                            parts = sets_str.split('-')
-                            sets = (float(parts[0]) + float(parts[1])) / 2 if len(parts) == 2 else 0
-                        else:
-                            try:
-                                sets = float(sets_str) if sets_str else 0
-                            except:
-                                sets = 0
-                        
-                        # Parse reps
-                        reps_str = str(row.get('Reps', '0'))
-                        if '-' in reps_str:
-                            parts = reps_str.split('-')
-                            reps = (float(parts[0]) + float(parts[1])) / 2 if len(parts) == 2 else 0
-                        else:
-                            try:
-                                reps = float(reps_str) if reps_str else 0
-                            except:
-                                reps = 0
-                        
-                        # Parse rest
-                        rest_str = str(row.get('Rest (Seconds)', '0'))
-                        try:
-                            rest = float(rest_str) if rest_str else 0
-                        except:
-                            rest = 0
-                        
-                        all_data.append({
-                            'Week': week_num,
-                            'Day': row.get('Day', ''),
-                            'Muscle Group': row.get('Muscle Group', ''),
-                            'Exercise': row['Exercise'],
-                            'Sets': sets,
-                            'Reps': reps,
-                            'Rest': rest,
-                            'Volume': sets * reps
-                        })
-        except Exception as e:
-            st.warning(f"Could not load Week {week_num}: {str(e)}")
-            continue
-    
-    return pd.DataFrame(all_data)
-
 def get_mobile_chart_height():
     """Get appropriate chart height based on viewport"""
     return """
@@ -908,7 +834,8 @@ def main():
         
         # Load data
         try:
-            df = load_training_data()
+            data = load_dataset()
+            df, cube = data.training, data.cube
             if df.empty:
                 st.error("❌ No training data found")
                 st.info("Please ensure your Google Sheets has data in Week 1-8 sheets")
@@ -919,38 +846,18 @@ def main():
         
         # Calculate current state
         current_week = df['Week'].max()
-        available_weeks = sorted(df['Week'].unique())
-        available_muscle_groups = sorted(df['Muscle Group'].unique())
-        available_exercises = sorted(df['Exercise'].unique())
-        
-        st.markdown('<div class="sidebar-title">🎯 DATA FILTERS</div>', unsafe_allow_html=True)
-        
-        # Week filter
-        selected_week = st.selectbox(
-            "📅 Week Selection",
-            options=["All Weeks"] + [f"Week {w}" for w in available_weeks],
-            index=0
-        )
-        
-        # Muscle group filter
-        selected_muscle = st.selectbox(
-            "💪 Muscle Group",
-            options=["All Groups"] + available_muscle_groups,
-            index=0
-        )
-        
-        st.markdown('<div style="margin: 1.5rem 0; border-top: 1px solid var(--border-color);"></div>', unsafe_allow_html=True)
         
         # DETAILED STATS SECTION
         st.markdown('<div class="sidebar-title">📊 PERFORMANCE METRICS</div>', unsafe_allow_html=True)
         
-        # Calculate detailed metrics
-        total_workouts = len(df[df['Week'] <= current_week]['Day'].unique())
-        total_exercises_done = len(df)
-        avg_volume = df['Volume'].mean()
-        total_volume = df['Volume'].sum()
-        avg_sets_per_exercise = df['Sets'].mean()
-        avg_reps_per_set = df['Reps'].mean()
+        # Calculate detailed metrics (current_week is the latest week, so this covers every day)
+        totals = cube.totals()
+        total_workouts = cube.distinct('Day')
+        total_exercises_done = totals['Count']
+        avg_volume = totals['Avg Volume']
+        total_volume = totals['Volume']
+        avg_sets_per_exercise = totals['Avg Sets']
+        avg_reps_per_set = totals['Avg Reps']
         
         col1, col2 = st.columns(2)
         with col1:
@@ -968,11 +875,7 @@ def main():
         # WEEKLY BREAKDOWN
         st.markdown('<div class="sidebar-title">📈 WEEKLY BREAKDOWN</div>', unsafe_allow_html=True)
         
-        weekly_stats = df.groupby('Week').agg({
-            'Volume': 'sum',
-            'Exercise': 'count',
-            'Sets': 'sum'
-        }).round(0)
+        weekly_stats = cube.rollup(('Week',)).set_index('Week').rename(columns={'Count': 'Exercise'})
         
         for week in weekly_stats.index:
             with st.expander(f"Week {week} Stats", expanded=bool(week == current_week)):
@@ -998,7 +901,7 @@ def main():
         # TOP EXERCISES
         st.markdown('<div class="sidebar-title">🏆 TOP EXERCISES</div>', unsafe_allow_html=True)
         
-        top_5_exercises = df.groupby('Exercise')['Volume'].sum().nlargest(5)
+        top_5_exercises = cube.rollup(('Exercise',)).set_index('Exercise')['Volume'].nlargest(5)
         for exercise, volume in top_5_exercises.items():
             progress_pct = (volume / top_5_exercises.iloc[0]) * 100
             st.markdown(f"""
@@ -1016,14 +919,52 @@ def main():
             """, unsafe_allow_html=True)
     
     # MAIN CONTENT AREA
-    # Apply filters
-    filtered_df = df.copy()
+    dashboard_body()
+
+@st.experimental_fragment
+def dashboard_body():
+    """
+    Filters, header and the active view. A fragment: changing a filter, the
+    view or a Training Log selector reruns only this, not the CSS, loader
+    and sidebar analytics. It reads the current dataset on every run, so a
+    background refresh shows up without a full rerun. Charts come from the
+    figure cache keyed by the data version and the filters they depend on
+    """
+    data = load_dataset()
+    df, cube, log, version = data.training, data.cube, data.log, data.version
+    if df.empty:
+        st.error("❌ No training data found")
+        return
+    current_week = df['Week'].max()
+    
+    # DATA FILTERS
+    col1, col2, col3 = st.columns([2, 2, 8])
+    with col1:
+        # Week filter
+        selected_week = st.selectbox(
+            "📅 Week Selection",
+            options=["All Weeks"] + [f"Week {w}" for w in cube.options['Week']],
+            index=0,
+            key="filter_week"
+        )
+    
+    with col2:
+        # Muscle group filter
+        selected_muscle = st.selectbox(
+            "💪 Muscle Group",
+            options=["All Groups"] + cube.options['Muscle Group'],
+            index=0,
+            key="filter_muscle"
+        )
+    
+    # Apply filters (cube slices and log rows use the same filter; None = all)
+    filter_week = filter_muscle = None
     if selected_week != "All Weeks":
-        week_num = int(selected_week.split()[1])
-        filtered_df = filtered_df[filtered_df['Week'] == week_num]
+        filter_week = int(selected_week.split()[1])
     
     if selected_muscle != "All Groups":
-        filtered_df = filtered_df[filtered_df['Muscle Group'] == selected_muscle]
+        filter_muscle = selected_muscle
+    filtered_totals = cube.totals(week=filter_week, muscle=filter_muscle)
     
     # Header with gradient
     st.markdown(f"""
@@ -1039,11 +980,11 @@ def main():
                         <div class="header-stat-label">Current Week</div>
                     </div>
                     <div class="header-stat">
-                        <div class="header-stat-value">{len(filtered_df)}</div>
+                        <div class="header-stat-value">{filtered_totals['Count']}</div>
                         <div class="header-stat-label">Exercises</div>
                     </div>
                     <div class="header-stat">
-                        <div class="header-stat-value">{filtered_df['Volume'].sum():.0f}</div>
+                        <div class="header-stat-value">{filtered_totals['Volume']:.0f}</div>
                         <div class="header-stat-label">Total Volume</div>
                     </div>
                 </div>
@@ -1076,23 +1017,23 @@ def main():
     
     st.markdown('</div></div>', unsafe_allow_html=True)
     
-    # Create tabs for different views
-    tab1, tab2, tab3 = st.tabs(["📊 Overview", "📈 Analytics", "📋 Training Log"])
+    # View selector - unlike st.tabs, only the active view's analytics run on a rerun
+    view = st.radio("View", VIEWS, horizontal=True, label_visibility="collapsed", key="main_view")
     
-    with tab1:
+    if view == "📊 Overview":
         # Key Metrics Row
         col1, col2, col3, col4 = st.columns(4)
         
         # Calculate metrics
-        total_volume = filtered_df['Volume'].sum()
-        total_sets = filtered_df['Sets'].sum()
-        avg_rest = filtered_df['Rest'].mean()
-        unique_exercises = filtered_df['Exercise'].nunique()
+        total_volume = filtered_totals['Volume']
+        total_sets = filtered_totals['Sets']
+        avg_rest = filtered_totals['Avg Rest']
+        unique_exercises = cube.distinct('Exercise', week=filter_week, muscle=filter_muscle)
         
         # Calculate week-over-week changes if possible
         if current_week > 1 and selected_week == "All Weeks":
-            current_week_volume = df[df['Week'] == current_week]['Volume'].sum()
-            prev_week_volume = df[df['Week'] == current_week - 1]['Volume'].sum()
+            current_week_volume = cube.totals(week=current_week)['Volume']
+            prev_week_volume = cube.totals(week=current_week - 1)['Volume']
             volume_change = ((current_week_volume - prev_week_volume) / prev_week_volume * 100) if prev_week_volume > 0 else 0
         else:
             volume_change = None
@@ -1116,103 +1057,107 @@ def main():
             st.markdown('<div class="chart-card">', unsafe_allow_html=True)
             st.markdown('<div class="chart-header"><div><div class="chart-title">WEEKLY VOLUME PROGRESSION</div><div class="chart-subtitle">Total training volume per week</div></div></div>', unsafe_allow_html=True)
             
-            # Weekly volume chart
-            weekly_volume = df.groupby('Week')['Volume'].sum().reset_index()
-            
-            fig = go.Figure()
-            
-            # Add gradient area chart
-            fig.add_trace(go.Scatter(
-                x=weekly_volume['Week'],
-                y=weekly_volume['Volume'],
-                mode='lines+markers',
-                name='Volume',
-                line=dict(color='#667eea', width=3),
-                marker=dict(size=8, color='#764ba2'),
-                fill='tozeroy',
-                fillcolor='rgba(102, 126, 234, 0.2)',
-                hovertemplate='Week %{x}<br>Volume: %{y:,.0f}<extra></extra>'
-            ))
-            
-            # Add current week indicator
-            if current_week <= 8:
-                fig.add_vline(
-                    x=current_week,
-                    line_dash="dash",
-                    line_color="#00e5a0",
-                    annotation_text=f"Current",
-                    annotation_position="top"
+            def build():
+                # Weekly volume chart
+                weekly_volume = cube.rollup(('Week',))[['Week', 'Volume']]
+                
+                fig = go.Figure()
+                
+                # Add gradient area chart
+                fig.add_trace(go.Scatter(
+                    x=weekly_volume['Week'],
+                    y=weekly_volume['Volume'],
+                    mode='lines+markers',
+                    name='Volume',
+                    line=dict(color='#667eea', width=3),
+                    marker=dict(size=8, color='#764ba2'),
+                    fill='tozeroy',
+                    fillcolor='rgba(102, 126, 234, 0.2)',
+                    hovertemplate='Week %{x}<br>Volume: %{y:,.0f}<extra></extra>'
+                ))
+                
+                # Add current week indicator
+                if current_week <= 8:
+                    fig.add_vline(
+                        x=current_week,
+                        line_dash="dash",
+                        line_color="#00e5a0",
+                        annotation_text=f"Current",
+                        annotation_position="top"
+                    )
+                
+                fig.update_layout(
+                    plot_bgcolor='#1a1a28',
+                    paper_bgcolor='#1a1a28',
+                    font=dict(color='#c8c8d8', family='Inter'),
+                    xaxis=dict(
+                        title='Week',
+                        showgrid=True,
+                        gridcolor='#2a2a3e',
+                        zeroline=False
+                    ),
+                    yaxis=dict(
+                        title='Volume',
+                        showgrid=True,
+                        gridcolor='#2a2a3e',
+                        zeroline=False
+                    ),
+                    height=250,  # Mobile-friendly height
+                    margin=dict(l=0, r=0, t=0, b=0),
+                    showlegend=False
                 )
+                return fig
             
-            fig.update_layout(
-                plot_bgcolor='#1a1a28',
-                paper_bgcolor='#1a1a28',
-                font=dict(color='#c8c8d8', family='Inter'),
-                xaxis=dict(
-                    title='Week',
-                    showgrid=True,
-                    gridcolor='#2a2a3e',
-                    zeroline=False
-                ),
-                yaxis=dict(
-                    title='Volume',
-                    showgrid=True,
-                    gridcolor='#2a2a3e',
-                    zeroline=False
-                ),
-                height=250,  # Mobile-friendly height
-                margin=dict(l=0, r=0, t=0, b=0),
-                showlegend=False
-            )
-            
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(cached_figure(version, 'weekly_volume', (), build), use_container_width=True)
             st.markdown('</div>', unsafe_allow_html=True)
         
         with col2:
             st.markdown('<div class="chart-card">', unsafe_allow_html=True)
             st.markdown('<div class="chart-header"><div><div class="chart-title">MUSCLE GROUP DISTRIBUTION</div><div class="chart-subtitle">Volume by muscle group</div></div></div>', unsafe_allow_html=True)
             
-            # Muscle group distribution
-            muscle_dist = filtered_df.groupby('Muscle Group')['Volume'].sum().reset_index()
-            muscle_dist = muscle_dist.sort_values('Volume', ascending=True)
-            
-            # Create gradient colors for each bar
-            colors = ['#667eea', '#764ba2', '#00c896', '#00e5a0', '#ff4757', '#ff6b7a', '#4a9eff', '#667eea']
-            
-            fig = go.Figure()
-            
-            fig.add_trace(go.Bar(
-                x=muscle_dist['Volume'],
-                y=muscle_dist['Muscle Group'],
-                orientation='h',
-                marker=dict(
-                    color=colors[:len(muscle_dist)],
-                    line=dict(width=0)
-                ),
-                hovertemplate='%{y}<br>Volume: %{x:,.0f}<extra></extra>'
-            ))
-            
-            fig.update_layout(
-                plot_bgcolor='#1a1a28',
-                paper_bgcolor='#1a1a28',
-                font=dict(color='#c8c8d8', family='Inter'),
-                xaxis=dict(
-                    title='Volume',
-                    showgrid=True,
-                    gridcolor='#2a2a3e',
-                    zeroline=False
-                ),
-                yaxis=dict(
-                    title='',
-                    showgrid=False,
-                    zeroline=False
-                ),
-                height=300,
-                margin=dict(l=0, r=0, t=0, b=0),
-                showlegend=False
-            )
+            def build():
+                # Muscle group distribution
+                muscle_dist = cube.rollup(('Muscle Group',), week=filter_week, muscle=filter_muscle)[['Muscle Group', 'Volume']]
+                muscle_dist = muscle_dist.sort_values('Volume', ascending=True)
+                
+                # Create gradient colors for each bar
+                colors = ['#667eea', '#764ba2', '#00c896', '#00e5a0', '#ff4757', '#ff6b7a', '#4a9eff', '#667eea']
+                
+                fig = go.Figure()
+                
+                fig.add_trace(go.Bar(
+                    x=muscle_dist['Volume'],
+                    y=muscle_dist['Muscle Group'],
+                    orientation='h',
+                    marker=dict(
+                        color=colors[:len(muscle_dist)],
+                        line=dict(width=0)
+                    ),
+                    hovertemplate='%{y}<br>Volume: %{x:,.0f}<extra></extra>'
+                ))
+                
+                fig.update_layout(
+                    plot_bgcolor='#1a1a28',
+                    paper_bgcolor='#1a1a28',
+                    font=dict(color='#c8c8d8', family='Inter'),
+                    xaxis=dict(
+                        title='Volume',
+                        showgrid=True,
+                        gridcolor='#2a2a3e',
+                        zeroline=False
+                    ),
+                    yaxis=dict(
+                        title='',
+                        showgrid=False,
+                        zeroline=False
+                    ),
+                    height=300,
+                    margin=dict(l=0, r=0, t=0, b=0),
+                    showlegend=False
+                )
+                return fig
             
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(cached_figure(version, 'muscle_distribution', (filter_week, filter_muscle), build), use_container_width=True)
             st.markdown('</div>', unsafe_allow_html=True)
         
         # Progress indicators row
@@ -1225,459 +1170,454 @@ def main():
         
         with col2:
             # Calculate intensity (based on rest times - lower rest = higher intensity)
-            avg_rest = filtered_df['Rest'].mean()
+            avg_rest = filtered_totals['Avg Rest']
             intensity_pct = max(0, min(100, 100 - (avg_rest / 120 * 100)))  # Assuming 120s is low intensity
             st.markdown(create_progress_ring(int(intensity_pct), "TRAINING INTENSITY"), unsafe_allow_html=True)
         
         with col3:
             # Calculate consistency (how many planned exercises have data)
-            consistency_pct = min(100, (len(filtered_df) / (unique_exercises * current_week)) * 100) if unique_exercises > 0 else 0
+            consistency_pct = min(100, (filtered_totals['Count'] / (unique_exercises * current_week)) * 100) if unique_exercises > 0 else 0
             st.markdown(create_progress_ring(int(consistency_pct), "CONSISTENCY SCORE"), unsafe_allow_html=True)
     
-    with tab2:
+    elif view == "📈 Analytics":
         # Advanced Analytics with Intelligent Insights
         
         # FATIGUE & RECOVERY ANALYSIS
         st.markdown('<div class="chart-card">', unsafe_allow_html=True)
         st.markdown('<div class="chart-header"><div><div class="chart-title">FATIGUE & RECOVERY PATTERNS</div><div class="chart-subtitle">Volume accumulation and rest distribution across the program</div></div></div>', unsafe_allow_html=True)
         
-        # Calculate cumulative volume and fatigue score
-        weekly_data = df.groupby('Week').agg({
-            'Volume': 'sum',
-            'Sets': 'sum',
-            'Rest': 'mean'
-        }).reset_index()
-        
-        weekly_data['Cumulative_Volume'] = weekly_data['Volume'].cumsum()
-        weekly_data['Fatigue_Score'] = (weekly_data['Volume'] / weekly_data['Rest']).rolling(window=2, min_periods=1).mean()
-        
-        # Create subplot with secondary y-axis
-        from plotly.subplots import make_subplots
-        
-        fig = make_subplots(
-            rows=2, cols=1,
-            subplot_titles=('Cumulative Volume vs Weekly Load', 'Fatigue Accumulation Score'),
-            vertical_spacing=0.12,
-            row_heights=[0.6, 0.4]
-        )
-        
-        # Top plot - Volume analysis
-        fig.add_trace(
-            go.Bar(
-                x=weekly_data['Week'],
-                y=weekly_data['Volume'],
-                name='Weekly Volume',
-                marker_color='#667eea',
-                opacity=0.7,
-                hovertemplate='Week %{x}<br>Volume: %{y:,.0f}<extra></extra>'
-            ),
-            row=1, col=1
-        )
-        
-        fig.add_trace(
-            go.Scatter(
-                x=weekly_data['Week'],
-                y=weekly_data['Cumulative_Volume'],
-                name='Cumulative Volume',
-                line=dict(color='#00e5a0', width=3),
-                mode='lines+markers',
-                marker=dict(size=8, color='#00c896'),
-                hovertemplate='Week %{x}<br>Total: %{y:,.0f}<extra></extra>'
-            ),
-            row=1, col=1
-        )
-        
-        # Bottom plot - Fatigue score
-        fig.add_trace(
-            go.Scatter(
-                x=weekly_data['Week'],
-                y=weekly_data['Fatigue_Score'],
-                name='Fatigue Score',
-                line=dict(color='#ff4757', width=2.5),
-                fill='tozeroy',
-                fillcolor='rgba(255, 71, 87, 0.2)',
-                mode='lines+markers',
-                marker=dict(size=6),
-                hovertemplate='Week %{x}<br>Fatigue: %{y:.1f}<extra></extra>'
-            ),
-            row=2, col=1
-        )
-        
-        # Add optimal zone
-        fig.add_hrect(
-            y0=weekly_data['Fatigue_Score'].mean() * 0.8,
-            y1=weekly_data['Fatigue_Score'].mean() * 1.2,
-            fillcolor='rgba(102, 126, 234, 0.1)',
-            line_width=0,
-            row=2, col=1
-        )
-        
-        fig.update_layout(
-            plot_bgcolor='#1a1a28',
-            paper_bgcolor='#1a1a28',
-            font=dict(color='#c8c8d8', family='Inter'),
-            height=500,
-            showlegend=True,
-            legend=dict(
-                orientation="h",
-                yanchor="bottom",
-                y=1.02,
-                xanchor="right",
-                x=1
-            ),
-            hovermode='x unified'
-        )
-        
-        fig.update_xaxes(showgrid=True, gridcolor='#2a2a3e', title='Week', row=2, col=1)
-        fig.update_yaxes(showgrid=True, gridcolor='#2a2a3e', title='Volume', row=1, col=1)
-        fig.update_yaxes(showgrid=True, gridcolor='#2a2a3e', title='Fatigue Score', row=2, col=1)
-        
-        st.plotly_chart(fig, use_container_width=True)
-        st.markdown('</div>', unsafe_allow_html=True)
-        
-        # MUSCLE GROUP BALANCE & OPTIMIZATION
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.markdown('<div class="chart-card">', unsafe_allow_html=True)
-            st.markdown('<div class="chart-header"><div><div class="chart-title">MUSCLE GROUP BALANCE ANALYSIS</div><div class="chart-subtitle">Identifying training imbalances and optimization opportunities</div></div></div>', unsafe_allow_html=True)
+        def build():
+            # Calculate cumulative volume and fatigue score
+            weekly_data = cube.rollup(('Week',))[['Week', 'Volume', 'Sets', 'Avg Rest']].rename(columns={'Avg Rest': 'Rest'})
             
-            # Calculate muscle group metrics
-            muscle_metrics = df.groupby('Muscle Group').agg({
-                'Volume': 'sum',
-                'Sets': 'sum',
-                'Exercise': 'count',
-                'Rest': 'mean'
-            }).reset_index()
+            weekly_data['Cumulative_Volume'] = weekly_data['Volume'].cumsum()
+            weekly_data['Fatigue_Score'] = (weekly_data['Volume'] / weekly_data['Rest']).rolling(window=2, min_periods=1).mean()
             
-            # Calculate ideal ratios (example: push/pull balance)
-            total_volume = muscle_metrics['Volume'].sum()
-            muscle_metrics['Volume_Percentage'] = (muscle_metrics['Volume'] / total_volume * 100).round(1)
-            muscle_metrics['Efficiency'] = muscle_metrics['Volume'] / muscle_metrics['Sets']  # Volume per set
+            # Create subplot with secondary y-axis
+            from plotly.subplots import make_subplots
             
-            # Radar chart for muscle balance
-            fig = go.Figure()
+            fig = make_subplots(
+                rows=2, cols=1,
+                subplot_titles=('Cumulative Volume vs Weekly Load', 'Fatigue Accumulation Score'),
+                vertical_spacing=0.12,
+                row_heights=[0.6, 0.4]
+            )
             
-            # Add actual values
-            fig.add_trace(go.Scatterpolar(
-                r=muscle_metrics['Volume_Percentage'],
-                theta=muscle_metrics['Muscle Group'],
-                fill='toself',
-                fillcolor='rgba(102, 126, 234, 0.3)',
-                line=dict(color='#667eea', width=2),
-                name='Current Distribution',
-                hovertemplate='%{theta}<br>%{r:.1f}% of total volume<extra></extra>'
-            ))
+            # Top plot - Volume analysis
+            fig.add_trace(
+                go.Bar(
+                    x=weekly_data['Week'],
+                    y=weekly_data['Volume'],
+                    name='Weekly Volume',
+                    marker_color='#667eea',
+                    opacity=0.7,
+                    hovertemplate='Week %{x}<br>Volume: %{y:,.0f}<extra></extra>'
+                ),
+                row=1, col=1
+            )
             
-            # Add ideal balanced distribution
-            ideal_percentage = 100 / len(muscle_metrics)
-            fig.add_trace(go.Scatterpolar(
-                r=[ideal_percentage] * len(muscle_metrics),
-                theta=muscle_metrics['Muscle Group'],
-                line=dict(color='#00e5a0', width=1, dash='dash'),
-                name='Balanced Target',
-                hovertemplate='%{theta}<br>Ideal: %{r:.1f}%<extra></extra>'
-            ))
+            fig.add_trace(
+                go.Scatter(
+                    x=weekly_data['Week'],
+                    y=weekly_data['Cumulative_Volume'],
+                    name='Cumulative Volume',
+                    line=dict(color='#00e5a0', width=3),
+                    mode='lines+markers',
+                    marker=dict(size=8, color='#00c896'),
+                    hovertemplate='Week %{x}<br>Total: %{y:,.0f}<extra></extra>'
+                ),
+                row=1, col=1
+            )
             
-            fig.update_layout(
-                polar=dict(
-                    radialaxis=dict(
-                        visible=True,
-                        range=[0, max(muscle_metrics['Volume_Percentage'].max(), ideal_percentage) * 1.2],
-                        gridcolor='#2a2a3e',
-                        tickfont=dict(color='#9898b0', size=10)
-                    ),
-                    angularaxis=dict(
-                        gridcolor='#2a2a3e',
-                        tickfont=dict(color='#c8c8d8', size=11)
-                    ),
-                    bgcolor='#1a1a28'
+            # Bottom plot - Fatigue score
+            fig.add_trace(
+                go.Scatter(
+                    x=weekly_data['Week'],
+                    y=weekly_data['Fatigue_Score'],
+                    name='Fatigue Score',
+                    line=dict(color='#ff4757', width=2.5),
+                    fill='tozeroy',
+                    fillcolor='rgba(255, 71, 87, 0.2)',
+                    mode='lines+markers',
+                    marker=dict(size=6),
+                    hovertemplate='Week %{x}<br>Fatigue: %{y:.1f}<extra></extra>'
                 ),
+                row=2, col=1
+            )
+            
+            # Add optimal zone
+            fig.add_hrect(
+                y0=weekly_data['Fatigue_Score'].mean() * 0.8,
+                y1=weekly_data['Fatigue_Score'].mean() * 1.2,
+                fillcolor='rgba(102, 126, 234, 0.1)',
+                line_width=0,
+                row=2, col=1
+            )
+            
+            fig.update_layout(
                 plot_bgcolor='#1a1a28',
                 paper_bgcolor='#1a1a28',
                 font=dict(color='#c8c8d8', family='Inter'),
-                height=400,
+                height=500,
                 showlegend=True,
                 legend=dict(
-                    orientation="v",
-                    yanchor="top",
-                    y=1,
-                    xanchor="left",
-                    x=0
-                )
+                    orientation="h",
+                    yanchor="bottom",
+                    y=1.02,
+                    xanchor="right",
+                    x=1
+                ),
+                hovermode='x unified'
             )
             
-            st.plotly_chart(fig, use_container_width=True)
+            fig.update_xaxes(showgrid=True, gridcolor='#2a2a3e', title='Week', row=2, col=1)
+            fig.update_yaxes(showgrid=True, gridcolor='#2a2a3e', title='Volume', row=1, col=1)
+            fig.update_yaxes(showgrid=True, gridcolor='#2a2a3e', title='Fatigue Score', row=2, col=1)
+            return fig
+        
+        st.plotly_chart(cached_figure(version, 'fatigue_recovery', (), build), use_container_width=True)
+        st.markdown('</div>', unsafe_allow_html=True)
+        
+        # MUSCLE GROUP BALANCE & OPTIMIZATION
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.markdown('<div class="chart-card">', unsafe_allow_html=True)
+            st.markdown('<div class="chart-header"><div><div class="chart-title">MUSCLE GROUP BALANCE ANALYSIS</div><div class="chart-subtitle">Identifying training imbalances and optimization opportunities</div></div></div>', unsafe_allow_html=True)
+            
+            def build():
+                # Calculate muscle group metrics
+                muscle_metrics = cube.rollup(('Muscle Group',))[['Muscle Group', 'Volume', 'Sets', 'Count', 'Avg Rest']].rename(
+                    columns={'Count': 'Exercise', 'Avg Rest': 'Rest'})
+                
+                # Calculate ideal ratios (example: push/pull balance)
+                total_volume = muscle_metrics['Volume'].sum()
+                muscle_metrics['Volume_Percentage'] = (muscle_metrics['Volume'] / total_volume * 100).round(1)
+                muscle_metrics['Efficiency'] = muscle_metrics['Volume'] / muscle_metrics['Sets']  # Volume per set
+                
+                # Radar chart for muscle balance
+                fig = go.Figure()
+                
+                # Add actual values
+                fig.add_trace(go.Scatterpolar(
+                    r=muscle_metrics['Volume_Percentage'],
+                    theta=muscle_metrics['Muscle Group'],
+                    fill='toself',
+                    fillcolor='rgba(102, 126, 234, 0.3)',
+                    line=dict(color='#667eea', width=2),
+                    name='Current Distribution',
+                    hovertemplate='%{theta}<br>%{r:.1f}% of total volume<extra></extra>'
+                ))
+                
+                # Add ideal balanced distribution
+                ideal_percentage = 100 / len(muscle_metrics)
+                fig.add_trace(go.Scatterpolar(
+                    r=[ideal_percentage] * len(muscle_metrics),
+                    theta=muscle_metrics['Muscle Group'],
+                    line=dict(color='#00e5a0', width=1, dash='dash'),
+                    name='Balanced Target',
+                    hovertemplate='%{theta}<br>Ideal: %{r:.1f}%<extra></extra>'
+                ))
+                
+                fig.update_layout(
+                    polar=dict(
+                        radialaxis=dict(
+                            visible=True,
+                            range=[0, max(muscle_metrics['Volume_Percentage'].max(), ideal_percentage) * 1.2],
+                            gridcolor='#2a2a3e',
+                            tickfont=dict(color='#9898b0', size=10)
+                        ),
+                        angularaxis=dict(
+                            gridcolor='#2a2a3e',
+                            tickfont=dict(color='#c8c8d8', size=11)
+                        ),
+                        bgcolor='#1a1a28'
+                    ),
+                    plot_bgcolor='#1a1a28',
+                    paper_bgcolor='#1a1a28',
+                    font=dict(color='#c8c8d8', family='Inter'),
+                    height=400,
+                    showlegend=True,
+                    legend=dict(
+                        orientation="v",
+                        yanchor="top",
+                        y=1,
+                        xanchor="left",
+                        x=0
+                    )
+                )
+                return fig
+            
+            st.plotly_chart(cached_figure(version, 'muscle_balance', (), build), use_container_width=True)
             st.markdown('</div>', unsafe_allow_html=True)
         
         with col2:
             st.markdown('<div class="chart-card">', unsafe_allow_html=True)
             st.markdown('<div class="chart-header"><div><div class="chart-title">TRAINING EFFICIENCY MATRIX</div><div class="chart-subtitle">Volume vs Frequency optimization by muscle group</div></div></div>', unsafe_allow_html=True)
             
-            # Calculate efficiency metrics
-            muscle_efficiency = df.groupby('Muscle Group').agg({
-                'Volume': 'sum',
-                'Day': lambda x: x.nunique(),  # Training frequency
-                'Sets': 'mean',  # Average sets per session
-                'Rest': 'mean'  # Average rest
-            }).reset_index()
-            
-            muscle_efficiency.columns = ['Muscle Group', 'Total Volume', 'Frequency', 'Avg Sets', 'Avg Rest']
-            muscle_efficiency['Efficiency Score'] = (
-                muscle_efficiency['Total Volume'] / 
-                (muscle_efficiency['Frequency'] * muscle_efficiency['Avg Rest'] / 60)
-            ).round(1)
+            def build():
+                # Calculate efficiency metrics
+                muscle_efficiency = cube.rollup(('Muscle Group',))[['Muscle Group', 'Volume', 'Avg Sets', 'Avg Rest']]
+                # Training frequency = distinct days per muscle group
+                muscle_efficiency.insert(2, 'Day', cube.distinct('Day', by='Muscle Group')['Day'].to_numpy())
+                
+                muscle_efficiency.columns = ['Muscle Group', 'Total Volume', 'Frequency', 'Avg Sets', 'Avg Rest']
+                muscle_efficiency['Efficiency Score'] = (
+                    muscle_efficiency['Total Volume'] / 
+                    (muscle_efficiency['Frequency'] * muscle_efficiency['Avg Rest'] / 60)
+                ).round(1)
+                
+                # Scatter plot - Frequency vs Volume with efficiency as size
+                fig = go.Figure()
+                
+                # Add quadrant lines
+                avg_freq = muscle_efficiency['Frequency'].mean()
+                avg_vol = muscle_efficiency['Total Volume'].mean()
+                
+                fig.add_hline(y=avg_vol, line_dash="dash", line_color="#2a2a3e", opacity=0.5)
+                fig.add_vline(x=avg_freq, line_dash="dash", line_color="#2a2a3e", opacity=0.5)
+                
+                # Add quadrant labels
+                fig.add_annotation(x=avg_freq*1.5, y=avg_vol*1.5, text="High Volume<br>High Frequency", 
+                                 showarrow=False, font=dict(color='#00e5a0', size=10))
+                fig.add_annotation(x=avg_freq*0.5, y=avg_vol*1.5, text="High Volume<br>Low Frequency", 
+                                 showarrow=False, font=dict(color='#ff4757', size=10))
+                
+                # Add scatter points
+                fig.add_trace(go.Scatter(
+                    x=muscle_efficiency['Frequency'],
+                    y=muscle_efficiency['Total Volume'],
+                    mode='markers+text',
+                    marker=dict(
+                        size=muscle_efficiency['Efficiency Score']*2,
+                        color=muscle_efficiency['Efficiency Score'],
+                        colorscale=[
+                            [0, '#ff4757'],
+                            [0.5, '#667eea'],
+                            [1, '#00e5a0']
+                        ],
+                        showscale=True,
+                        colorbar=dict(
+                            title="Efficiency",
+                            title_font=dict(color='#c8c8d8', size=10),
+                            tickfont=dict(color='#9898b0', size=9),
+                            bgcolor='#1a1a28',
+                            bordercolor='#2a2a3e',
+                            borderwidth=1
+                        ),
+                        line=dict(width=1, color='#2a2a3e')
+                    ),
+                    text=muscle_efficiency['Muscle Group'],
+                    textposition='top center',
+                    textfont=dict(color='#c8c8d8', size=9),
+                    hovertemplate='<b>%{text}</b><br>Frequency: %{x} days<br>Volume: %{y:.0f}<br>Efficiency: %{marker.color:.1f}<extra></extra>'
+                ))
+                
+                fig.update_layout(
+                    plot_bgcolor='#1a1a28',
+                    paper_bgcolor='#1a1a28',
+                    font=dict(color='#c8c8d8', family='Inter'),
+                    xaxis=dict(
+                        title='Training Frequency (Days)',
+                        showgrid=True,
+                        gridcolor='#2a2a3e',
+                        zeroline=False
+                    ),
+                    yaxis=dict(
+                        title='Total Volume',
+                        showgrid=True,
+                        gridcolor='#2a2a3e',
+                        zeroline=False
+                    ),
+                    height=400,
+                    margin=dict(l=0, r=80, t=20, b=0),
+                    showlegend=False
+                )
+                return fig
             
-            # Scatter plot - Frequency vs Volume with efficiency as size
-            fig = go.Figure()
+            st.plotly_chart(cached_figure(version, 'efficiency_matrix', (), build), use_container_width=True)
+            st.markdown('</div>', unsafe_allow_html=True)
+        
+        # PROGRESSIVE OVERLOAD INTELLIGENCE
+        st.markdown('<div class="chart-card">', unsafe_allow_html=True)
+        st.markdown('<div class="chart-header"><div><div class="chart-title">INTELLIGENT OVERLOAD TRACKING</div><div class="chart-subtitle">Week-over-week progression analysis with trend predictions</div></div></div>', unsafe_allow_html=True)
+        
+        def build():
+            # Calculate progressive overload metrics
+            weekly_progression = cube.rollup(('Week',))[['Week', 'Volume']]
+            weekly_progression['WoW_Change'] = weekly_progression['Volume'].pct_change() * 100
+            weekly_progression['Rolling_Avg'] = weekly_progression['Volume'].rolling(window=3, min_periods=1).mean()
             
-            # Add quadrant lines
-            avg_freq = muscle_efficiency['Frequency'].mean()
-            avg_vol = muscle_efficiency['Total Volume'].mean()
+            # Simple linear regression for trend
+            from scipy import stats
+            slope, intercept, r_value, p_value, std_err = stats.linregress(weekly_progression['Week'], weekly_progression['Volume'])
+            weekly_progression['Trend'] = slope * weekly_progression['Week'] + intercept
             
-            fig.add_hline(y=avg_vol, line_dash="dash", line_color="#2a2a3e", opacity=0.5)
-            fig.add_vline(x=avg_freq, line_dash="dash", line_color="#2a2a3e", opacity=0.5)
+            # Predict next 2 weeks
+            future_weeks = pd.DataFrame({'Week': [current_week + 1, current_week + 2]})
+            future_weeks['Predicted_Volume'] = slope * future_weeks['Week'] + intercept
             
-            # Add quadrant labels
-            fig.add_annotation(x=avg_freq*1.5, y=avg_vol*1.5, text="High Volume<br>High Frequency", 
-                             showarrow=False, font=dict(color='#00e5a0', size=10))
-            fig.add_annotation(x=avg_freq*0.5, y=avg_vol*1.5, text="High Volume<br>Low Frequency", 
-                             showarrow=False, font=dict(color='#ff4757', size=10))
+            fig = go.Figure()
             
-            # Add scatter points
-            fig.add_trace(go.Scatter(
-                x=muscle_efficiency['Frequency'],
-                y=muscle_efficiency['Total Volume'],
-                mode='markers+text',
+            # Actual volume bars
+            fig.add_trace(go.Bar(
+                x=weekly_progression['Week'],
+                y=weekly_progression['Volume'],
+                name='Actual Volume',
                 marker=dict(
-                    size=muscle_efficiency['Efficiency Score']*2,
-                    color=muscle_efficiency['Efficiency Score'],
+                    color=weekly_progression['WoW_Change'].fillna(0),
                     colorscale=[
                         [0, '#ff4757'],
                         [0.5, '#667eea'],
                         [1, '#00e5a0']
                     ],
+                    cmin=-10,
+                    cmax=10,
                     showscale=True,
                     colorbar=dict(
-                        title="Efficiency",
+                        title="WoW %",
                         title_font=dict(color='#c8c8d8', size=10),
                         tickfont=dict(color='#9898b0', size=9),
-                        bgcolor='#1a1a28',
-                        bordercolor='#2a2a3e',
-                        borderwidth=1
-                    ),
-                    line=dict(width=1, color='#2a2a3e')
+                        x=1.1
+                    )
                 ),
-                text=muscle_efficiency['Muscle Group'],
-                textposition='top center',
-                textfont=dict(color='#c8c8d8', size=9),
-                hovertemplate='<b>%{text}</b><br>Frequency: %{x} days<br>Volume: %{y:.0f}<br>Efficiency: %{marker.color:.1f}<extra></extra>'
+                hovertemplate='Week %{x}<br>Volume: %{y:,.0f}<br>Change: %{marker.color:.1f}%<extra></extra>'
+            ))
+            
+            # Rolling average
+            fig.add_trace(go.Scatter(
+                x=weekly_progression['Week'],
+                y=weekly_progression['Rolling_Avg'],
+                name='3-Week Average',
+                line=dict(color='#ffa502', width=2.5),
+                mode='lines',
+                hovertemplate='Week %{x}<br>Avg: %{y:,.0f}<extra></extra>'
+            ))
+            
+            # Trend line
+            fig.add_trace(go.Scatter(
+                x=list(weekly_progression['Week']) + list(future_weeks['Week']),
+                y=list(weekly_progression['Trend']) + list(future_weeks['Predicted_Volume']),
+                name='Trend',
+                line=dict(color='#00e5a0', width=2, dash='dash'),
+                mode='lines',
+                hovertemplate='Week %{x}<br>Trend: %{y:,.0f}<extra></extra>'
             ))
             
+            # Add annotations for insights
+            if slope > 0:
+                trend_text = f"📈 Positive trend: +{slope:.1f} volume/week"
+                trend_color = '#00e5a0'
+            else:
+                trend_text = f"📉 Negative trend: {slope:.1f} volume/week"
+                trend_color = '#ff4757'
+            
+            fig.add_annotation(
+                x=current_week,
+                y=weekly_progression['Volume'].max() * 1.1,
+                text=trend_text,
+                showarrow=False,
+                font=dict(color=trend_color, size=12),
+                bgcolor='#1a1a28',
+                bordercolor=trend_color,
+                borderwidth=1
+            )
+            
             fig.update_layout(
                 plot_bgcolor='#1a1a28',
                 paper_bgcolor='#1a1a28',
                 font=dict(color='#c8c8d8', family='Inter'),
                 xaxis=dict(
-                    title='Training Frequency (Days)',
+                    title='Week',
                     showgrid=True,
                     gridcolor='#2a2a3e',
-                    zeroline=False
+                    range=[0.5, current_week + 2.5]
                 ),
                 yaxis=dict(
-                    title='Total Volume',
+                    title='Training Volume',
                     showgrid=True,
-                    gridcolor='#2a2a3e',
-                    zeroline=False
+                    gridcolor='#2a2a3e'
                 ),
                 height=400,
-                margin=dict(l=0, r=80, t=20, b=0),
-                showlegend=False
+                legend=dict(
+                    orientation="h",
+                    yanchor="bottom",
+                    y=1.02,
+                    xanchor="right",
+                    x=1
+                ),
+                hovermode='x unified'
             )
-            
-            st.plotly_chart(fig, use_container_width=True)
-            st.markdown('</div>', unsafe_allow_html=True)
+            return fig
         
-        # PROGRESSIVE OVERLOAD INTELLIGENCE
-        st.markdown('<div class="chart-card">', unsafe_allow_html=True)
-        st.markdown('<div class="chart-header"><div><div class="chart-title">INTELLIGENT OVERLOAD TRACKING</div><div class="chart-subtitle">Week-over-week progression analysis with trend predictions</div></div></div>', unsafe_allow_html=True)
-        
-        # Calculate progressive overload metrics
-        weekly_progression = df.groupby('Week')['Volume'].sum().reset_index()
-        weekly_progression['WoW_Change'] = weekly_progression['Volume'].pct_change() * 100
-        weekly_progression['Rolling_Avg'] = weekly_progression['Volume'].rolling(window=3, min_periods=1).mean()
-        
-        # Simple linear regression for trend
-        from scipy import stats
-        slope, intercept, r_value, p_value, std_err = stats.linregress(weekly_progression['Week'], weekly_progression['Volume'])
-        weekly_progression['Trend'] = slope * weekly_progression['Week'] + intercept
-        
-        # Predict next 2 weeks
-        future_weeks = pd.DataFrame({'Week': [current_week + 1, current_week + 2]})
-        future_weeks['Predicted_Volume'] = slope * future_weeks['Week'] + intercept
-        
-        fig = go.Figure()
-        
-        # Actual volume bars
-        fig.add_trace(go.Bar(
-            x=weekly_progression['Week'],
-            y=weekly_progression['Volume'],
-            name='Actual Volume',
-            marker=dict(
-                color=weekly_progression['WoW_Change'].fillna(0),
-                colorscale=[
-                    [0, '#ff4757'],
-                    [0.5, '#667eea'],
-                    [1, '#00e5a0']
-                ],
-                cmin=-10,
-                cmax=10,
-                showscale=True,
-                colorbar=dict(
-                    title="WoW %",
-                    title_font=dict(color='#c8c8d8', size=10),
-                    tickfont=dict(color='#9898b0', size=9),
-                    x=1.1
-                )
-            ),
-            hovertemplate='Week %{x}<br>Volume: %{y:,.0f}<br>Change: %{marker.color:.1f}%<extra></extra>'
-        ))
-        
-        # Rolling average
-        fig.add_trace(go.Scatter(
-            x=weekly_progression['Week'],
-            y=weekly_progression['Rolling_Avg'],
-            name='3-Week Average',
-            line=dict(color='#ffa502', width=2.5),
-            mode='lines',
-            hovertemplate='Week %{x}<br>Avg: %{y:,.0f}<extra></extra>'
-        ))
-        
-        # Trend line
-        fig.add_trace(go.Scatter(
-            x=list(weekly_progression['Week']) + list(future_weeks['Week']),
-            y=list(weekly_progression['Trend']) + list(future_weeks['Predicted_Volume']),
-            name='Trend',
-            line=dict(color='#00e5a0', width=2, dash='dash'),
-            mode='lines',
-            hovertemplate='Week %{x}<br>Trend: %{y:,.0f}<extra></extra>'
-        ))
-        
-        # Add annotations for insights
-        if slope > 0:
-            trend_text = f"📈 Positive trend: +{slope:.1f} volume/week"
-            trend_color = '#00e5a0'
-        else:
-            trend_text = f"📉 Negative trend: {slope:.1f} volume/week"
-            trend_color = '#ff4757'
-        
-        fig.add_annotation(
-            x=current_week,
-            y=weekly_progression['Volume'].max() * 1.1,
-            text=trend_text,
-            showarrow=False,
-            font=dict(color=trend_color, size=12),
-            bgcolor='#1a1a28',
-            bordercolor=trend_color,
-            borderwidth=1
-        )
-        
-        fig.update_layout(
-            plot_bgcolor='#1a1a28',
-            paper_bgcolor='#1a1a28',
-            font=dict(color='#c8c8d8', family='Inter'),
-            xaxis=dict(
-                title='Week',
-                showgrid=True,
-                gridcolor='#2a2a3e',
-                range=[0.5, current_week + 2.5]
-            ),
-            yaxis=dict(
-                title='Training Volume',
-                showgrid=True,
-                gridcolor='#2a2a3e'
-            ),
-            height=400,
-            legend=dict(
-                orientation="h",
-                yanchor="bottom",
-                y=1.02,
-                xanchor="right",
-                x=1
-            ),
-            hovermode='x unified'
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(cached_figure(version, 'overload_tracking', (), build), use_container_width=True)
         st.markdown('</div>', unsafe_allow_html=True)
         
         # EXERCISE SELECTION INSIGHTS
         st.markdown('<div class="chart-card">', unsafe_allow_html=True)
         st.markdown('<div class="chart-header"><div><div class="chart-title">EXERCISE SELECTION INTELLIGENCE</div><div class="chart-subtitle">Most effective exercises by volume-to-fatigue ratio</div></div></div>', unsafe_allow_html=True)
         
-        # Calculate exercise effectiveness
-        exercise_metrics = df.groupby('Exercise').agg({
-            'Volume': 'sum',
-            'Sets': 'mean',
-            'Reps': 'mean',
-            'Rest': 'mean',
-            'Muscle Group': 'first'
-        }).reset_index()
-        
-        # Calculate effectiveness score (volume per minute of rest)
-        exercise_metrics['Effectiveness'] = (
-            exercise_metrics['Volume'] / (exercise_metrics['Rest'] / 60)
-        ).round(1)
-        
-        # Get top 15 exercises
-        top_exercises = exercise_metrics.nlargest(15, 'Effectiveness')
-        
-        # Group colors by muscle group
-        muscle_colors = {
-            muscle: color for muscle, color in 
-            zip(df['Muscle Group'].unique(), 
-                ['#667eea', '#00c896', '#ff4757', '#4a9eff', '#ffa502', '#a29bfe', '#fd79a8'])
-        }
-        
-        fig = go.Figure()
-        
-        fig.add_trace(go.Bar(
-            y=top_exercises['Exercise'],
-            x=top_exercises['Effectiveness'],
-            orientation='h',
-            marker=dict(
-                color=[muscle_colors.get(mg, '#667eea') for mg in top_exercises['Muscle Group']],
-                line=dict(width=0)
-            ),
-            text=top_exercises['Muscle Group'],
-            textposition='inside',
-            textfont=dict(color='white', size=9),
-            hovertemplate='<b>%{y}</b><br>Effectiveness: %{x:.1f}<br>%{text}<extra></extra>'
-        ))
-        
-        fig.update_layout(
-            plot_bgcolor='#1a1a28',
-            paper_bgcolor='#1a1a28',
-            font=dict(color='#c8c8d8', family='Inter'),
-            xaxis=dict(
-                title='Effectiveness Score (Volume per Rest Minute)',
-                showgrid=True,
-                gridcolor='#2a2a3e'
-            ),
-            yaxis=dict(
-                title='',
-                showgrid=False,
-                tickfont=dict(size=10)
-            ),
-            height=500,
-            margin=dict(l=150, r=20, t=20, b=50),
-            showlegend=False
-        )
+        def build():
+            # Calculate exercise effectiveness
+            exercise_metrics = cube.rollup(('Exercise',))[['Exercise', 'Volume', 'Avg Sets', 'Avg Reps', 'Avg Rest']].rename(
+                columns={'Avg Sets': 'Sets', 'Avg Reps': 'Reps', 'Avg Rest': 'Rest'})
+            exercise_metrics['Muscle Group'] = exercise_metrics['Exercise'].map(cube.exercise_muscle)
+            
+            # Calculate effectiveness score (volume per minute of rest)
+            exercise_metrics['Effectiveness'] = (
+                exercise_metrics['Volume'] / (exercise_metrics['Rest'] / 60)
+            ).round(1)
+            
+            # Get top 15 exercises
+            top_exercises = exercise_metrics.nlargest(15, 'Effectiveness')
+            
+            # Group colors by muscle group
+            muscle_colors = {
+                muscle: color for muscle, color in 
+                zip(df['Muscle Group'].unique(), 
+                    ['#667eea', '#00c896', '#ff4757', '#4a9eff', '#ffa502', '#a29bfe', '#fd79a8'])
+            }
+            
+            fig = go.Figure()
+            
+            fig.add_trace(go.Bar(
+                y=top_exercises['Exercise'],
+                x=top_exercises['Effectiveness'],
+                orientation='h',
+                marker=dict(
+                    color=[muscle_colors.get(mg, '#667eea') for mg in top_exercises['Muscle Group']],
+                    line=dict(width=0)
+                ),
+                text=top_exercises['Muscle Group'],
+                textposition='inside',
+                textfont=dict(color='white', size=9),
+                hovertemplate='<b>%{y}</b><br>Effectiveness: %{x:.1f}<br>%{text}<extra></extra>'
+            ))
+            
+            fig.update_layout(
+                plot_bgcolor='#1a1a28',
+                paper_bgcolor='#1a1a28',
+                font=dict(color='#c8c8d8', family='Inter'),
+                xaxis=dict(
+                    title='Effectiveness Score (Volume per Rest Minute)',
+                    showgrid=True,
+                    gridcolor='#2a2a3e'
+                ),
+                yaxis=dict(
+                    title='',
+                    showgrid=False,
+                    tickfont=dict(size=10)
+                ),
+                height=500,
+                margin=dict(l=150, r=20, t=20, b=50),
+                showlegend=False
+            )
+            return fig
         
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(cached_figure(version, 'exercise_selection', (), build), use_container_width=True)
         st.markdown('</div>', unsafe_allow_html=True)
     
-    with tab3:  # Training Log view
+    elif view == "📋 Training Log":
         st.markdown('<div class="chart-card">', unsafe_allow_html=True)
         st.markdown('<div class="chart-header"><div><div class="chart-title">TRAINING LOG</div><div class="chart-subtitle">Detailed exercise data with week filtering</div></div></div>', unsafe_allow_html=True)
         
@@ -1686,7 +1626,7 @@ def main():
         
         with col1:
             # Week selector specific to training log
-            log_week_options = ["All Weeks"] + [f"Week {w}" for w in sorted(df['Week'].unique())]
+            log_week_options = ["All Weeks"] + [f"Week {w}" for w in cube.options['Week']]
             selected_log_week = st.selectbox(
                 "Select Week",
                 options=log_week_options,
@@ -1696,12 +1636,11 @@ def main():
         
         with col2:
             # Day filter
+            day_week = filter_week
             if selected_log_week != "All Weeks":
                 week_num = int(selected_log_week.split()[1])
-                week_df = filtered_df[filtered_df['Week'] == week_num]
-                available_days = ["All Days"] + sorted(week_df['Day'].unique().tolist())
-            else:
-                available_days = ["All Days"] + sorted(filtered_df['Day'].unique().tolist())
+                day_week = week_num if filter_week in (None, week_num) else -1
+            available_days = ["All Days"] + cube.rollup(('Day',), week=day_week, muscle=filter_muscle)['Day'].tolist()
             
             selected_day = st.selectbox(
                 "Select Day",
@@ -1710,30 +1649,23 @@ def main():
                 key="log_day_selector"
             )
         
-        # Apply filters to the log
-        log_df = filtered_df.copy()
-        
-        if selected_log_week != "All Weeks":
-            week_num = int(selected_log_week.split()[1])
-            log_df = log_df[log_df['Week'] == week_num]
-        
-        if selected_day != "All Days":
-            log_df = log_df[log_df['Day'] == selected_day]
+        with col3:
+            # Rows within every filter, in display order (Week, then Monday-first days)
+            log_rows = log.rows(week=day_week, muscle=filter_muscle,
+                                day=None if selected_day == "All Days" else selected_day)
+            page_count = log.page_count(log_rows)
+            # Keyed by the filters so a filter change starts again at page 1
+            log_page = st.number_input(
+                f"Page (of {page_count})",
+                min_value=1,
+                max_value=page_count,
+                value=1,
+                key=f"log_page_{day_week}_{filter_muscle}_{selected_day}"
+            )
         
-        # Format the dataframe for display
-        if not log_df.empty:
-            display_df = log_df[['Week', 'Day', 'Muscle Group', 'Exercise', 'Sets', 'Reps', 'Rest', 'Volume']].copy()
-            
-            # Fix the display formatting - show actual values, not just rounded
-            display_df['Sets'] = display_df['Sets'].apply(lambda x: f"{int(x)}" if x == int(x) else f"{x:.1f}")
-            display_df['Reps'] = display_df['Reps'].apply(lambda x: f"{int(x)}" if x == int(x) else f"{x:.1f}")
-            display_df['Rest'] = display_df['Rest'].apply(lambda x: f"{int(x)}s" if x == int(x) else f"{x:.0f}s")
-            display_df['Volume'] = display_df['Volume'].apply(lambda x: f"{int(x)}" if x == int(x) else f"{x:.1f}")
-            
-            # Sort by Week, then Day order (Monday first)
-            day_order = {'Monday': 1, 'Tuesday': 2, 'Wednesday': 3, 'Thursday': 4, 'Friday': 5, 'Saturday': 6, 'Sunday': 7}
-            display_df['day_sort'] = display_df['Day'].map(lambda x: day_order.get(x, 8))
-            display_df = display_df.sort_values(['Week', 'day_sort']).drop('day_sort', axis=1)
+        # Format and display only the visible page
+        if len(log_rows):
+            display_df = log.page(log_rows, log_page)
             
             # Display the filtered data
             st.dataframe(
@@ -1742,12 +1674,15 @@ def main():
                 height=min(500, len(display_df) * 35 + 50),  # Dynamic height based on rows
                 hide_index=True
             )
+            first = (log_page - 1) * PAGE_SIZE + 1
+            st.caption(f"Rows {first:,}–{first + len(display_df) - 1:,} of {len(log_rows):,}")
             
             # Show quick stats for the filtered view
             st.markdown('</div>', unsafe_allow_html=True)
             
             # Summary statistics for filtered data
             st.markdown('<div style="margin-top: 1.5rem;"></div>', unsafe_allow_html=True)
+            log_totals = log.totals(log_rows)
             
             col1, col2, col3, col4 = st.columns(4)
             
@@ -1756,7 +1691,7 @@ def main():
                 st.markdown(f"""
                     <div style="text-align: center;">
                         <div class="metric-label">EXERCISES SHOWN</div>
-                        <div class="metric-value">{len(log_df)}</div>
+                        <div class="metric-value">{log_totals['Count']}</div>
                     </div>
                 """, unsafe_allow_html=True)
                 st.markdown('</div>', unsafe_allow_html=True)
@@ -1766,7 +1701,7 @@ def main():
                 st.markdown(f"""
                     <div style="text-align: center;">
                         <div class="metric-label">TOTAL SETS</div>
-                        <div class="metric-value">{log_df['Sets'].sum():.0f}</div>
+                        <div class="metric-value">{log_totals['Sets']:.0f}</div>
                     </div>
                 """, unsafe_allow_html=True)
                 st.markdown('</div>', unsafe_allow_html=True)
@@ -1776,14 +1711,14 @@ def main():
                 st.markdown(f"""
                     <div style="text-align: center;">
                         <div class="metric-label">TOTAL VOLUME</div>
-                        <div class="metric-value">{log_df['Volume'].sum():.0f}</div>
+                        <div class="metric-value">{log_totals['Volume']:.0f}</div>
                     </div>
                 """, unsafe_allow_html=True)
                 st.markdown('</div>', unsafe_allow_html=True)
             
             with col4:
                 st.markdown('<div class="chart-card">', unsafe_allow_html=True)
-                avg_rest = log_df['Rest'].mean()
+                avg_rest = log_totals['Avg Rest']
                 rest_str = f"{int(avg_rest)}s" if avg_rest == int(avg_rest) else f"{avg_rest:.0f}s"
                 st.markdown(f"""
                     <div style="text-align: center;">
@@ -8,7 +8,6 @@ import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
 from datetime import datetime
-import gspread
 from pathlib import Path
 import sys
 
@@ -17,11 +16,14 @@ BASE_DIR = Path(__file__).parent
 BACKEND_DIR = BASE_DIR / 'backend'
 sys.path.insert(0, str(BACKEND_DIR))
 
-try:
-    from config import CRED_PATH, SPREADSHEET_URL
-except ImportError:
-    CRED_PATH = str(BASE_DIR / 'credentials.json')
-    SPREADSHEET_URL = 'https://docs.google.com/spreadsheets/d/1Js2s7s95miuUzdn44guWnGuML2kxYzN3kG_jsEdWu68/edit'
+from rotation_window import RotationWindow, week_rows, ROTATION_WINDOW
+from streamlit_app.data_loader import load_dataset, refresh_dataset
+
+VIEWS = [
+    "Weekly Progress",
+    "Muscle Groups",
+    "Exercise Rotation",
+]
 
 # Page config
 st.set_page_config(
@@ -30,65 +32,6 @@ st.set_page_config(
     layout="wide"
 )
 
-# Initialize connection
-@st.cache_resource
-def init_connection():
-    gc = gspread.service_account(filename=CRED_PATH)
-    return gc.open_by_url(SPREADSHEET_URL)
-
-# Load data
-@st.cache_data(ttl=60)
-def load_data():
-    ss = init_connection()
-    all_data = []
-    
-    for week_num in range(1, 9):
-        try:
-            sheet = ss.worksheet(f"Week {week_num}")
-            data = sheet.get_all_values()
-            
-            if len(data) > 1:
-                df = pd.DataFrame(data[1:], columns=data[0])
-                df['Week'] = week_num
-                
-                for _, row in df.iterrows():
-                    if row.get('Exercise') and str(row['Exercise']).strip() and row['Exercise'] != 'Exercise':
-                        # Parse numbers safely
-                        sets = row.get('Sets', '0')
-                        reps = row.get('Reps', '0')
-                        
-                        # Handle ranges
-                        if '-' in str(sets):
-                            parts = str(sets).split('-')
-                            sets_val = (float(parts[0]) + float(parts[1])) / 2 if len(parts) == 2 else float(parts[0])
-                        else:
-                            try:
-                                sets_val = float(sets)
-                            except:
-                                sets_val = 0
-                        
-                        if '-' in str(reps):
-                            parts = str(reps).split('-')
-                            reps_val = (float(parts[0]) + float(parts[1])) / 2 if len(parts) == 2 else float(parts[0])
-                        else:
-                            try:
-                                reps_val = float(reps)
-                            except:
-                                reps_val = 0
-                        
-                        all_data.append({
-                            'Week': week_num,
-                            'Muscle Group': row.get('Muscle Group', ''),
-                            'Exercise': row['Exercise'],
-                            'Sets': sets_val,
-                            'Reps': reps_val,
-                            'Volume': sets_val * reps_val
-                        })
-        except:
-            pass
-    
-    return pd.DataFrame(all_data)
-
 # Main app
 def main():
     # Title
@@ -97,7 +40,7 @@ def main():
     
     # Load data
     try:
-        df = load_data()
+        df = load_dataset().training
         if df.empty:
             st.error("No training data found")
             st.stop()
@@ -124,7 +67,7 @@ def main():
         )
         
         if st.button("Refresh Data"):
-            st.cache_data.clear()
+            refresh_dataset()
             st.rerun()
     
     # Filter data
@@ -144,10 +87,10 @@ def main():
     with col4:
         st.metric("Avg Reps", f"{filtered_df['Reps'].mean():.1f}")
     
-    # Tabs
-    tab1, tab2, tab3 = st.tabs(["Weekly Progress", "Muscle Groups", "Exercise Rotation"])
+    # View selector - unlike st.tabs, only the active view's analytics run on a rerun
+    view = st.radio("View", VIEWS, horizontal=True, label_visibility="collapsed", key="main_view")
     
-    with tab1:
+    if view == "Weekly Progress":
         # Weekly volume chart
         weekly = filtered_df.groupby('Week').agg({
             'Volume': 'sum',
@@ -174,7 +117,7 @@ def main():
         
         st.plotly_chart(fig, use_container_width=True)
     
-    with tab2:
+    elif view == "Muscle Groups":
         # Muscle group distribution
         muscle_vol = filtered_df.groupby('Muscle Group')['Volume'].sum().reset_index()
         muscle_vol = muscle_vol.sort_values('Volume', ascending=False)
@@ -195,14 +138,22 @@ def main():
         
         st.plotly_chart(fig, use_container_width=True)
     
-    with tab3:
-        # Exercise frequency
-        exercise_freq = filtered_df.groupby('Exercise')['Week'].nunique().reset_index()
-        exercise_freq.columns = ['Exercise', 'Weeks Used']
+    elif view == "Exercise Rotation":
+        # Exercise frequency over the trailing window
+        last_week = int(filtered_df['Week'].max()) if not filtered_df.empty else 1
+        window_size = st.slider("Window (last N weeks)", 1, max(last_week, 2),
+                                min(ROTATION_WINDOW, max(last_week, 2)))
+        records = [
+            {'week': w, 'muscleGroup': mg, 'exercise': ex, 'volume': v}
+            for w, mg, ex, v in filtered_df[['Week', 'Muscle Group', 'Exercise', 'Volume']].itertuples(index=False)
+        ]
+        window = RotationWindow.from_weeks(week_rows(records), window_size)
+        exercise_freq = pd.DataFrame(list(window.counts.items()), columns=['Exercise', 'Weeks Used'])
         exercise_freq = exercise_freq.sort_values('Weeks Used', ascending=False)
         
         # Show top 10
         st.subheader("Exercise Frequency")
+        st.caption(f"Week {window.first_week}–{window.last_week}")
         
         for _, row in exercise_freq.head(10).iterrows():
             weeks = row['Weeks Used']
@@ -0,0 +1,87 @@
+"""
+Materialized aggregate cube for the dashboards
+The training frame grouped once per data version by week x muscle group x
+exercise x day, with sum and row-count measures (means are sum / count, so
+they roll up exactly). Charts, sidebar stats and filter option lists read
+memoized slices of it instead of re-grouping the raw frame on every rerun.
+"""
+
+import pandas as pd
+
+DIMS = ('Week', 'Muscle Group', 'Exercise', 'Day')
+MEASURES = ('Volume', 'Sets', 'Reps', 'Rest', 'RPE')
+
+class AggregateCube:
+    def __init__(self, training):
+        measures = [m for m in MEASURES if m in training.columns]
+        self.measures = measures
+        if training.empty:
+            self.cells = pd.DataFrame(columns=list(measures) + ['Count'],
+                                      index=pd.MultiIndex.from_tuples([], names=DIMS))
+        else:
+            self.cells = training.groupby(list(DIMS), sort=True).agg(
+                **{m: (m, 'sum') for m in measures}, Count=('Exercise', 'size'))
+        # Filter option lists, sorted like sorted(df[dim].unique())
+        self.options = {dim: sorted(training[dim].unique().tolist()) for dim in DIMS}
+        # First muscle group each exercise was logged under (row order)
+        self.exercise_muscle = training.drop_duplicates('Exercise').set_index('Exercise')['Muscle Group'].to_dict()
+        self._memo = {}
+
+    def _select(self, week=None, muscle=None, exercise=None, day=None):
+        key = ('cells', week, muscle, exercise, day)
+        cells = self._memo.get(key)
+        if cells is None:
+            cells = self.cells
+            for dim, value in zip(DIMS, (week, muscle, exercise, day)):
+                if value is not None:
+                    cells = cells[cells.index.get_level_values(dim) == value]
+            self._memo[key] = cells
+        return cells
+
+    def rollup(self, by, week=None, muscle=None, exercise=None, day=None):
+        """
+        Measures grouped by the `by` dims (a tuple) within the filter: one row per
+        group with the dims as columns, '<measure>' sums, 'Count' rows and
+        'Avg <measure>' means. Returns a fresh copy (safe to add columns to).
+        """
+        key = ('rollup', tuple(by), week, muscle, exercise, day)
+        out = self._memo.get(key)
+        if out is None:
+            cells = self._select(week, muscle, exercise, day)
+            out = cells.groupby(level=list(by), sort=True).sum()
+            for m in self.measures:
+                out[f'Avg {m}'] = out[m] / out['Count']
+            out = out.reset_index()
+            self._memo[key] = out
+        return out.copy()
+
+    def totals(self, week=None, muscle=None, exercise=None, day=None):
+        """{'<measure>': sum, 'Count': rows, 'Avg <measure>': mean} within the filter"""
+        key = ('totals', week, muscle, exercise, day)
+        out = self._memo.get(key)
+        if out is None:
+            cells = self._select(week, muscle, exercise, day)
+            out = {m: float(cells[m].sum()) for m in self.measures}
+            out['Count'] = int(cells['Count'].sum())
+            for m in self.measures:
+                out[f'Avg {m}'] = out[m] / out['Count'] if out['Count'] else float('nan')
+            self._memo[key] = out
+        return dict(out)
+
+    def distinct(self, dim, by=None, week=None, muscle=None, exercise=None, day=None):
+        """
+        Number of distinct `dim` values within the filter; with `by`, a
+        DataFrame of the count per `by` group (column named after `dim`)
+        """
+        key = ('distinct', dim, by, week, muscle, exercise, day)
+        out = self._memo.get(key)
+        if out is None:
+            index = self._select(week, muscle, exercise, day).index
+            if by is None:
+                out = index.get_level_values(dim).nunique()
+            else:
+                pairs = index.droplevel([d for d in DIMS if d not in (by, dim)]).unique()
+                out = pd.Series(pairs.get_level_values(by)).value_counts().sort_index()
+                out = out.rename_axis(by).rename(dim).reset_index()
+            self._memo[key] = out
+        return out.copy() if isinstance(out, pd.DataFrame) else out
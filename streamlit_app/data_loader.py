@@ -1 +1,459 @@
-# Optional helper module for Streamlit loaders.
+"""
+Shared data layer for the Streamlit dashboards
+One fetch of the workbook (a single batch read of every Week sheet,
+Performance Tracker and ExerciseList) and one parsed, versioned Dataset per
+workbook version, shared by every dashboard, view and session in the server
+process. A background thread re-fetches the workbook and swaps in a new
+Dataset when it changed, so page loads read the latest completed snapshot
+without waiting on the Sheets API. Fetched workbooks go through a store
+shared by every server process (dataset_store), so one process per refresh
+interval calls the API and the rest adopt its result. The parsed training
+frame is also written once per version as an uncompressed Arrow IPC file that
+other processes memory-map instead of re-parsing (numeric columns stay backed
+by the shared page cache). Only that frame is snapshotted: the week frames,
+performance and exercise list are still parsed from the stored workbook JSON,
+and the aggregate cube and log order rebuilt, on every cold start. Treat the
+Dataset as read-only: filter it, don't mutate it.
+"""
+
+import hashlib
+import itertools
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import streamlit as st
+import gspread
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+BACKEND_DIR = BASE_DIR / 'backend'
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+DEFAULT_SPREADSHEET_URL = 'https://docs.google.com/spreadsheets/d/1Js2s7s95miuUzdn44guWnGuML2kxYzN3kG_jsEdWu68/edit'
+try:
+    from config import (CRED_PATH, SPREADSHEET_URL, WEEK_SHEETS, DASHBOARD_REFRESH_SECONDS, DASHBOARD_STORE_PATH,
+                        DASHBOARD_SNAPSHOT_DIR)
+except ImportError:
+    CRED_PATH = str(BASE_DIR / 'credentials.json')
+    SPREADSHEET_URL = None
+    WEEK_SHEETS = [f"Week {n}" for n in range(1, 9)]
+    DASHBOARD_REFRESH_SECONDS = 60
+    DASHBOARD_STORE_PATH = str(BASE_DIR / 'logs' / 'dashboard_cache.sqlite')
+    DASHBOARD_SNAPSHOT_DIR = str(BASE_DIR / 'logs' / 'dashboard_snapshots')
+SPREADSHEET_URL = SPREADSHEET_URL or DEFAULT_SPREADSHEET_URL
+
+from sheets_client import batch_get_ranges, values_digest
+from streamlit_app.aggregates import AggregateCube
+from streamlit_app.dataset_store import open_store
+from streamlit_app.training_log import TrainingLog
+
+PERFORMANCE_SHEET = "Performance Tracker"
+EXERCISE_LIST_SHEET = "ExerciseList"
+STORE_POLL_SECONDS = 5   # how often the refresher checks the shared store
+LEASE_SECONDS = 120      # refresh lease; outlives any one fetch
+SNAPSHOTS_KEPT = 2       # training snapshots left on disk (older ones may still be mapped)
+
+TRAINING_COLUMNS = ['Week', 'Day', 'Muscle Group', 'Exercise', 'Sets', 'Reps', 'Rest', 'RPE', 'Volume',
+                    'Set 1', 'Set 2', 'Set 3', 'Set 4']
+SNAPSHOT_FORMAT = 1      # bump when the parsed training frame changes in a way the columns don't show
+# Snapshot file names carry the parser/schema as well as the workbook version,
+# so processes running different code never map each other's frames
+SNAPSHOT_SCHEMA = hashlib.blake2b(repr((SNAPSHOT_FORMAT, TRAINING_COLUMNS)).encode(), digest_size=4).hexdigest()
+
+# training: one row per logged exercise (TRAINING_COLUMNS)
+# weeks: {"Week N": raw sheet DataFrame}; performance: DataFrame or None
+# exercise_list: {muscle group: [exercise]}; cube: AggregateCube over training
+# log: TrainingLog (sorted, paginated view of training); version: workbook content digest
+Dataset = namedtuple('Dataset', ['training', 'weeks', 'performance', 'exercise_list', 'cube', 'log', 'version',
+                                 'loaded_at'])
+
+# ============= CONNECTION =============
+
+def get_credentials():
+    """Get credentials from either Streamlit secrets or the local credentials file"""
+    try:
+        if 'gcp_service_account' in st.secrets:
+            creds = dict(st.secrets['gcp_service_account'])
+            # Fix the private key newlines (common issue with TOML secrets)
+            if 'private_key' in creds:
+                creds['private_key'] = creds['private_key'].replace('\\n', '\n')
+            return creds
+    except Exception:
+        pass
+
+    if Path(CRED_PATH).exists():
+        with open(CRED_PATH, 'r') as f:
+            return json.load(f)
+
+    st.error("No credentials found! Please add credentials.json locally or configure Streamlit Cloud secrets.")
+    st.stop()
+
+@st.cache_resource
+def init_connection():
+    """Google Sheets connection shared by every dashboard"""
+    gc = gspread.service_account_from_dict(get_credentials())
+    return gc.open_by_url(SPREADSHEET_URL)
+
+# ============= PARSING =============
+
+def parse_number(value):
+    """Parse numbers from various formats ('8', '8-12' -> 10, '' -> 0)"""
+    if not value:
+        return 0
+
+    value = str(value).strip()
+
+    # Handle ranges
+    if '-' in value and not value.startswith('-'):
+        parts = value.split('-')
+        try:
+            return (float(parts[0]) + float(parts[1])) / 2
+        except:
+            return 0
+
+    try:
+        return float(value)
+    except:
+        return 0
+
+def _frame(values):
+    """Sheet values -> DataFrame with the first row as (stripped) header"""
+    if len(values) < 2:
+        return None
+    header = [str(h).strip() for h in values[0]]
+    width = len(header)
+    rows = [(r + [''] * width)[:width] for r in values[1:]]
+    return pd.DataFrame(rows, columns=header)
+
+def _clean_headers(headers):
+    """Name blank headers and de-duplicate repeated ones"""
+    cleaned, seen = [], {}
+    for i, header in enumerate(headers):
+        header = str(header).strip() if header else f"Column_{i+1}"
+        if header in seen:
+            seen[header] += 1
+            header = f"{header}_{seen[header]}"
+        else:
+            seen[header] = 0
+        cleaned.append(header)
+    return cleaned
+
+def _parse_training(weeks):
+    records = []
+    for name, df in weeks.items():
+        week_num = int(name.split()[-1])
+        if 'Exercise' not in df.columns:
+            continue
+        for row in df.to_dict('records'):
+            exercise = row.get('Exercise')
+            if not exercise or str(exercise).strip() in ('', 'Exercise'):
+                continue
+            sets = parse_number(row.get('Sets', 0))
+            reps = parse_number(row.get('Reps', 0))
+            records.append({
+                'Week': week_num,
+                'Day': row.get('Day', ''),
+                'Muscle Group': row.get('Muscle Group', ''),
+                'Exercise': exercise,
+                'Sets': sets,
+                'Reps': reps,
+                'Rest': parse_number(row.get('Rest (Seconds)', 0)),
+                'RPE': parse_number(row.get('RPE', 0)),
+                'Volume': sets * reps,
+                'Set 1': row.get('Set 1 (Weight - Reps)', ''),
+                'Set 2': row.get('Set 2 (Weight - Reps)', ''),
+                'Set 3': row.get('Set 3 (Weight - Reps)', ''),
+                'Set 4': row.get('Set 4 (Weight - Reps)', ''),
+            })
+    return pd.DataFrame(records, columns=TRAINING_COLUMNS)
+
+def _parse_performance(values):
+    if not values or len(values) < 2:
+        return None
+    headers = _clean_headers(values[0])
+    width = len(headers)
+    df = pd.DataFrame([(r + [''] * width)[:width] for r in values[1:]], columns=headers)
+    # Remove columns that are all empty
+    df = df.loc[:, (df != '').any(axis=0)]
+    return None if df.empty or len(df.columns) == 0 else df
+
+def _parse_exercise_list(values):
+    exercise_list = {}
+    for row in (values or [])[1:]:
+        if len(row) >= 2:
+            exercise_list.setdefault(row[0], []).append(row[1])
+    return exercise_list
+
+# ============= LOADING =============
+
+def workbook_version(raw):
+    """Content digest of a fetched workbook ({sheet title: values})"""
+    h = hashlib.blake2b(digest_size=12)
+    for title in sorted(raw):
+        h.update(title.encode('utf-8'))
+        h.update(values_digest(raw[title]))
+    return h.hexdigest()
+
+def fetch_workbook(ss):
+    """
+    Raw values of every sheet the dashboards use, in one batch read.
+    Returns (version, {sheet title: values}).
+    """
+    titles = {ws.title for ws in ss.worksheets()}
+    wanted = [name for name in WEEK_SHEETS if name in titles]
+    wanted += [name for name in (PERFORMANCE_SHEET, EXERCISE_LIST_SHEET) if name in titles]
+    if not wanted:
+        return workbook_version({}), {}
+    batch = batch_get_ranges(ss, [f"'{name}'" for name in wanted])
+    raw = dict(zip(wanted, batch))
+    return workbook_version(raw), raw
+
+def _build_dataset(version, raw, training=None):
+    """
+    Parse a workbook and build its aggregate cube and log order (once per
+    version, shared by every session); `training` (a mapped snapshot) skips
+    only the training frame parse, the rest is rebuilt from `raw`
+    """
+    weeks = {}
+    for name in WEEK_SHEETS:
+        df = _frame(raw.get(name, []))
+        if df is not None:
+            df['Week'] = int(name.split()[-1])
+            weeks[name] = df
+    if training is None:
+        training = _parse_training(weeks)
+    return Dataset(
+        training=training,
+        weeks=weeks,
+        performance=_parse_performance(raw.get(PERFORMANCE_SHEET)),
+        exercise_list=_parse_exercise_list(raw.get(EXERCISE_LIST_SHEET)),
+        cube=AggregateCube(training),
+        log=TrainingLog(training),
+        version=version,
+        loaded_at=datetime.now(),
+    )
+
+# ============= SNAPSHOTS =============
+
+def _snapshot_path(version):
+    return Path(DASHBOARD_SNAPSHOT_DIR) / f"training-{SNAPSHOT_SCHEMA}-{version}.arrow"
+
+def map_training_snapshot(version):
+    """The training frame of a workbook version from its memory-mapped Arrow snapshot, or None"""
+    if not DASHBOARD_SNAPSHOT_DIR:
+        return None
+    try:
+        table = pa.ipc.open_file(pa.memory_map(str(_snapshot_path(version)))).read_all()
+    except (OSError, pa.ArrowInvalid):
+        return None
+    if table.column_names != TRAINING_COLUMNS:
+        return None
+    # split_blocks keeps null-free numeric columns as zero-copy views of the map
+    return table.to_pandas(split_blocks=True)
+
+def write_training_snapshot(version, training):
+    """Write (atomically) the Arrow snapshot of a version and prune old ones; failures are non-fatal"""
+    if not DASHBOARD_SNAPSHOT_DIR:
+        return
+    path = _snapshot_path(version)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        feather.write_feather(training, str(tmp), compression='uncompressed')
+        os.replace(tmp, path)
+        old = sorted(path.parent.glob('training-*.arrow'), key=lambda p: p.stat().st_mtime, reverse=True)
+        for stale in old[SNAPSHOTS_KEPT:]:
+            stale.unlink(missing_ok=True)
+    except (OSError, pa.ArrowException) as e:
+        tmp.unlink(missing_ok=True)
+        print(f"⚠️ Could not write training snapshot: {e}")
+
+class _Flight:
+    def __init__(self, tag=None):
+        self.tag = tag
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls: the first caller for a key runs the load,
+    callers arriving while it is in flight wait and share its result (or
+    exception). A caller whose `joins(tag)` rejects the in-flight load's tag
+    waits for it to finish instead and then tries again, so such loads queue
+    behind each other rather than overlap. `loads` counts loads actually run,
+    `deduplicated` the calls that piggybacked on one.
+    """
+    def __init__(self):
+        self.loads = 0
+        self.deduplicated = 0
+        self._lock = threading.Lock()
+        self._inflight = {}   # key -> _Flight
+
+    def do(self, key, load, tag=None, joins=None):
+        while True:
+            with self._lock:
+                flight = self._inflight.get(key)
+                if flight is None:
+                    flight = self._inflight[key] = _Flight(tag)
+                    self.loads += 1
+                    break
+                shared = joins is None or joins(flight.tag)
+                if shared:
+                    self.deduplicated += 1
+            flight.done.wait()
+            if shared:
+                if flight.error is not None:
+                    raise flight.error
+                return flight.result
+        try:
+            flight.result = load()
+            return flight.result
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            flight.done.set()
+
+class DatasetRefresher:
+    """
+    Stale-while-revalidate holder of the current Dataset. Only the very first
+    request loads synchronously; after that a daemon thread checks the shared
+    store every few seconds and atomically replaces the snapshot when the
+    workbook version changed. Once the stored workbook is `interval` seconds
+    old, whichever process takes the store's lease re-fetches it from Sheets.
+    A failed refresh keeps serving the last snapshot. Concurrent refreshes
+    (cold-start requests, Refresh buttons, the thread) share one in-flight load.
+    """
+    def __init__(self, connect, store, interval=DASHBOARD_REFRESH_SECONDS, poll=STORE_POLL_SECONDS):
+        self.connect = connect        # () -> gspread Spreadsheet
+        self.store = store            # DatasetStore shared with the other server processes
+        self.interval = interval
+        self.poll = min(poll, interval)
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{id(self):x}"
+        self._leases = itertools.count()  # per-refresh lease tokens: a held lease is never re-granted
+        self.snapshot = None          # latest completed Dataset
+        self.fetched_at = None        # time.time() the snapshot's workbook was read from Sheets
+        self.fetches = 0              # Sheets reads made by this process
+        self.last_error = None
+        self._ss = None
+        self._flight = SingleFlight()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def current(self):
+        """The latest completed Dataset (blocks only before the first one exists)"""
+        snapshot = self.snapshot or self.refresh()
+        self._start()
+        return snapshot
+
+    def refresh(self, force=False):
+        """
+        Bring the snapshot up to date and return it: from Sheets if the stored
+        workbook is due (or `force`) and this process gets the lease, else from
+        the store. Every call shares one in-flight load; a forced call arriving
+        during an unforced one (which may only adopt the store's copy) waits
+        for it, then shares one forced load with the other forced callers.
+        """
+        return self._flight.do('workbook', lambda: self._refresh(force), tag=force,
+                               joins=(lambda forced: forced) if force else None)
+
+    def _refresh(self, force):
+        lease = f"{self.owner}:{next(self._leases)}"
+        while True:
+            stamp = self.store.stamp()
+            due = force or stamp is None or time.time() - stamp.fetched_at >= self.interval
+            if due and self.store.acquire(lease, LEASE_SECONDS):
+                try:
+                    return self._fetch()
+                finally:
+                    self.store.release(lease)
+            if stamp is not None:
+                return self._adopt(stamp)
+            # Another process is making the very first fetch
+            time.sleep(0.25)
+
+    def _fetch(self):
+        if self._ss is None:
+            self._ss = self.connect()
+        version, raw = fetch_workbook(self._ss)
+        fetched_at = time.time()
+        self.fetches += 1
+        self.store.write(version, raw, fetched_at)
+        return self._swap(version, raw, fetched_at)
+
+    def _adopt(self, stamp):
+        """Switch to the stored workbook (read only if its version differs from the snapshot's)"""
+        if self.snapshot is not None and self.snapshot.version == stamp.version:
+            self.fetched_at = stamp.fetched_at
+            return self.snapshot
+        stamp, raw = self.store.read()
+        return self._swap(stamp.version, raw, stamp.fetched_at)
+
+    def _swap(self, version, raw, fetched_at):
+        if self.snapshot is None or self.snapshot.version != version:
+            training = map_training_snapshot(version)
+            self.snapshot = _build_dataset(version, raw, training)
+            if training is None:
+                write_training_snapshot(version, self.snapshot.training)
+        self.fetched_at = fetched_at
+        self.last_error = None
+        return self.snapshot
+
+    def stats(self):
+        """Snapshot version, fetch time, Sheets reads and load / deduplicated counters"""
+        return {
+            'version': self.snapshot.version if self.snapshot else None,
+            'fetched_at': self.fetched_at,
+            'fetches': self.fetches,
+            'loads': self._flight.loads,
+            'deduplicated': self._flight.deduplicated,
+            'last_error': self.last_error,
+        }
+
+    def refresh_soon(self):
+        """Wake the background thread instead of waiting out the interval"""
+        self._wake.set()
+
+    def _start(self):
+        if self._thread is None or not self._thread.is_alive():
+            with self._lock:
+                if self._thread is None or not self._thread.is_alive():
+                    self._thread = threading.Thread(target=self._run, name='dataset-refresher', daemon=True)
+                    self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.poll)
+            self._wake.clear()
+            try:
+                self.refresh()
+            except Exception as e:
+                self.last_error = e
+                print(f"⚠️ Dataset refresh failed, serving the previous snapshot: {e}")
+
+@st.cache_resource(show_spinner=False)
+def dataset_refresher():
+    """The server process's DatasetRefresher"""
+    return DatasetRefresher(lambda: init_connection(), open_store(DASHBOARD_STORE_PATH))
+
+def load_dataset():
+    """The current Dataset; one fetch and one parse serve every dashboard and session"""
+    return dataset_refresher().current()
+
+def refresh_dataset():
+    """Re-fetch the workbook now (for Refresh buttons) and return the current Dataset"""
+    return dataset_refresher().refresh(force=True)
@@ -0,0 +1,126 @@
+"""
+Workbook store shared by every dashboard server process
+Holds the latest fetched workbook ({sheet title: values}) with its version
+and fetch time, plus a refresh lease so only one process at a time calls the
+Sheets API; the others adopt whatever the lease holder wrote. SQLiteStore
+works across processes on one host; MemoryStore is the single-process
+stand-in. Other backends (a key-value service, ...) implement the same five
+methods.
+"""
+
+import abc
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+from contextlib import closing
+
+# version: workbook_version() digest; fetched_at: time.time() of the Sheets read
+Stamp = namedtuple('Stamp', ['version', 'fetched_at'])
+
+class DatasetStore(abc.ABC):
+    @abc.abstractmethod
+    def stamp(self):
+        """Stamp of the stored workbook, or None if empty (cheap; no payload)"""
+
+    @abc.abstractmethod
+    def read(self):
+        """(Stamp, {sheet title: values}) of the stored workbook, or None"""
+
+    @abc.abstractmethod
+    def write(self, version, raw, fetched_at):
+        """Replace the stored workbook"""
+
+    @abc.abstractmethod
+    def acquire(self, owner, ttl):
+        """Take (or extend) the refresh lease for `ttl` seconds; False if another owner holds it"""
+
+    @abc.abstractmethod
+    def release(self, owner):
+        """Give up the lease if `owner` holds it"""
+
+class MemoryStore(DatasetStore):
+    def __init__(self):
+        self._stamp = None
+        self._raw = None
+        self._lease = (None, 0.0)
+        self._lock = threading.Lock()
+
+    def stamp(self):
+        return self._stamp
+
+    def read(self):
+        with self._lock:
+            return (self._stamp, self._raw) if self._stamp else None
+
+    def write(self, version, raw, fetched_at):
+        with self._lock:
+            self._stamp, self._raw = Stamp(version, fetched_at), raw
+
+    def acquire(self, owner, ttl):
+        with self._lock:
+            holder, expires = self._lease
+            if holder not in (None, owner) and expires > time.time():
+                return False
+            self._lease = (owner, time.time() + ttl)
+            return True
+
+    def release(self, owner):
+        with self._lock:
+            if self._lease[0] == owner:
+                self._lease = (None, 0.0)
+
+class SQLiteStore(DatasetStore):
+    """One-row workbook table and one-row lease table in a WAL-mode SQLite file"""
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with closing(self._connect()) as db:
+            db.execute('PRAGMA journal_mode=WAL')
+            db.execute('CREATE TABLE IF NOT EXISTS workbook '
+                       '(id INTEGER PRIMARY KEY CHECK (id = 1), version TEXT, fetched_at REAL, raw TEXT)')
+            db.execute('CREATE TABLE IF NOT EXISTS lease '
+                       '(id INTEGER PRIMARY KEY CHECK (id = 1), owner TEXT, expires REAL)')
+
+    def _connect(self):
+        # A connection per call: sessions and the refresher run on different threads
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    def stamp(self):
+        with closing(self._connect()) as db:
+            row = db.execute('SELECT version, fetched_at FROM workbook WHERE id = 1').fetchone()
+        return Stamp(*row) if row else None
+
+    def read(self):
+        with closing(self._connect()) as db:
+            row = db.execute('SELECT version, fetched_at, raw FROM workbook WHERE id = 1').fetchone()
+        return (Stamp(row[0], row[1]), json.loads(row[2])) if row else None
+
+    def write(self, version, raw, fetched_at):
+        payload = json.dumps(raw, separators=(',', ':'))
+        with closing(self._connect()) as db:
+            db.execute('INSERT OR REPLACE INTO workbook (id, version, fetched_at, raw) VALUES (1, ?, ?, ?)',
+                       (version, fetched_at, payload))
+
+    def acquire(self, owner, ttl):
+        now = time.time()
+        with closing(self._connect()) as db:
+            db.execute('BEGIN IMMEDIATE')
+            row = db.execute('SELECT owner, expires FROM lease WHERE id = 1').fetchone()
+            if row and row[0] not in (None, owner) and row[1] > now:
+                db.execute('ROLLBACK')
+                return False
+            db.execute('INSERT OR REPLACE INTO lease (id, owner, expires) VALUES (1, ?, ?)', (owner, now + ttl))
+            db.execute('COMMIT')
+            return True
+
+    def release(self, owner):
+        with closing(self._connect()) as db:
+            db.execute('UPDATE lease SET owner = NULL, expires = 0 WHERE id = 1 AND owner = ?', (owner,))
+
+def open_store(path):
+    """SQLiteStore at path, or a MemoryStore if path is empty"""
+    return SQLiteStore(path) if path else MemoryStore()
@@ -0,0 +1,88 @@
+"""
+Paginated Training Log
+The log's display order (week, then Monday-first day order, then sheet
+order) is computed once per data version as a row permutation over a
+day-order categorical. Filters are boolean masks over the pre-permuted
+filter columns, and only the visible page is sliced and formatted, so render
+time and the payload sent to the browser stay constant as the log grows.
+"""
+
+import numpy as np
+import pandas as pd
+
+DAY_ORDER = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+LOG_COLUMNS = ['Week', 'Day', 'Muscle Group', 'Exercise', 'Sets', 'Reps', 'Rest', 'Volume']
+PAGE_SIZE = 50
+
+def _number_labels(values, decimals, suffix=''):
+    """'8' for whole numbers, else `decimals` places (vectorized f"{int(x)}" / f"{x:.Nf}")"""
+    values = np.asarray(values, dtype=np.float64)
+    whole = values == np.floor(values)
+    labels = np.where(whole, values.astype(np.int64).astype(str), np.char.mod(f'%.{decimals}f', values))
+    return np.char.add(labels.astype(str), suffix) if suffix else labels
+
+class TrainingLog:
+    def __init__(self, training):
+        self.training = training
+        day = pd.Categorical(training['Day'], categories=DAY_ORDER, ordered=True)
+        # Days outside DAY_ORDER sort after Sunday
+        day_rank = np.where(day.codes < 0, len(DAY_ORDER), day.codes)
+        self.order = np.lexsort((day_rank, training['Week'].to_numpy()))   # stable: ties keep sheet order
+        self._columns = {col: training[col].to_numpy()[self.order] for col in ('Week', 'Muscle Group', 'Day')}
+        self._memo = {}
+
+    def __len__(self):
+        return len(self.order)
+
+    def rows(self, week=None, muscle=None, day=None):
+        """
+        Positions (into the training frame) of the rows within the filter, in
+        display order. Each filter is None (all), a value or a tuple of values.
+        """
+        key = ('rows', week, muscle, day)
+        rows = self._memo.get(key)
+        if rows is None:
+            mask = np.ones(len(self.order), dtype=bool)
+            for col, value in (('Week', week), ('Muscle Group', muscle), ('Day', day)):
+                if value is None:
+                    continue
+                values = self._columns[col]
+                mask &= np.isin(values, list(value)) if isinstance(value, tuple) else values == value
+            rows = self.order[mask]
+            self._memo[key] = rows
+        return rows
+
+    def totals(self, rows):
+        """{'Count', 'Sets', 'Volume', 'Avg Rest'} over the rows"""
+        return {
+            'Count': len(rows),
+            'Sets': float(self.training['Sets'].to_numpy()[rows].sum()),
+            'Volume': float(self.training['Volume'].to_numpy()[rows].sum()),
+            'Avg Rest': float(self.training['Rest'].to_numpy()[rows].mean()) if len(rows) else float('nan'),
+        }
+
+    @staticmethod
+    def page_count(rows, page_size=PAGE_SIZE):
+        return max(1, -(-len(rows) // page_size))
+
+    def page(self, rows, page, page_size=PAGE_SIZE, columns=None, formatted=True):
+        """
+        One page (1-based) of the rows as a DataFrame; formatted pages show the
+        log columns with Sets/Reps/Volume/Rest as display labels
+        """
+        start = (page - 1) * page_size
+        out = self.training.iloc[rows[start:start + page_size]]
+        if not formatted:
+            return out[columns] if columns else out
+        out = out[columns or LOG_COLUMNS].copy()
+        for col, decimals, suffix in (('Sets', 1, ''), ('Reps', 1, ''), ('Rest', 0, 's'), ('Volume', 1, '')):
+            if col in out.columns:
+                out[col] = _number_labels(out[col].to_numpy(), decimals, suffix)
+        return out
+
+    def csv(self, rows):
+        """CSV of the rows in display order (memoized for the last rows asked for)"""
+        cached = self._memo.get('csv')
+        if cached is None or cached[0] is not rows:
+            cached = self._memo['csv'] = (rows, self.training.iloc[rows].to_csv(index=False))
+        return cached[1]
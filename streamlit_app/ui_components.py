@@ -1 +1,64 @@
-# Optional helper module for Streamlit components.
+"""
+Helpers shared by the Streamlit dashboards
+FigureCache keeps serialized Plotly figures keyed by (data version, chart
+id, filter tuple) in a bounded LRU shared by every session in the server
+process. A chart whose data and filters are unchanged is rehydrated from its
+JSON instead of re-running the pandas prep, trace building and layout styling.
+"""
+
+import json
+import threading
+from collections import OrderedDict
+
+import plotly.graph_objects as go
+
+FIGURE_CACHE_SIZE = 128
+
+class FigureCache:
+    def __init__(self, maxsize=FIGURE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._specs = OrderedDict()   # (version, chart id, filters) -> figure JSON
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Figure JSON for key (marked most recently used), or None"""
+        with self._lock:
+            spec = self._specs.get(key)
+            if spec is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._specs.move_to_end(key)
+            return spec
+
+    def put(self, key, spec):
+        with self._lock:
+            self._specs[key] = spec
+            self._specs.move_to_end(key)
+            while len(self._specs) > self.maxsize:
+                self._specs.popitem(last=False)
+
+    def figure(self, key, build):
+        """
+        The cached figure for key, or build() (a no-argument function returning
+        a go.Figure) on a miss. Hits skip validation: the JSON came from a
+        figure plotly already validated.
+        """
+        spec = self.get(key)
+        if spec is not None:
+            return go.Figure(json.loads(spec), _validate=False)
+        fig = build()
+        self.put(key, fig.to_json())
+        return fig
+
+    def __len__(self):
+        return len(self._specs)
+
+# One cache per server process, shared by every session
+FIGURES = FigureCache()
+
+def cached_figure(version, chart_id, filters, build):
+    """FIGURES.figure() for one chart; filters is the tuple of every input besides the data"""
+    return FIGURES.figure((version, chart_id, tuple(filters)), build)
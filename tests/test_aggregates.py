@@ -0,0 +1,85 @@
+import sys, pathlib, random
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'backend'))
+sys.path.insert(0, str(ROOT))
+import math
+import pandas as pd
+import pytest
+from streamlit_app.aggregates import AggregateCube, MEASURES
+
+DAYS = ['Monday', 'Wednesday', 'Friday']
+GROUPS = {'Chest': ['Bench Press', 'Dips'], 'Back': ['Pull-ups', 'Barbell Rows'], 'Legs': ['Squat']}
+
+def random_training(seed, n=120):
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(n):
+        mg = rng.choice(sorted(GROUPS))
+        sets, reps = rng.randint(1, 5), rng.choice([5, 8, 10, 12.5])
+        rows.append({'Week': rng.randint(1, 6), 'Day': rng.choice(DAYS), 'Muscle Group': mg,
+                     'Exercise': rng.choice(GROUPS[mg]), 'Sets': sets, 'Reps': reps,
+                     'Rest': rng.choice([60, 90, 120]), 'RPE': rng.choice([7, 8, 9]), 'Volume': sets * reps})
+    return pd.DataFrame(rows)
+
+def filtered(df, week=None, muscle=None, exercise=None, day=None):
+    for col, value in (('Week', week), ('Muscle Group', muscle), ('Exercise', exercise), ('Day', day)):
+        if value is not None:
+            df = df[df[col] == value]
+    return df
+
+FILTERS = [{}, {'week': 2}, {'muscle': 'Chest'}, {'week': 3, 'day': 'Friday'}, {'exercise': 'Squat'},
+           {'week': 99}]
+
+@pytest.mark.parametrize('seed', range(5))
+@pytest.mark.parametrize('filters', FILTERS)
+def test_totals_match_raw_frame(seed, filters):
+    df = random_training(seed)
+    totals = AggregateCube(df).totals(**filters)
+    rows = filtered(df, **filters)
+    assert totals['Count'] == len(rows)
+    for m in MEASURES:
+        assert totals[m] == pytest.approx(rows[m].sum())
+        if len(rows):
+            assert totals[f'Avg {m}'] == pytest.approx(rows[m].mean())
+        else:
+            assert math.isnan(totals[f'Avg {m}'])
+
+@pytest.mark.parametrize('seed', range(5))
+@pytest.mark.parametrize('by', [('Week',), ('Muscle Group',), ('Week', 'Muscle Group'), ('Exercise', 'Day')])
+@pytest.mark.parametrize('filters', FILTERS[:4])
+def test_rollup_matches_groupby(seed, by, filters):
+    df = random_training(seed)
+    out = AggregateCube(df).rollup(by, **filters)
+    rows = filtered(df, **filters)
+    expected = rows.groupby(list(by), sort=True).agg(
+        **{m: (m, 'sum') for m in MEASURES}, **{f'Avg {m}': (m, 'mean') for m in MEASURES},
+        Count=('Exercise', 'size')).reset_index()
+    assert list(out[list(by)].itertuples(index=False)) == list(expected[list(by)].itertuples(index=False))
+    assert out['Count'].tolist() == expected['Count'].tolist()
+    for col in [*MEASURES, *(f'Avg {m}' for m in MEASURES)]:
+        assert out[col].tolist() == pytest.approx(expected[col].tolist())
+
+def test_rollup_returns_a_copy():
+    cube = AggregateCube(random_training(0))
+    cube.rollup(('Week',))['Extra'] = 1
+    assert 'Extra' not in cube.rollup(('Week',)).columns
+
+@pytest.mark.parametrize('seed', range(3))
+def test_distinct_and_options_match_raw_frame(seed):
+    df = random_training(seed)
+    cube = AggregateCube(df)
+    assert cube.distinct('Exercise') == df['Exercise'].nunique()
+    assert cube.distinct('Exercise', week=2) == df[df['Week'] == 2]['Exercise'].nunique()
+    per_week = cube.distinct('Exercise', by='Week')
+    expected = df.groupby('Week')['Exercise'].nunique()
+    assert per_week['Week'].tolist() == expected.index.tolist()
+    assert per_week['Exercise'].tolist() == expected.tolist()
+    for dim in ('Week', 'Muscle Group', 'Exercise', 'Day'):
+        assert cube.options[dim] == sorted(df[dim].unique().tolist())
+    assert cube.exercise_muscle == df.drop_duplicates('Exercise').set_index('Exercise')['Muscle Group'].to_dict()
+
+def test_empty_frame():
+    cube = AggregateCube(random_training(0).iloc[:0])
+    totals = cube.totals()
+    assert totals['Count'] == 0 and totals['Volume'] == 0
+    assert cube.options['Week'] == []
@@ -0,0 +1,41 @@
+import sys, pathlib, itertools
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent / 'backend'))
+from autofill_logic import get_sets_reps_rest
+
+def original_sets_reps_rest(week_num, muscle_group, exercise):
+    """The prescription as it was before classification was memoized"""
+    if week_num <= 2:
+        sets, reps, rest = "3", "10-12", "60-90"
+    elif week_num <= 4:
+        sets, reps, rest = "4", "8-10", "90-120"
+    elif week_num <= 6:
+        sets, reps, rest = "4-5", "6-8", "120-180"
+    elif week_num == 7:
+        sets, reps, rest = "3", "3-5", "180-240"
+    else:
+        sets, reps, rest = "2-3", "12-15", "60"
+    if muscle_group in ['Arms', 'Calves', 'Abs', 'Core']:
+        if week_num <= 6:
+            reps = "12-15"
+            rest = "60"
+    elif muscle_group in ['Back', 'Legs', 'Glutes_Hamstrings']:
+        if week_num >= 5:
+            rest = "180-240"
+    if 'Deadlift' in exercise or 'Squat' in exercise:
+        rest = "180-240" if week_num <= 6 else "120"
+    elif 'Curl' in exercise or 'Raise' in exercise or 'Fly' in exercise:
+        if week_num <= 6:
+            sets = "3"
+            reps = "12-15"
+            rest = "60"
+    return sets, reps, rest
+
+GROUPS = ['Chest', 'Back', 'Legs', 'Glutes_Hamstrings', 'Shoulders', 'Arms', 'Calves', 'Abs', 'Core', '']
+EXERCISES = ['Bench Press', 'Romanian Deadlift', 'Back Squats', 'Bicep Curl', 'Lateral Raise', 'Cable Fly', 'Pull-ups', '']
+
+def test_prescription_matches_the_original_rules():
+    for week, mg, ex in itertools.product(range(1, 9), GROUPS, EXERCISES):
+        assert get_sets_reps_rest(week, mg, ex) == original_sets_reps_rest(week, mg, ex), (week, mg, ex)
+
+def test_chest_keeps_the_standard_rest():
+    assert get_sets_reps_rest(5, 'Chest', 'Bench Press') == ("4-5", "6-8", "120-180")
@@ -0,0 +1,65 @@
+import sys, pathlib, random
+import numpy as np
+import pytest
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent / 'backend'))
+from analyze import analyze, report_lines
+from batch_analyze import analyze_usage, UNUSED, UNDER, BALANCED, OVERUSED
+from usage_matrix import UsageMatrix
+
+CHEST = ['Bench Press', 'Cable Fly', 'Push-ups', 'Incline Barbell Press', 'Decline Barbell Press', 'Dips']
+BACK = ['Pull-ups', 'Barbell Rows', 'Lat Pulldown']
+STATUS = {'overused': OVERUSED, 'balanced': BALANCED, 'under': UNDER}
+
+def random_rows(seed, athletes=('A', 'B', 'C'), n_weeks=8):
+    rng = random.Random(seed)
+    rows = []
+    for athlete in athletes:
+        for ex in CHEST + BACK:
+            p = rng.choice([0.0, 0.2, 0.5, 0.9, 1.0])
+            for week in range(1, n_weeks + 1):
+                if rng.random() < p:
+                    rows.append({'athlete': athlete, 'week': week, 'exercise': ex, 'volume': 1,
+                                 'muscleGroup': 'Chest' if ex in CHEST else 'Back'})
+    return rows
+
+def batch_swaps(result, a):
+    return {result.exercises[e]: result.candidates[c]
+            for e, c in zip(result.top_overused[a], result.suggestions[a]) if e >= 0 and c >= 0}
+
+def analyze_swaps(over):
+    return {ex: al[0][0] for ex, f, al, urg in over if al}
+
+@pytest.mark.parametrize('seed', range(10))
+def test_batch_matches_per_athlete_analyze(seed):
+    usage = UsageMatrix.from_rows(random_rows(seed))
+    result = analyze_usage(usage, top_k=len(CHEST) + len(BACK))
+    for a, athlete in enumerate(result.athletes):
+        db = usage.to_db(athlete)
+        over, bal, under, _ = analyze(db, current_week=usage.n_weeks)
+        status = {result.exercises[e]: s for e, s in enumerate(result.status[a]) if s != UNUSED}
+        expected = {ex: STATUS[name] for name, items in (('overused', over), ('balanced', bal), ('under', under))
+                    for ex, *_ in items}
+        assert status == expected
+        assert [result.exercises[e] for e in result.top_overused[a] if e >= 0] == [ex for ex, *_ in over]
+
+        swaps = batch_swaps(result, a)
+        assert swaps == analyze_swaps(over)
+        assert len(set(swaps.values())) == len(swaps)
+        assert not set(swaps.values()) & {ex for ex, *_ in over}
+
+def test_overused_exercises_get_distinct_replacements():
+    rows = [{'athlete': 'A', 'week': w, 'exercise': ex, 'muscleGroup': 'Chest', 'volume': 1}
+            for ex in ('Bench Press', 'Cable Fly', 'Push-ups') for w in range(1, 9)]
+    usage = UsageMatrix.from_rows(rows)
+    swaps = batch_swaps(analyze_usage(usage), 0)
+    assert set(swaps) == {'Bench Press', 'Cable Fly', 'Push-ups'}
+    assert len(set(swaps.values())) == 3
+    assert swaps == analyze_swaps(analyze(usage.to_db('A'))[0])
+
+def test_report_lines_lists_items_in_analyze_order():
+    usage = UsageMatrix.from_rows(random_rows(3, athletes=('A',)))
+    result = analyze_usage(usage)
+    db = usage.to_db('A')
+    lines = result.report_lines(0, 'now')
+    over, bal, under, ideas = analyze(db)
+    assert [l for l in lines if '→' not in l] == [l for l in report_lines(db, over, bal, under, ideas, 'now') if '→' not in l]
@@ -0,0 +1,79 @@
+import sys, pathlib
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent / 'backend'))
+import autofill_logic
+from change_feed import WeekChangeFeed, INSERTED, MODIFIED
+
+# MONITOR_RANGE (B2:F) cells: Muscle Group, Exercise, Sets, Reps, Rest
+BLOCK = [['Chest', 'Bench Press', '3', '10', '90'], ['Back', 'Pull-ups']]
+EDITED = BLOCK[:1] + [['Back', 'Pull-ups', '3', '8', '90'], ['Legs', 'Back Squats']]
+
+def test_uncommitted_changes_are_reported_again():
+    feed = WeekChangeFeed(first_row=2)
+    feed.changes('Week 1', BLOCK)
+
+    first = feed.pending('Week 1', EDITED)
+    assert [(c.kind, c.row) for c in first] == [(MODIFIED, 3), (INSERTED, 4)]
+
+    # Processing failed (no commit): the next read reports the same rows
+    assert feed.pending('Week 1', EDITED) == first
+
+    feed.commit('Week 1')
+    assert feed.pending('Week 1', EDITED) == []
+
+def test_changes_commits_immediately():
+    feed = WeekChangeFeed(first_row=2)
+    assert [c.kind for c in feed.changes('Week 1', BLOCK)] == [INSERTED, INSERTED]
+    assert list(feed.changes('Week 1', BLOCK)) == []
+
+class Worksheet:
+    def __init__(self, title):
+        self.title = title
+
+class Spreadsheet:
+    """One week sheet; the first `failures` batch writes raise"""
+    def __init__(self, values, failures):
+        self.values = values
+        self.failures = failures
+        self.writes = []
+
+    def worksheets(self):
+        return [Worksheet('Week 1')]
+
+    def values_batch_get(self, ranges):
+        assert ranges == [f"'Week 1'!{autofill_logic.MONITOR_RANGE}"]
+        return {'valueRanges': [{'range': ranges[0], 'values': self.values}]}
+
+    def values_batch_update(self, body):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError('write failed')
+        self.writes.append(sorted(u['range'] for u in body['data']))
+
+class Engine:
+    def __init__(self, ss):
+        self.ss = ss
+
+    def load_logic_rules(self):
+        pass
+
+    def refresh_rules(self):
+        return []
+
+    def calculate_sets_reps_rest(self, week_num, muscle_group, exercise):
+        return '4', '8', '120'
+
+def run_monitor(monkeypatch, ss, polls):
+    sleeps = []
+    def sleep(seconds):
+        sleeps.append(seconds)
+        if len(sleeps) >= polls:
+            raise KeyboardInterrupt
+    monkeypatch.setattr(autofill_logic, 'AdaptiveLogicEngine', lambda: Engine(ss))
+    monkeypatch.setattr(autofill_logic.time, 'sleep', sleep)
+    autofill_logic.monitor_and_autofill(rules_interval=3600)
+
+def test_monitor_refills_rows_after_a_failed_write(monkeypatch):
+    ss = Spreadsheet(EDITED, failures=1)
+    run_monitor(monkeypatch, ss, polls=3)
+    # Poll 1 fails to write; poll 2 re-reports and fills Back Squats (row 4); poll 3 is idle
+    assert ss.writes == [["'Week 1'!D4", "'Week 1'!E4", "'Week 1'!F4"]]
@@ -0,0 +1,97 @@
+import sys, pathlib, threading, time
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'backend'))
+sys.path.insert(0, str(ROOT))
+import pytest
+from streamlit_app import data_loader
+from streamlit_app.data_loader import DatasetRefresher
+from streamlit_app.dataset_store import MemoryStore
+
+class Worksheet:
+    def __init__(self, title):
+        self.title = title
+
+class SlowSpreadsheet:
+    """Two-week workbook whose batch read takes `delay` seconds; tracks overlapping reads"""
+    def __init__(self, delay=0.2):
+        self.delay = delay
+        self.reads = 0
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def worksheets(self):
+        return [Worksheet('Week 1'), Worksheet('Week 2')]
+
+    def values_batch_get(self, ranges):
+        with self._lock:
+            self.reads += 1
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            reads = self.reads
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        values = [['Day', 'Muscle Group', 'Exercise', 'Sets', 'Reps'],
+                  ['Monday', 'Chest', 'Bench Press', '3', str(reads)]]
+        return {'valueRanges': [{'range': r, 'values': values} for r in ranges]}
+
+@pytest.fixture(autouse=True)
+def snapshot_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_loader, 'DASHBOARD_SNAPSHOT_DIR', str(tmp_path))
+
+def run_concurrently(*calls):
+    threads = []
+    for call in calls:
+        threads.append(threading.Thread(target=call))
+        threads[-1].start()
+        time.sleep(0.02)   # keep the start order
+    for t in threads:
+        t.join()
+
+def test_concurrent_cold_starts_share_one_fetch():
+    ss = SlowSpreadsheet()
+    refresher = DatasetRefresher(lambda: ss, MemoryStore())
+    run_concurrently(*[refresher.refresh] * 8)
+    assert refresher.fetches == 1 and ss.reads == 1
+
+def test_forced_calls_wait_for_the_inflight_load_and_share_one_fetch():
+    ss = SlowSpreadsheet()
+    refresher = DatasetRefresher(lambda: ss, MemoryStore())
+    forced = lambda: refresher.refresh(force=True)
+    run_concurrently(refresher.refresh, forced, refresher.refresh, forced, forced)
+    # The unforced cold start, then one forced fetch after it; never two at once
+    assert refresher.fetches == 2 and ss.reads == 2
+    assert ss.max_active == 1
+    assert refresher.snapshot.version == refresher.store.stamp().version
+
+def test_unforced_calls_join_an_inflight_forced_fetch():
+    ss = SlowSpreadsheet()
+    refresher = DatasetRefresher(lambda: ss, MemoryStore())
+    refresher.refresh()
+    run_concurrently(lambda: refresher.refresh(force=True), refresher.refresh, refresher.refresh)
+    assert refresher.fetches == 2
+
+def test_held_lease_is_not_regranted_to_the_same_owner():
+    ss = SlowSpreadsheet()
+    store = MemoryStore()
+    first = DatasetRefresher(lambda: ss, store)
+    first.refresh()
+    second = DatasetRefresher(lambda: ss, store)
+    second.owner = first.owner
+    run_concurrently(lambda: first.refresh(force=True), lambda: second.refresh(force=True))
+    # The second refresher finds the lease taken and adopts the stored workbook
+    assert ss.reads == 2 and ss.max_active == 1
+    assert first.fetches == 2 and second.fetches == 0
+
+def test_snapshot_is_keyed_on_the_schema_and_checked_on_map():
+    refresher = DatasetRefresher(lambda: SlowSpreadsheet(delay=0), MemoryStore())
+    dataset = refresher.refresh()
+    path = data_loader._snapshot_path(dataset.version)
+    assert data_loader.SNAPSHOT_SCHEMA in path.name and path.exists()
+    mapped = data_loader.map_training_snapshot(dataset.version)
+    assert list(mapped.columns) == data_loader.TRAINING_COLUMNS
+
+    # A frame with other columns under the same name is never used
+    dataset.training.drop(columns=['RPE']).to_feather(path, compression='uncompressed')
+    assert data_loader.map_training_snapshot(dataset.version) is None
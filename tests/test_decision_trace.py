@@ -0,0 +1,46 @@
+import sys, pathlib
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent / 'backend'))
+from decision_trace import DecisionTrace
+
+def sample_trace():
+    trace = DecisionTrace()
+    bench = trace.register_rule('exercise-specific', 'Bench Press')
+    large = trace.register_rule('category', 'Large/Compound')
+    trace.register_rule('default', 'Week 9')   # never hit
+    for row in (2, 3):
+        trace.record(1, row, 0, bench)
+        trace.record(1, row, 2, large)
+    trace.record(300, 70000, 1, large)   # wide week/row values survive the typed arrays
+    trace.record_shadowed(large)
+    return trace
+
+def assert_same_trace(loaded, trace):
+    assert loaded.rule_keys == trace.rule_keys
+    assert loaded.rule_ids == trace.rule_ids
+    assert loaded.rule_stats() == trace.rule_stats()
+    assert loaded.tier_hits() == trace.tier_hits()
+    assert loaded.cells() == trace.cells()
+    assert len(loaded) == len(trace)
+
+def test_save_and_load_round_trip(tmp_path):
+    trace = sample_trace()
+    path = str(tmp_path / 'trace.npz')
+    trace.save(path)
+    loaded = DecisionTrace.load(path)
+    assert_same_trace(loaded, trace)
+    assert [s['rule'] for s in loaded.dead_rules()] == ['Week 9']
+    assert loaded.cells('Bench Press') == [(1, 2, 'Sets', 'Bench Press'), (1, 3, 'Sets', 'Bench Press')]
+
+    # The loaded trace keeps recording
+    loaded.record(2, 2, 0, loaded.rule_ids['Bench Press'])
+    assert loaded.rule_stats()[0]['hits'] == 3
+
+def test_empty_trace_round_trip(tmp_path):
+    path = str(tmp_path / 'trace.npz')
+    DecisionTrace().save(path)
+    loaded = DecisionTrace.load(path)
+    assert_same_trace(loaded, DecisionTrace())
+    assert loaded.tier_hits() == {'exercise-specific': 0, 'category': 0, 'default': 0}
+
+def test_missing_trace_loads_as_none(tmp_path):
+    assert DecisionTrace.load(str(tmp_path / 'missing.npz')) is None
@@ -0,0 +1,55 @@
+import sys, pathlib, random
+import pytest
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent / 'backend'))
+from families import EXERCISE_FAMILIES
+from family_matrix import FamilyMatrix
+from analyze import FAMILIES_BY_EXERCISE
+from staleness import staleness_score, classify_score
+
+MATRIX = FamilyMatrix(EXERCISE_FAMILIES)
+KNOWN = sorted({ex for exs in EXERCISE_FAMILIES.values() for ex in exs})
+
+def dict_families(db, current_week):
+    """Family usage through the FAMILIES_BY_EXERCISE dict: union of member weeks per family"""
+    weeks, members = {}, {}
+    for ex, info in db.items():
+        for fam in FAMILIES_BY_EXERCISE.get(ex.lower(), []):
+            weeks.setdefault(fam, set()).update(info['weeks'])
+            if info['weeks']:
+                members.setdefault(fam, []).append(ex)
+    out = []
+    for fam, used in weeks.items():
+        if used:
+            score = staleness_score(used, current_week)
+            out.append((fam, len(used), score, classify_score(score), members[fam]))
+    return sorted(out, key=lambda t: (-t[2], t[0]))
+
+def random_db(seed, n_weeks=8):
+    rng = random.Random(seed)
+    names = rng.sample(KNOWN, 12) + ['Not In Any Family']
+    db = {}
+    for ex in names:
+        used = {w for w in range(1, n_weeks + 1) if rng.random() < 0.4}
+        db[rng.choice([ex, ex.upper()])] = {'muscleGroup': 'X', 'weeks': used, 'frequency': len(used)}
+    return db
+
+def test_incidence_rows_match_the_dict_index():
+    assert set(MATRIX.exercise_ids) == set(FAMILIES_BY_EXERCISE)
+    for ex, fams in FAMILIES_BY_EXERCISE.items():
+        row = MATRIX.incidence[MATRIX.exercise_ids[ex]]
+        assert sorted(MATRIX.families[f] for f in row.indices) == sorted(fams)
+
+@pytest.mark.parametrize('seed', range(6))
+def test_analyze_matches_the_dict_path(seed):
+    db = random_db(seed)
+    got = MATRIX.analyze(db)
+    current = max(max(i['weeks']) for i in db.values() if i['weeks'])
+    expected = dict_families(db, current)
+    assert [(fam, f, status, members) for fam, f, _, status, members in got] == \
+           [(fam, f, status, members) for fam, f, _, status, members in expected]
+    assert [t[2] for t in got] == pytest.approx([t[2] for t in expected])
+
+def test_unused_and_unknown_exercises_are_ignored():
+    assert MATRIX.analyze({}) == []
+    assert MATRIX.analyze({'Not In Any Family': {'weeks': {1, 2}, 'frequency': 2}}) == []
+    assert MATRIX.analyze({KNOWN[0]: {'weeks': set(), 'frequency': 0}}) == []
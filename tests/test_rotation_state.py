@@ -0,0 +1,75 @@
+import sys, pathlib, random
+import pytest
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent / 'backend'))
+from analyze import parse_rows, build_db, analyze
+from rotation_state import RotationState
+
+GROUPS = {'Bench Press': 'Chest', 'Incline DB Press': 'Chest', 'Pull-ups': 'Back',
+          'Barbell Row': 'Back', 'Back Squats': 'Legs', 'Leg Press': 'Legs', 'OHP': 'Shoulders'}
+
+def week_block(rng):
+    """
+    Raw A2:E values for one week sheet. An exercise may repeat on another day
+    and is sometimes logged under another muscle group (the first one seen wins)
+    """
+    exercises = rng.sample(sorted(GROUPS), rng.randint(2, 5))
+    exercises += rng.sample(exercises, rng.randint(0, 2))
+    return [[rng.choice(['Monday', 'Thursday']), rng.choice([GROUPS[ex], GROUPS[ex], 'Full Body']), ex, '', '']
+            for ex in exercises]
+
+def rebuilt_db(blocks):
+    """build_db() over every sheet parsed from scratch, in week order"""
+    names = sorted(blocks, key=lambda n: int(n.split()[-1]))
+    return build_db([r for name in names for r in parse_rows(name, blocks[name])])
+
+def assert_matches_rebuild(state, blocks):
+    db, expected = state.to_db(), rebuilt_db(blocks)
+    assert db.keys() == expected.keys()
+    for ex, e in expected.items():
+        assert db[ex]['weeks'] == e['weeks']
+        assert db[ex]['frequency'] == e['frequency']
+        assert db[ex]['lastUsed'] == e['lastUsed']
+        assert db[ex]['muscleGroup'] == e['muscleGroup']
+        assert db[ex]['totalVolume'] == e['totalVolume']
+        assert db[ex]['score'] == pytest.approx(e['score'])
+    over, bal, under, _ = analyze(db)
+    e_over, e_bal, e_under, _ = analyze(expected)
+    assert [t[0] for t in over] == [t[0] for t in e_over]
+    assert bal == e_bal and under == e_under
+
+@pytest.mark.parametrize('seed', range(5))
+def test_week_by_week_updates_match_a_rebuild(seed):
+    rng = random.Random(seed)
+    blocks, state = {}, RotationState()
+    for week in range(1, 9):
+        blocks[f'Week {week}'] = week_block(rng)
+        state.update(dict(blocks))
+        assert_matches_rebuild(state, blocks)
+
+    # Edit the first and a middle week, then delete the latest ones (the current week moves back)
+    for name in ('Week 1', 'Week 3'):
+        blocks[name] = week_block(rng)
+        state.update(dict(blocks))
+        assert_matches_rebuild(state, blocks)
+    for latest in (8, 7):
+        del blocks[f'Week {latest}']
+        state.update(dict(blocks))
+        assert_matches_rebuild(state, blocks)
+
+def test_saved_state_keeps_updating(tmp_path):
+    rng = random.Random(7)
+    blocks = {f'Week {w}': week_block(rng) for w in range(1, 5)}
+    state = RotationState()
+    state.update(dict(blocks))
+    state.save(str(tmp_path / 'state.json'))
+    state = RotationState.load(str(tmp_path / 'state.json'))
+    blocks['Week 5'] = week_block(rng)
+    blocks['Week 2'] = week_block(rng)
+    assert sorted(state.update(dict(blocks))) == ['Week 2', 'Week 5']
+    assert_matches_rebuild(state, blocks)
+
+def test_deleting_every_week_empties_the_state():
+    state = RotationState()
+    state.update({'Week 1': week_block(random.Random(0)), 'Week 2': week_block(random.Random(1))})
+    state.update({})
+    assert state.exercises == {} and state.week_rows == {} and state.current_week == 0
@@ -0,0 +1,78 @@
+import sys, pathlib, random
+import numpy as np
+import pytest
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent / 'backend'))
+from rotation_window import RotationWindow, week_rows, slide
+from usage_matrix import UsageMatrix
+from analyze import build_db
+from staleness import staleness_score
+
+EXERCISES = {'Bench Press': 'Chest', 'Dips': 'Chest', 'Pull-ups': 'Back', 'Barbell Row': 'Back',
+             'Back Squats': 'Legs', 'Leg Press': 'Legs'}
+
+def random_rows(seed, n_weeks=12):
+    rng = random.Random(seed)
+    rows = []
+    for week in range(1, n_weeks + 1):
+        if rng.random() < 0.15:
+            continue   # weeks without rows still count towards the window
+        for ex in rng.sample(sorted(EXERCISES), rng.randint(1, 4)):
+            rows.append({'week': week, 'muscleGroup': EXERCISES[ex], 'exercise': ex, 'volume': rng.choice([1, 2])})
+    return rows
+
+def window_rows(rows, first_week, last_week):
+    return [r for r in rows if first_week <= r['week'] <= last_week]
+
+def test_week_rows_sums_volume_per_exercise():
+    rows = [{'week': 1, 'muscleGroup': 'Chest', 'exercise': 'Dips', 'volume': 2},
+            {'week': 1, 'muscleGroup': 'Chest', 'exercise': 'Dips'},
+            {'week': 2, 'muscleGroup': 'Back', 'exercise': 'Pull-ups', 'volume': 1}]
+    assert week_rows(rows) == {1: {'Dips': ['Chest', 3]}, 2: {'Pull-ups': ['Back', 1]}}
+
+@pytest.mark.parametrize('seed', range(4))
+@pytest.mark.parametrize('size', [1, 3, 4])
+def test_every_slide_position_matches_a_recount(seed, size):
+    rows = random_rows(seed)
+    weeks = week_rows(rows)
+    for window in slide(weeks, size):
+        first, last = window.first_week, window.last_week
+        assert first == max(last - size + 1, 1)
+        expected = build_db(window_rows(rows, first, last))
+        db = window.to_db()
+        assert db.keys() == expected.keys()
+        for ex, e in expected.items():
+            assert db[ex]['weeks'] == e['weeks']
+            assert db[ex]['frequency'] == e['frequency'] == window.counts[ex]
+            assert db[ex]['totalVolume'] == e['totalVolume']
+            assert db[ex]['lastUsed'] == e['lastUsed']
+            assert db[ex]['score'] == pytest.approx(staleness_score(e['weeks'], last))
+
+def test_from_weeks_is_the_last_slide_position():
+    weeks = week_rows(random_rows(9))
+    *_, slid = slide(weeks, 4)
+    built = RotationWindow.from_weeks(weeks, 4)
+    assert built.to_db() == slid.to_db()
+    assert (built.first_week, built.last_week) == (slid.first_week, slid.last_week)
+
+def test_weeks_must_move_forward():
+    window = RotationWindow(3)
+    window.add(2, {'Dips': ['Chest', 1]})
+    with pytest.raises(ValueError):
+        window.add(2, {'Dips': ['Chest', 1]})
+
+def test_empty_window():
+    window = RotationWindow.from_weeks({}, 4)
+    assert (window.first_week, window.last_week) == (0, 0)
+    assert window.to_db() == {}
+
+def test_window_scores_match_the_window_at_every_week():
+    rows = random_rows(3)
+    usage = UsageMatrix.from_rows(rows, athlete_key=None)
+    scores = usage.window_scores(4)
+    for week in range(1, usage.n_weeks + 1):
+        db = build_db(window_rows(rows, week - 3, week))
+        for pair, ex in enumerate(usage.exercise_ids):
+            name = usage.exercises[ex]
+            expected = staleness_score(db[name]['weeks'], week) if name in db else 0.0
+            assert scores[pair, week - 1] == pytest.approx(expected, abs=1e-12)
+    assert np.array_equal(usage.window_frequency(4) > 0, scores > 1e-12)
@@ -0,0 +1,54 @@
+import sys, pathlib, random
+import pytest
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent / 'backend'))
+from rotation_state import RotationState
+from similarity import CooccurrenceModel
+
+def test_neighbours_share_a_day_and_muscle_group_slot():
+    # Raw A2:E week sheets: the two squats alternate in Monday's legs slot,
+    # the lunges always sit in Thursday's
+    blocks = {}
+    for week in range(1, 7):
+        squat = 'Back Squats' if week % 2 else 'Front Squats'
+        blocks[f'Week {week}'] = [['Monday', 'Legs', squat, '4', '6'],
+                                  ['Thursday', 'Legs', 'Walking Lunges', '3', '12']]
+    state = RotationState()
+    state.update(blocks)
+    model = CooccurrenceModel()
+    model.refresh(state.rows())
+
+    assert [ex for ex, _ in model.neighbours('Back Squats')] == ['Front Squats']
+    assert model.neighbours('Walking Lunges') == []
+
+def random_week(rng, week):
+    exercises = [f'Ex {i}' for i in range(14)]
+    return [{'week': week, 'day': rng.choice(['Monday', 'Wednesday', 'Friday']),
+             'muscleGroup': rng.choice(['Chest', 'Back', 'Legs']), 'exercise': rng.choice(exercises)}
+            for _ in range(rng.randint(0, 8))]
+
+def assert_same_neighbours(model, fresh):
+    for name in {n.lower() for n in fresh.names + model.names}:
+        got, expected = model.neighbours(name), fresh.neighbours(name)
+        assert [s for _, s in got] == pytest.approx([s for _, s in expected]), name
+        # Exercise ids differ between the models, so ties may be broken the other
+        # way; every neighbour strictly above the last listed similarity must match
+        cutoff = expected[-1][1] + 1e-9 if expected else 0.0
+        assert {n: s for n, s in got if s > cutoff} == pytest.approx({n: s for n, s in expected if s > cutoff}), name
+
+@pytest.mark.parametrize('seed', range(8))
+def test_incremental_refreshes_match_a_fresh_model(seed):
+    rng = random.Random(seed)
+    weeks = {w: random_week(rng, w) for w in range(1, 7)}
+    model = CooccurrenceModel(k=3)
+    for step in range(25):
+        # Edit, add or drop one week, then refresh with every week's rows
+        week = rng.randint(1, 9)
+        if rng.random() < 0.2:
+            weeks.pop(week, None)
+        else:
+            weeks[week] = random_week(rng, week)
+        rows = [r for w in sorted(weeks) for r in weeks[w]]
+        model.refresh(rows)
+        fresh = CooccurrenceModel(k=3)
+        fresh.refresh(rows)
+        assert_same_neighbours(model, fresh)
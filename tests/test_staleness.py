@@ -0,0 +1,52 @@
+import sys, pathlib
+import pytest
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent / 'backend'))
+from config import OVERUSED, BALANCED_MIN, STALENESS_DECAY
+from staleness import (staleness_score, advance_score, classify_score, decay_weights, score_threshold,
+                       OVERUSED_SCORE, BALANCED_SCORE)
+
+def recent(n, current_week=8):
+    """Score of the last n weeks of use ending at current_week"""
+    return staleness_score(range(current_week - n + 1, current_week + 1), current_week)
+
+def test_thresholds_are_consecutive_recent_weeks():
+    assert OVERUSED_SCORE == pytest.approx(recent(OVERUSED))
+    assert BALANCED_SCORE == pytest.approx(recent(BALANCED_MIN))
+    assert score_threshold(1) == 1.0
+
+@pytest.mark.parametrize('score, status', [
+    (OVERUSED_SCORE, 'overused'),
+    (OVERUSED_SCORE - 1e-12, 'overused'),   # float rounding lands on the threshold
+    (OVERUSED_SCORE - 1e-6, 'balanced'),
+    (BALANCED_SCORE, 'balanced'),
+    (BALANCED_SCORE - 1e-12, 'balanced'),
+    (BALANCED_SCORE - 1e-6, 'under'),
+    (0.0, 'under'),
+])
+def test_classify_score_boundaries(score, status):
+    assert classify_score(score) == status
+
+def test_exactly_n_recent_weeks_reach_their_bucket():
+    assert classify_score(recent(OVERUSED)) == 'overused'
+    assert classify_score(recent(OVERUSED - 1)) == 'balanced'
+    assert classify_score(recent(BALANCED_MIN)) == 'balanced'
+    assert classify_score(recent(BALANCED_MIN - 1)) == 'under'
+
+def test_heavy_use_long_ago_is_low_recent_use():
+    # Weeks 1-5 used, week 8 current: ~1.72, below the balanced threshold
+    score = staleness_score(range(1, 6), 8)
+    assert score == pytest.approx(sum(STALENESS_DECAY ** a for a in range(3, 8)))
+    assert classify_score(score) == 'under'
+
+def test_advance_score_matches_a_recount():
+    used = {1, 2, 4, 7}
+    score = 0.0
+    for week in range(1, 10):
+        score = advance_score(score, week in used)
+        assert score == pytest.approx(staleness_score(used, week))
+    # Moving back undoes the decay of weeks without use
+    assert advance_score(staleness_score(used, 9), False, -2) == pytest.approx(staleness_score(used, 7))
+
+def test_decay_weights_ignore_future_weeks():
+    w = decay_weights(3, n_weeks=5)
+    assert w.tolist() == pytest.approx([STALENESS_DECAY ** 2, STALENESS_DECAY, 1.0, 0.0, 0.0])
@@ -0,0 +1,81 @@
+import sys, pathlib, random, itertools
+import pytest
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent / 'backend'))
+import substitution
+from substitution import plan_swaps
+from staleness import OVERUSED_SCORE
+from analyze import analyze
+
+def usage(score, weeks=(1,)):
+    return {'muscleGroup': 'Chest', 'weeks': set(weeks), 'frequency': len(weeks), 'score': score}
+
+def test_one_candidate_is_not_given_twice():
+    db = {'Bench Press': usage(4.0, range(1, 9)), 'Push-ups': usage(4.0, range(1, 9))}
+    shared = [('Incline Press', 0.9, 'same'), ('Decline Press', 0.8, 'same')]
+    plan = plan_swaps([('Bench Press', 'Chest'), ('Push-ups', 'Chest')], lambda ex, mg: shared, db)
+    assert sorted(alt for alt, _, _ in plan.values()) == ['Decline Press', 'Incline Press']
+
+def test_overused_and_target_exercises_are_never_suggested():
+    db = {'Bench Press': usage(4.0, range(1, 9)), 'Dips': usage(4.0, range(1, 9)),
+          'Cable Fly': usage(OVERUSED_SCORE), 'Floor Press': usage(0.5)}
+    candidates = lambda ex, mg: [('Dips', 1.0, ''), ('Bench Press', 1.0, ''), ('Cable Fly', 0.99, ''),
+                                 ('Floor Press', 0.2, '')]
+    plan = plan_swaps([('Bench Press', 'Chest'), ('Dips', 'Chest')], candidates, db)
+    # One usable candidate for two targets: one of them gets no entry
+    assert [alt for alt, _, _ in plan.values()] == ['Floor Press']
+
+def test_no_targets_or_candidates():
+    assert plan_swaps([], lambda ex, mg: [], {}) == {}
+    assert plan_swaps([('Dips', 'Chest')], lambda ex, mg: [], {'Dips': usage(4.0)}) == {}
+
+def brute_force_cost(targets, candidates, db):
+    """Lowest total cost over every one-to-one assignment (small cases only)"""
+    n_weeks = max(max(i['weeks']) for i in db.values())
+    blocked = {ex.lower() for ex, _ in targets}
+    def cost(alt, sim):
+        info = db.get(alt)
+        score = info['score'] if info else 0.0
+        if alt.lower() in blocked or score >= OVERUSED_SCORE:
+            return None
+        freq = info['frequency'] if info else 0
+        return (substitution.SIMILARITY_WEIGHT * (1 - sim) + substitution.RECENCY_WEIGHT * score / OVERUSED_SCORE
+                + substitution.FREQUENCY_WEIGHT * freq / n_weeks)
+    options = [[(alt, cost(alt, sim)) for alt, sim, _ in candidates(ex, mg)] for ex, mg in targets]
+    best = (0, 0.0)   # (assigned targets, -cost): assign as many as possible, then cheapest
+    for picks in itertools.product(*[[None] + [o for o in opts if o[1] is not None] for opts in options]):
+        alts = [p[0] for p in picks if p]
+        if len(alts) != len(set(alts)):
+            continue
+        best = max(best, (len(alts), -sum(p[1] for p in picks if p)))
+    return best
+
+@pytest.mark.parametrize('seed', range(20))
+def test_plan_is_an_optimal_one_to_one_assignment(seed):
+    rng = random.Random(seed)
+    pool = [f'Alt {i}' for i in range(5)]
+    db = {f'Target {i}': usage(4.0, range(1, 9)) for i in range(3)}
+    db.update({alt: usage(rng.choice([0.2, 1.5, 2.9, OVERUSED_SCORE]), rng.sample(range(1, 9), 2))
+               for alt in pool if rng.random() < 0.7})
+    options = {t: [(alt, round(rng.random(), 2), '') for alt in rng.sample(pool, rng.randint(1, 4))]
+               for t in db if t.startswith('Target')}
+    targets = [(t, 'Chest') for t in options]
+    candidates = lambda ex, mg: options[ex]
+    plan = plan_swaps(targets, candidates, db)
+
+    alts = [alt for alt, _, _ in plan.values()]
+    assert len(alts) == len(set(alts))
+    assert all(db.get(alt, {'score': 0})['score'] < OVERUSED_SCORE for alt in alts)
+    assigned, neg_cost = brute_force_cost(targets, candidates, db)
+    assert len(plan) == assigned
+    sims = {(t, alt): sim for t, opts in options.items() for alt, sim, _ in opts}
+    # Cost of the plan, scored by the brute force one target at a time
+    plan_neg_cost = sum(brute_force_cost([(t, 'Chest')], lambda ex, mg: [(alt, sims[t, alt], '')], db)[1]
+                        for t, (alt, _, _) in plan.items())
+    assert plan_neg_cost == pytest.approx(neg_cost)
+
+def test_analyze_plans_distinct_swaps():
+    weeks = range(1, 9)
+    db = {ex: usage(sum(0.8 ** a for a in range(8)), weeks) for ex in ('Barbell Bench Press', 'Cable Fly', 'Push-ups')}
+    over, _, _, ideas = analyze(db)
+    picks = [al[0][0] for _, _, al, _ in over if al]
+    assert len(picks) == len(set(picks)) == len(ideas) == 3
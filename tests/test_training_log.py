@@ -0,0 +1,86 @@
+import sys, pathlib, random
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'backend'))
+sys.path.insert(0, str(ROOT))
+import io
+import pandas as pd
+import pytest
+from streamlit_app.training_log import TrainingLog, DAY_ORDER
+
+def random_training(seed, n=137):
+    rng = random.Random(seed)
+    days = DAY_ORDER + ['Rest day']   # unknown days sort after Sunday
+    rows = []
+    for i in range(n):
+        sets, reps = rng.randint(1, 5), rng.choice([5, 8, 12.5])
+        rows.append({'Week': rng.randint(1, 5), 'Day': rng.choice(days), 'Muscle Group': rng.choice(['Chest', 'Back']),
+                     'Exercise': f'Exercise {i}', 'Sets': sets, 'Reps': reps, 'Rest': rng.choice([60, 90.5]),
+                     'Volume': sets * reps})
+    return pd.DataFrame(rows)
+
+def display_order(df):
+    """The log order written the slow way: week, Monday-first day, sheet order"""
+    rank = df['Day'].map({d: i for i, d in enumerate(DAY_ORDER)}).fillna(len(DAY_ORDER))
+    return df.assign(_rank=rank).sort_values(['Week', '_rank'], kind='stable').index.tolist()
+
+@pytest.mark.parametrize('seed', range(5))
+def test_rows_are_in_display_order(seed):
+    df = random_training(seed)
+    assert TrainingLog(df).rows().tolist() == display_order(df)
+
+@pytest.mark.parametrize('filters', [
+    {'week': 2}, {'muscle': 'Chest'}, {'day': 'Monday'}, {'week': (1, 3), 'day': ('Friday', 'Rest day')},
+    {'week': 99}, {'week': ()}, {'muscle': ('Back',), 'week': 4}])
+def test_filters_match_pandas(filters):
+    df = random_training(0)
+    expected = df
+    for col, key in (('Week', 'week'), ('Muscle Group', 'muscle'), ('Day', 'day')):
+        value = filters.get(key)
+        if value is not None:
+            expected = expected[expected[col].isin(value if isinstance(value, tuple) else [value])]
+    rows = TrainingLog(df).rows(**filters)
+    assert rows.tolist() == [i for i in display_order(df) if i in set(expected.index)]
+
+def test_empty_week_tuple_selects_nothing():
+    log = TrainingLog(random_training(1))
+    rows = log.rows(week=())
+    assert len(rows) == 0
+    assert log.page_count(rows) == 1
+    assert log.page(rows, 1).empty
+    assert log.totals(rows)['Count'] == 0
+
+def test_pages_cover_every_row_once():
+    df = random_training(2)
+    log = TrainingLog(df)
+    rows = log.rows()
+    pages = [log.page(rows, p, page_size=20, formatted=False) for p in range(1, log.page_count(rows, 20) + 1)]
+    assert log.page_count(rows, 20) == 7    # 137 rows
+    assert [len(p) for p in pages] == [20] * 6 + [17]
+    assert [i for p in pages for i in p.index] == display_order(df)
+    assert log.page(rows, 8, page_size=20).empty
+
+def test_page_count_on_exact_multiple():
+    log = TrainingLog(random_training(3, n=40))
+    assert log.page_count(log.rows(), 20) == 2
+    assert len(log.page(log.rows(), 2, page_size=20)) == 20
+
+def test_formatted_page_labels():
+    df = random_training(4, n=10)
+    log = TrainingLog(df)
+    page = log.page(log.rows(), 1)
+    raw = df.loc[page.index]
+    assert page['Reps'].tolist() == [f'{r:.1f}' if r % 1 else str(int(r)) for r in raw['Reps']]
+    assert page['Rest'].tolist() == [f'{r:.0f}s' if r % 1 else f'{int(r)}s' for r in raw['Rest']]
+
+def test_totals_and_csv():
+    df = random_training(5)
+    log = TrainingLog(df)
+    rows = log.rows(muscle='Chest')
+    chest = df[df['Muscle Group'] == 'Chest']
+    totals = log.totals(rows)
+    assert totals['Count'] == len(chest)
+    assert totals['Volume'] == pytest.approx(chest['Volume'].sum())
+    assert totals['Avg Rest'] == pytest.approx(chest['Rest'].mean())
+    csv = log.csv(rows)
+    assert pd.read_csv(io.StringIO(csv))['Exercise'].tolist() == df.loc[rows, 'Exercise'].tolist()
+    assert log.csv(rows) is csv
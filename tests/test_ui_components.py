@@ -0,0 +1,62 @@
+import sys, pathlib
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'backend'))
+sys.path.insert(0, str(ROOT))
+import plotly.graph_objects as go
+from streamlit_app.ui_components import FigureCache
+
+def bar(values):
+    return go.Figure(go.Bar(x=list(range(len(values))), y=values)).update_layout(title='Volume')
+
+def test_get_counts_hits_and_misses():
+    cache = FigureCache(maxsize=4)
+    assert cache.get('a') is None
+    cache.put('a', '{}')
+    assert cache.get('a') == '{}'
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_evicts_least_recently_used():
+    cache = FigureCache(maxsize=2)
+    cache.put('a', 'A')
+    cache.put('b', 'B')
+    cache.get('a')          # 'b' is now the least recently used
+    cache.put('c', 'C')
+    assert len(cache) == 2
+    assert cache.get('b') is None
+    assert (cache.get('a'), cache.get('c')) == ('A', 'C')
+
+def test_put_existing_key_refreshes_it():
+    cache = FigureCache(maxsize=2)
+    cache.put('a', 'A')
+    cache.put('b', 'B')
+    cache.put('a', 'A2')
+    cache.put('c', 'C')
+    assert cache.get('b') is None
+    assert cache.get('a') == 'A2'
+
+def test_figure_builds_once_and_rehydrates_the_same_figure():
+    cache = FigureCache()
+    calls = []
+    def build():
+        calls.append(1)
+        return bar([3, 1, 2])
+
+    first = cache.figure(('v1', 'volume', ()), build)
+    second = cache.figure(('v1', 'volume', ()), build)
+    assert len(calls) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert isinstance(second, go.Figure)
+    assert second.to_dict() == first.to_dict()
+
+def test_figure_keys_include_version_and_filters():
+    cache = FigureCache()
+    calls = []
+    def build():
+        calls.append(1)
+        return bar([len(calls)])
+
+    cache.figure(('v1', 'volume', ('Chest',)), build)
+    cache.figure(('v1', 'volume', ('Back',)), build)
+    cache.figure(('v2', 'volume', ('Chest',)), build)
+    assert len(calls) == 3
+    assert cache.figure(('v1', 'volume', ('Back',)), build).data[0].y == (2,)
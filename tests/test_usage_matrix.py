@@ -0,0 +1,45 @@
+import sys, pathlib, random
+import pytest
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent / 'backend'))
+from usage_matrix import UsageMatrix
+
+def dict_build_db(rows):
+    """The original per-exercise dict build_db()"""
+    db = {}
+    for r in rows:
+        ex = r['exercise']; e = db.get(ex)
+        if not e: e = db.setdefault(ex, {'muscleGroup': r['muscleGroup'], 'weeks': set(), 'totalVolume': 0.0})
+        e['weeks'].add(r['week']); e['totalVolume'] += r['volume']
+    for ex, e in db.items(): e['frequency'] = len(e['weeks'])
+    return db
+
+def random_rows(seed, n=300):
+    rng = random.Random(seed)
+    groups = ['Chest', 'Back', 'Legs', 'Shoulders']
+    return [{'week': rng.randint(1, 8), 'muscleGroup': rng.choice(groups),
+             'exercise': f"Ex {rng.randint(0, 40)}", 'volume': rng.choice([1, 2, 3.5])} for _ in range(n)]
+
+@pytest.mark.parametrize('seed', range(5))
+def test_to_db_matches_dict_build_db(seed):
+    rows = random_rows(seed)
+    expected = dict_build_db(rows)
+    db = UsageMatrix.from_rows(rows, athlete_key=None).to_db()
+    assert db.keys() == expected.keys()
+    for ex, e in expected.items():
+        assert db[ex]['muscleGroup'] == e['muscleGroup']
+        assert db[ex]['weeks'] == e['weeks']
+        assert db[ex]['frequency'] == e['frequency']
+        assert db[ex]['totalVolume'] == pytest.approx(e['totalVolume'])
+        assert db[ex]['lastUsed'] == max(e['weeks'])
+
+def test_per_athlete_db_matches_dict_build_db():
+    rows = [dict(r, athlete=a) for a in ('A', 'B') for r in random_rows({'A': 1, 'B': 2}[a])]
+    usage = UsageMatrix.from_rows(rows)
+    for a in ('A', 'B'):
+        expected = dict_build_db([r for r in rows if r['athlete'] == a])
+        db = usage.to_db(a)
+        assert {ex: e['weeks'] for ex, e in db.items()} == {ex: e['weeks'] for ex, e in expected.items()}
+
+def test_week_below_one_is_rejected():
+    with pytest.raises(ValueError):
+        UsageMatrix.from_rows([{'week': 0, 'muscleGroup': 'Chest', 'exercise': 'Dips'}])